@@ -0,0 +1,97 @@
+"""
+AST Cache
+A bounded, process-wide LRU of parsed sources keyed by a hash of the code.
+The live editor sends the same code to several endpoints, and each analysis
+used to parse it again; now one parse is shared by ComplexityAnalyzer and
+CodeAnalyzer, together with the facts they derive from it (analysis results,
+diagrams, variable lists), which are computed once per source.
+Cached trees and facts are shared: treat them as read-only.
+"""
+import ast
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from config.settings import settings
+
+
+class ParsedSource:
+    """One parsed source: its tree (or the SyntaxError it raised) and facts derived from it"""
+
+    __slots__ = ("key", "tree", "error", "_facts")
+
+    def __init__(self, key: str, tree: Optional[ast.AST], error: Optional[Exception]):
+        self.key = key
+        self.tree = tree
+        self.error = error
+        self._facts: Dict[str, Any] = {}
+
+    def fact(self, name: str, compute: Callable[[ast.AST], Any]) -> Any:
+        """compute(tree), memoized under name. Raises the source's SyntaxError if it does not parse."""
+        if self.error is not None:
+            raise self.error.with_traceback(None)
+        try:
+            return self._facts[name]
+        except KeyError:
+            # Two threads may both compute a missing fact; they produce the same value
+            value = self._facts[name] = compute(self.tree)
+            return value
+
+
+class ASTCache:
+    """LRU of ParsedSource by SHA-256 of the code"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = settings.AST_CACHE_SIZE if max_entries is None else max_entries
+        self._entries: "OrderedDict[str, ParsedSource]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, code: str) -> ParsedSource:
+        """The cached parse of code, parsing it on a miss (syntax errors are cached too)"""
+        key = hashlib.sha256(code.encode("utf-8", "surrogatepass")).hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        try:
+            entry = ParsedSource(key, ast.parse(code), None)
+        except (SyntaxError, ValueError) as e:
+            # ValueError: source containing null bytes
+            entry = ParsedSource(key, None, e)
+
+        with self._lock:
+            # Another thread may have parsed it meanwhile; keep the first so facts accumulate in one place
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def tree(self, code: str) -> ast.AST:
+        """Parsed tree of code; raises SyntaxError like ast.parse"""
+        entry = self.parse(code)
+        if entry.error is not None:
+            raise entry.error.with_traceback(None)
+        return entry.tree
+
+    def fact(self, code: str, name: str, compute: Callable[[ast.AST], Any]) -> Any:
+        """A fact derived from the code's tree, computed at most once per cached source"""
+        return self.parse(code).fact(name, compute)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global AST Cache Instance
+ast_cache = ASTCache()
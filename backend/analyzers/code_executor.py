@@ -3,9 +3,16 @@ Code Executor
 Safely executes user-submitted code against test cases
 """
 import signal
+import threading
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import traceback
+from config.settings import settings
+from judge.limits import TIME_LIMIT_EXCEEDED, MEMORY_LIMIT_EXCEEDED
+from judge.checkers import case_passes, get_checker
+from judge.inputs import fresh_input
+from judge.namespace import solution_namespace
 
 
 @dataclass
@@ -36,14 +43,14 @@ class TimeoutException(Exception):
 
 def timeout_handler(signum, frame):
     """Signal handler for timeout"""
-    raise TimeoutException("Code execution timed out (max 2 seconds)")
+    raise TimeoutException(TIME_LIMIT_EXCEEDED)
 
 
 class CodeExecutor:
     """Executes user code safely with test cases"""
     
-    def __init__(self, timeout_seconds: int = 2):
-        self.timeout_seconds = timeout_seconds
+    def __init__(self, timeout_seconds: Optional[float] = None):
+        self.timeout_seconds = timeout_seconds or settings.JUDGE_TEST_TIME_LIMIT
     
     def execute_tests(self, code: str, function_name: str, test_cases: List[Dict], 
                      language: str = "python") -> ExecutionResult:
@@ -68,9 +75,9 @@ class CodeExecutor:
                 syntax_error=f"Language '{language}' not supported yet. Only Python is supported."
             )
         
-        # First, check syntax
+        # Compile once: this doubles as the syntax check
         try:
-            compile(code, '<string>', 'exec')
+            compiled = compile(code, '<string>', 'exec')
         except SyntaxError as e:
             return ExecutionResult(
                 all_passed=False,
@@ -80,17 +87,18 @@ class CodeExecutor:
                 syntax_error=f"Syntax Error on line {e.lineno}: {e.msg}"
             )
         
+        # Load the submission once and drive every test case through it
+        user_function, load_error = self._load_function(compiled, function_name)
+        
         # Execute test cases
         test_results = []
         tests_passed = 0
         
         for i, test_case in enumerate(test_cases):
-            result = self._execute_single_test(
-                code, 
-                function_name, 
-                test_case, 
-                i
-            )
+            if load_error:
+                result = self._error_result(test_case, i, load_error)
+            else:
+                result = self._execute_single_test(user_function, test_case, i)
             test_results.append(result)
             if result.passed:
                 tests_passed += 1
@@ -103,72 +111,60 @@ class CodeExecutor:
             syntax_error=None
         )
     
-    def _execute_single_test(self, code: str, function_name: str, 
-                            test_case: Dict, index: int) -> TestResult:
-        """Execute a single test case"""
+    def _load_function(self, compiled, function_name: str):
+        """
+        Execute the compiled submission once in a restricted environment
+        Returns: (user_function, error)
+        """
+        # Same template namespace as the judge workers, with restricted builtins
+        restricted_globals = solution_namespace(restricted=True)
+        local_scope = {}
+        
+        try:
+            exec(compiled, restricted_globals, local_scope)
+        except Exception as e:
+            return None, f"{type(e).__name__}: {str(e)}"
+        
+        if function_name not in local_scope:
+            return None, f"Function '{function_name}' not found in your code"
+        
+        return local_scope[function_name], None
+    
+    def _error_result(self, test_case: Dict, index: int, error: str) -> TestResult:
+        """Failed result for a test case that could not run"""
+        return TestResult(
+            passed=False,
+            test_case_index=index,
+            description=test_case.get("description", f"Test {index + 1}"),
+            input=test_case["input"],
+            expected=test_case["expected"],
+            actual=None,
+            error=error
+        )
+    
+    def _execute_single_test(self, user_function, test_case: Dict, index: int) -> TestResult:
+        """Execute a single test case against the already loaded function"""
         import time
         
         test_input = test_case["input"]
         expected = test_case["expected"]
         description = test_case.get("description", f"Test {index + 1}")
-        order_independent = test_case.get("order_independent", False)
         
         try:
-            start_time = time.time()
+            # Registry cases are shared across requests, so the submission gets its own copy
+            call_input = fresh_input(test_case)
             
-            # Create restricted execution environment
-            restricted_globals = {
-                "__builtins__": {
-                    "range": range,
-                    "len": len,
-                    "enumerate": enumerate,
-                    "zip": zip,
-                    "map": map,
-                    "filter": filter,
-                    "sorted": sorted,
-                    "sum": sum,
-                    "max": max,
-                    "min": min,
-                    "abs": abs,
-                    "int": int,
-                    "str": str,
-                    "float": float,
-                    "bool": bool,
-                    "list": list,
-                    "dict": dict,
-                    "set": set,
-                    "tuple": tuple,
-                    "True": True,
-                    "False": False,
-                    "None": None,
-                }
-            }
-            local_scope = {}
-            
-            # Execute the user's code
-            exec(code, restricted_globals, local_scope)
-            
-            # Get the function
-            if function_name not in local_scope:
-                return TestResult(
-                    passed=False,
-                    test_case_index=index,
-                    description=description,
-                    input=test_input,
-                    expected=expected,
-                    actual=None,
-                    error=f"Function '{function_name}' not found in your code"
-                )
-            
-            user_function = local_scope[function_name]
+            # High-resolution CPU clock: wall time on a busy host is mostly noise
+            start_time = time.process_time_ns()
             
             # Call the function with test inputs
-            actual = user_function(**test_input)
+            with self._timeout():
+                actual = user_function(**call_input)
             
-            execution_time_ms = (time.time() - start_time) * 1000
+            execution_time_ms = (time.process_time_ns() - start_time) / 1e6
             
-            # Compare results
-            passed = self._compare_results(expected, actual, order_independent)
+            # Judge with the case's checker (registry cases carry its canonical expectation)
+            passed = case_passes(test_case, actual, lambda: fresh_input(test_case))
             
             return TestResult(
                 passed=passed,
@@ -181,39 +177,30 @@ class CodeExecutor:
                 execution_time_ms=execution_time_ms
             )
         
-        except TimeoutException as e:
-            return TestResult(
-                passed=False,
-                test_case_index=index,
-                description=description,
-                input=test_input,
-                expected=expected,
-                actual=None,
-                error=str(e)
-            )
+        except TimeoutException:
+            return self._error_result(test_case, index, f"{TIME_LIMIT_EXCEEDED} (max {self.timeout_seconds:g} seconds)")
+        
+        except MemoryError:
+            return self._error_result(test_case, index, MEMORY_LIMIT_EXCEEDED)
         
         except Exception as e:
-            return TestResult(
-                passed=False,
-                test_case_index=index,
-                description=description,
-                input=test_input,
-                expected=expected,
-                actual=None,
-                error=f"{type(e).__name__}: {str(e)}"
-            )
+            return self._error_result(test_case, index, f"{type(e).__name__}: {str(e)}")
+    
+    @contextmanager
+    def _timeout(self):
+        """Install timeout_handler on SIGALRM for the duration of one call (main thread, Unix only)"""
+        if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+            yield
+            return
+        previous = signal.signal(signal.SIGALRM, timeout_handler)
+        signal.setitimer(signal.ITIMER_REAL, self.timeout_seconds)
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
     
     def _compare_results(self, expected: Any, actual: Any, order_independent: bool = False) -> bool:
         """Compare expected and actual results"""
-        if order_independent:
-            # For problems where order doesn't matter (e.g., group anagrams)
-            if isinstance(expected, list) and isinstance(actual, list):
-                # Sort both for comparison
-                try:
-                    expected_sorted = sorted([sorted(x) if isinstance(x, list) else x for x in expected])
-                    actual_sorted = sorted([sorted(x) if isinstance(x, list) else x for x in actual])
-                    return expected_sorted == actual_sorted
-                except:
-                    return set(map(tuple, expected)) == set(map(tuple, actual))
-        
-        return expected == actual
+        checker = get_checker("unordered_nested" if order_independent else "exact")
+        return checker.check(checker.prepare(expected), actual, dict)
@@ -0,0 +1,170 @@
+"""
+Code Facts
+Structural facts about a submission gathered in one pass over its AST:
+loop nesting, recursion, allocation sites, builtin sorts and dict/set use.
+The traversal keeps its own stack instead of recursing like ast.NodeVisitor,
+so it is O(nodes) and works on trees as deep as ast.parse accepts (long
+expression chains overflow a recursive visitor). Computed once per source
+through analyzers.ast_cache; treat the result as read-only.
+"""
+import ast
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+_LOOPS = (ast.For, ast.AsyncFor)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_ALLOCATING_COMPREHENSIONS = frozenset({ast.ListComp, ast.SetComp, ast.DictComp})
+# Nodes whose children run at a different loop depth or in another function
+_SCOPED = frozenset({ast.For, ast.AsyncFor, ast.While, ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda,
+                     ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp})
+_COPYING_BUILTINS = {"list", "set", "dict", "sorted", "tuple", "frozenset"}
+_DICT_FACTORIES = {"dict", "defaultdict", "Counter", "OrderedDict"}
+_SET_FACTORIES = {"set", "frozenset"}
+
+
+@dataclass
+class CodeFacts:
+    max_loop_depth: int = 0  # comprehension generators count as loops
+    recursive_functions: List[str] = field(default_factory=list)
+    allocation_sites: List[int] = field(default_factory=list)  # lines building O(n) containers
+    sort_calls: List[int] = field(default_factory=list)  # lines calling sorted() or .sort()
+    dict_sites: List[int] = field(default_factory=list)
+    set_sites: List[int] = field(default_factory=list)
+    node_count: int = 0
+
+    @property
+    def is_recursive(self) -> bool:
+        return bool(self.recursive_functions)
+
+    @property
+    def uses_dict(self) -> bool:
+        return bool(self.dict_sites)
+
+    @property
+    def uses_set(self) -> bool:
+        return bool(self.set_sites)
+
+
+def _called_name(call: ast.Call) -> Optional[str]:
+    func = call.func
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    return None
+
+
+def _children(node: ast.AST, depth: int, function: Optional[str]) -> Iterator[Tuple[ast.AST, int, Optional[str]]]:
+    """Children of a _SCOPED node with the loop depth and enclosing function they execute in"""
+    if isinstance(node, _LOOPS):
+        yield node.target, depth, function
+        yield node.iter, depth, function
+        for stmt in node.body:
+            yield stmt, depth + 1, function
+        for stmt in node.orelse:
+            yield stmt, depth, function
+    elif isinstance(node, ast.While):
+        # The condition is evaluated on every iteration
+        yield node.test, depth + 1, function
+        for stmt in node.body:
+            yield stmt, depth + 1, function
+        for stmt in node.orelse:
+            yield stmt, depth, function
+    elif isinstance(node, _COMPREHENSIONS):
+        for level, generator in enumerate(node.generators):
+            yield generator.iter, depth + level, function
+            yield generator.target, depth + level + 1, function
+            for condition in generator.ifs:
+                yield condition, depth + level + 1, function
+        inner = depth + len(node.generators)
+        if isinstance(node, ast.DictComp):
+            yield node.key, inner, function
+            yield node.value, inner, function
+        else:
+            yield node.elt, inner, function
+    elif isinstance(node, _FUNCTIONS):
+        for child in node.decorator_list:
+            yield child, depth, function
+        yield node.args, depth, function
+        # A body runs when called, not where it is defined
+        for stmt in node.body:
+            yield stmt, 0, node.name
+    elif isinstance(node, ast.Lambda):
+        yield node.args, depth, function
+        yield node.body, 0, None
+
+
+def _is_self_call(call: ast.Call, function: Optional[str]) -> bool:
+    func = call.func
+    if function is None:
+        return False
+    if isinstance(func, ast.Name):
+        return func.id == function
+    # self.method(...) inside that method
+    return (isinstance(func, ast.Attribute) and func.attr == function
+            and isinstance(func.value, ast.Name) and func.value.id == "self")
+
+
+def collect_facts(tree: ast.AST) -> CodeFacts:
+    """Every fact in a single O(nodes) traversal"""
+    facts = CodeFacts()
+    recursive = set()
+    max_depth = count = 0
+    stack = [(tree, 0, None)]
+    pop, push = stack.pop, stack.append
+    AST = ast.AST
+    while stack:
+        node, depth, function = pop()
+        count += 1
+        kind = type(node)
+
+        if kind is ast.Call:
+            name = _called_name(node)
+            if _is_self_call(node, function):
+                recursive.add(function)
+            if name == "sorted" or (name == "sort" and isinstance(node.func, ast.Attribute)):
+                facts.sort_calls.append(node.lineno)
+            if isinstance(node.func, ast.Name) and name in _COPYING_BUILTINS and node.args:
+                facts.allocation_sites.append(node.lineno)
+            if name in _DICT_FACTORIES:
+                facts.dict_sites.append(node.lineno)
+            elif name in _SET_FACTORIES:
+                facts.set_sites.append(node.lineno)
+        elif kind is ast.BinOp:
+            # [x] * n
+            if type(node.op) is ast.Mult and (type(node.left) is ast.List or type(node.right) is ast.List):
+                facts.allocation_sites.append(node.lineno)
+        elif kind is ast.Dict:
+            facts.dict_sites.append(node.lineno)
+        elif kind is ast.Set:
+            facts.set_sites.append(node.lineno)
+        elif kind in _ALLOCATING_COMPREHENSIONS:
+            facts.allocation_sites.append(node.lineno)
+            if kind is ast.DictComp:
+                facts.dict_sites.append(node.lineno)
+            elif kind is ast.SetComp:
+                facts.set_sites.append(node.lineno)
+
+        if kind in _SCOPED:
+            for child in _children(node, depth, function):
+                if child[1] > max_depth:
+                    max_depth = child[1]
+                push(child)
+            continue
+        # Same as ast.iter_child_nodes, without a generator per node
+        for name in node._fields:
+            value = getattr(node, name, None)
+            if isinstance(value, AST):
+                push((value, depth, function))
+            elif type(value) is list:
+                for item in value:
+                    if isinstance(item, AST):
+                        push((item, depth, function))
+
+    facts.max_loop_depth = max_depth
+    facts.node_count = count
+    facts.recursive_functions = sorted(recursive)
+    for lines in (facts.allocation_sites, facts.sort_calls, facts.dict_sites, facts.set_sites):
+        lines.sort()
+    return facts
@@ -1,64 +1,91 @@
-import ast
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
-class ComplexityAnalyzer:
+from analyzers.ast_cache import ast_cache
+from analyzers.code_facts import collect_facts
+from analyzers.cost_model import Complexity, infer_cost
+
+
+def score_time_complexity(time: Optional[Complexity]):
     """
-    Analyzes Python code to estimate Time and Space complexity.
-    Uses AST (Abstract Syntax Tree) traversal.
+    Map a time complexity to (feedback tier, points, is_optimal)
     """
+    if time is None or time.exponential:
+        # Unknown, or O(2^n)
+        return "improvable", 50, False
+    if time.power >= 2:
+        return "improvable", 60, False
+    # O(n log n) and below are optimal for most easy/medium problems
+    return "optimal", 100, True
 
-    def analyze(self, code: str):
-        """
-        Returns a dict: {'time': 'O(n)', 'space': 'O(1)', 'details': '...'}
-        """
-        try:
-            tree = ast.parse(code)
-        except SyntaxError:
-            return {"time": "Unknown", "space": "Unknown", "details": "Syntax Error"}
 
-        max_nesting = 0
-        
-        # Traverse for loops to find max nesting depth
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.For, ast.While)):
-                depth = self._get_loop_depth(node)
-                max_nesting = max(max_nesting, depth)
+@dataclass
+class ComplexityAnalysis:
+    time: Optional[Complexity]  # None when the code does not parse
+    space: Optional[Complexity]
+    confidence: float
+    nested_loop_depth: int = 0
+    data_structures_created: List[str] = field(default_factory=list)
+    patterns: List[str] = field(default_factory=list)
+    details: str = ""
+    empirical: Optional[Dict[str, Any]] = None  # EmpiricalComplexity.to_dict() of a measured fit
 
-        time_complexity = self._depth_to_big_o(max_nesting)
-        space_complexity = "O(1)" # Default, heuristic refinement needed for arrays
+    @property
+    def time_complexity(self) -> str:
+        return str(self.time) if self.time else "Unknown"
 
-        # Heuristic for space: Look for list multiplications or extensive allocations
-        if self._detect_heavy_allocation(tree):
-            space_complexity = "O(n)"
+    @property
+    def space_complexity(self) -> str:
+        return str(self.space) if self.space else "Unknown"
 
-        return {
-            "time": time_complexity,
-            "space": space_complexity,
-            "details": f"Detected nesting level: {max_nesting}"
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "time": self.time_complexity,
+            "space": self.space_complexity,
+            "confidence": self.confidence,
+            "patterns": list(self.patterns),
+            "details": self.details,
         }
+        if self.empirical:
+            result["empirical"] = self.empirical
+        return result
+
 
-    def _get_loop_depth(self, node, current_depth=1):
-        """Recursively calculate loop nesting depth"""
-        max_depth = current_depth
-        for child in ast.iter_child_nodes(node):
-            if isinstance(child, (ast.For, ast.While)):
-                max_depth = max(max_depth, self._get_loop_depth(child, current_depth + 1))
-        return max_depth
+class ComplexityAnalyzer:
+    """
+    Analyzes Python code to estimate Time and Space complexity.
+    Costs come from the symbolic cost model (analyzers.cost_model); loop depth and data
+    structures from the single-pass AST facts (analyzers.code_facts), both over the shared
+    parse (analyzers.ast_cache).
+    """
+
+    def analyze(self, code: str, language: str = "python") -> ComplexityAnalysis:
+        """
+        Returns a new ComplexityAnalysis, e.g. time O(n log n), space O(n)
+        """
+        try:
+            facts = ast_cache.fact(code, "code_facts", collect_facts)
+            cost = ast_cache.fact(code, "cost_report", infer_cost)
+        except (SyntaxError, ValueError):
+            return ComplexityAnalysis(time=None, space=None, confidence=0.0, details="Syntax Error")
+        except RecursionError:
+            # Nested deeper than the parser or the fact pass can follow
+            return ComplexityAnalysis(time=None, space=None, confidence=0.0, details="Too deeply nested to analyze")
 
-    def _depth_to_big_o(self, depth):
-        if depth == 0: return "O(1)"
-        if depth == 1: return "O(n)"
-        if depth == 2: return "O(n²)"
-        if depth == 3: return "O(n³)"
-        return f"O(n^{depth})"
+        structures = []
+        if facts.uses_dict:
+            structures.append("dict")
+        if facts.uses_set:
+            structures.append("set")
+        if facts.allocation_sites:
+            structures.append("list")
 
-    def _detect_heavy_allocation(self, tree):
-        """Detect obvious O(n) space allocs like [0]*n or list comprehensions"""
-        for node in ast.walk(tree):
-            # Check for list multiplication: [x] * n
-            if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
-                if isinstance(node.left, ast.List) or isinstance(node.right, ast.List):
-                    return True
-            # Check for list comprehension
-            if isinstance(node, ast.ListComp):
-                return True
-        return False
+        return ComplexityAnalysis(
+            time=cost.time,
+            space=cost.space,
+            confidence=cost.confidence,
+            nested_loop_depth=facts.max_loop_depth,
+            data_structures_created=structures,
+            patterns=list(cost.patterns),
+            details=f"Detected nesting level: {facts.max_loop_depth}"
+        )
@@ -0,0 +1,603 @@
+"""
+Cost Model
+Symbolic time and space inference for a submission. Instead of counting loop
+depth, every statement gets a cost: loops multiply their body by an iteration
+count (halving or doubling loops contribute log n, pointer loops nested in
+another loop are amortized), library calls and container operations are
+priced from a cost table (sorted, list.index, `in` on a list vs a set,
+slicing, heapq, bisect), and calls to the submission's own functions cost
+what their bodies cost, with recursion priced by how its argument shrinks
+and whether it is memoized. Costs are Complexity values, ordered and
+multiplied symbolically, so callers compare them instead of matching strings.
+Code too deep to follow (a chain of more than MAX_CALL_DEPTH of its own
+calls, or nesting past the interpreter's recursion limit) has unknown cost.
+"""
+import ast
+import re
+from dataclasses import dataclass, field
+from functools import total_ordering
+from typing import Dict, List, Optional, Set
+
+_SUPERSCRIPTS = {2: "²", 3: "³"}
+
+
+@total_ordering
+@dataclass(frozen=True)
+class Complexity:
+    """n^power * log^log n, or 2^n when exponential"""
+    power: int = 0
+    log: int = 0
+    exponential: bool = False
+
+    @property
+    def rank(self) -> tuple:
+        return (self.exponential, self.power, self.log)
+
+    def __lt__(self, other: "Complexity") -> bool:
+        return self.rank < other.rank
+
+    def __mul__(self, other: "Complexity") -> "Complexity":
+        if self.exponential or other.exponential:
+            return EXPONENTIAL
+        return Complexity(self.power + other.power, self.log + other.log)
+
+    def __add__(self, other: "Complexity") -> "Complexity":
+        # Sequential costs: the dominant term wins
+        return max(self, other)
+
+    def steps_above(self, other: "Complexity") -> int:
+        """Rungs of the usual ladder (O(1) < O(log n) < O(n) < ... < O(2^n)) between other and self"""
+        if self <= other:
+            return -sum(1 for rung in LADDER if self < rung <= other)
+        return sum(1 for rung in LADDER if other < rung <= self)
+
+    def __str__(self) -> str:
+        if self.exponential:
+            return "O(2^n)"
+        parts = []
+        if self.power:
+            parts.append("n" if self.power == 1 else f"n{_SUPERSCRIPTS.get(self.power, f'^{self.power}')}")
+        if self.log:
+            parts.append("log n" if self.log == 1 else f"log^{self.log} n")
+        return f"O({' '.join(parts) or '1'})"
+
+    @classmethod
+    def parse(cls, label: Optional[str]) -> Optional["Complexity"]:
+        """Complexity of a label like 'O(n log n)' or 'O(n^2)'; None for anything else ('N/A', 'Unknown')"""
+        if not label:
+            return None
+        match = re.fullmatch(r"\s*O\((.*)\)\s*", label)
+        if not match:
+            return None
+        body = match.group(1).replace("²", "^2").replace("³", "^3").replace(" ", "")
+        if body == "1":
+            return CONSTANT
+        if body in ("2^n", "c^n"):
+            return EXPONENTIAL
+        term = re.fullmatch(r"(n(?:\^(\d+))?)?(\*?log(?:\^(\d+))?n)?", body)
+        if not term or not (term.group(1) or term.group(3)):
+            return None
+        power = (int(term.group(2)) if term.group(2) else 1) if term.group(1) else 0
+        log = (int(term.group(4)) if term.group(4) else 1) if term.group(3) else 0
+        return cls(power, log)
+
+
+CONSTANT = Complexity()
+LOGARITHMIC = Complexity(0, 1)
+LINEAR = Complexity(1)
+LINEARITHMIC = Complexity(1, 1)
+QUADRATIC = Complexity(2)
+CUBIC = Complexity(3)
+EXPONENTIAL = Complexity(exponential=True)
+LADDER = (CONSTANT, LOGARITHMIC, LINEAR, LINEARITHMIC, QUADRATIC, CUBIC, EXPONENTIAL)
+
+# Calls by name (builtins and functions imported from heapq, bisect, collections)
+CALL_COSTS: Dict[str, Complexity] = {
+    "sorted": LINEARITHMIC,
+    "sum": LINEAR, "min": LINEAR, "max": LINEAR, "any": LINEAR, "all": LINEAR,
+    "list": LINEAR, "set": LINEAR, "dict": LINEAR, "tuple": LINEAR, "frozenset": LINEAR,
+    "Counter": LINEAR, "deque": LINEAR, "str": CONSTANT, "len": CONSTANT,
+    "range": CONSTANT, "enumerate": CONSTANT, "zip": CONSTANT, "reversed": CONSTANT,
+    "map": CONSTANT, "filter": CONSTANT, "iter": CONSTANT, "abs": CONSTANT, "ord": CONSTANT, "chr": CONSTANT,
+    "heapify": LINEAR, "heappush": LOGARITHMIC, "heappop": LOGARITHMIC,
+    "heappushpop": LOGARITHMIC, "heapreplace": LOGARITHMIC,
+    "nlargest": LINEARITHMIC, "nsmallest": LINEARITHMIC,
+    "bisect": LOGARITHMIC, "bisect_left": LOGARITHMIC, "bisect_right": LOGARITHMIC, "insort": LINEAR,
+}
+# Builtins that are O(1) when called without an iterable (max(a, b), list())
+_ITERABLE_CONSUMERS = {"sum", "min", "max", "any", "all", "list", "set", "dict", "tuple", "frozenset",
+                       "Counter", "deque", "sorted"}
+_LIBRARY_MODULES = {"heapq", "bisect", "collections", "math", "itertools", "functools"}
+
+# Method calls by attribute name; container-specific exceptions are handled in _method_cost
+METHOD_COSTS: Dict[str, Complexity] = {
+    "sort": LINEARITHMIC, "most_common": LINEARITHMIC,
+    "index": LINEAR, "count": LINEAR, "remove": LINEAR, "insert": LINEAR, "copy": LINEAR,
+    "extend": LINEAR, "update": LINEAR, "reverse": LINEAR, "join": LINEAR, "split": LINEAR,
+    "replace": LINEAR, "strip": LINEAR, "lower": LINEAR, "upper": LINEAR, "values": CONSTANT,
+}
+# Calls that grow a container by one element
+_GROWING_METHODS = {"append", "appendleft", "add", "insert", "setdefault", "heappush"}
+_HASHED = {"set", "dict"}
+_SEQUENCES = {"list", "str", "tuple", "deque", "param"}
+_MEMO_DECORATORS = {"cache", "lru_cache"}
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_TRIES = (ast.Try,) + ((ast.TryStar,) if hasattr(ast, "TryStar") else ())
+# Calls between the submission's own functions followed before giving up on a time
+MAX_CALL_DEPTH = 64
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+@dataclass
+class CostReport:
+    time: Optional[Complexity]  # None when the code was too deep to follow
+    space: Optional[Complexity]
+    confidence: float
+    patterns: List[str] = field(default_factory=list)
+
+
+def _name_of(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _own_nodes(function: ast.AST):
+    """Nodes of a function body, not descending into nested function definitions"""
+    stack = list(function.body)
+    while stack:
+        node = stack.pop()
+        yield node
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, _FUNCTIONS + (ast.Lambda,)):
+                stack.append(child)
+
+
+def _assigned_names(statements) -> Set[str]:
+    names = set()
+    for statement in statements:
+        for node in ast.walk(statement):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                names.add(node.id)
+    return names
+
+
+def _kind_of(value: ast.AST, kinds: Dict[str, str]) -> Optional[str]:
+    """Container kind an expression evaluates to, when it is evident"""
+    if isinstance(value, (ast.List, ast.ListComp)):
+        return "list"
+    if isinstance(value, (ast.Dict, ast.DictComp)):
+        return "dict"
+    if isinstance(value, (ast.Set, ast.SetComp)):
+        return "set"
+    if isinstance(value, ast.Tuple):
+        return "tuple"
+    if isinstance(value, (ast.JoinedStr,)) or (isinstance(value, ast.Constant) and isinstance(value.value, str)):
+        return "str"
+    if isinstance(value, ast.BinOp) and isinstance(value.op, ast.Mult):
+        if isinstance(value.left, ast.List) or isinstance(value.right, ast.List):
+            return "list"
+    if isinstance(value, ast.Name):
+        return kinds.get(value.id)
+    if isinstance(value, ast.Call):
+        name = _name_of(value.func)
+        if name in ("list", "sorted", "split"):
+            return "list"
+        if name in ("dict", "defaultdict", "Counter", "OrderedDict"):
+            return "dict"
+        if name in ("set", "frozenset"):
+            return "set"
+        if name == "deque":
+            return "deque"
+    return None
+
+
+def _annotation_kind(annotation: Optional[ast.AST]) -> str:
+    name = _name_of(annotation.value if isinstance(annotation, ast.Subscript) else annotation) if annotation else None
+    return {"List": "list", "list": "list", "str": "str", "Set": "set", "set": "set",
+            "Dict": "dict", "dict": "dict"}.get(name, "param")
+
+
+def _halves(node: ast.AST) -> bool:
+    """An expression that halves or doubles: x // 2, x >> 1, x * 2, x << 1, (lo + hi) // 2"""
+    if isinstance(node, ast.BinOp):
+        if isinstance(node.op, (ast.FloorDiv, ast.RShift, ast.LShift, ast.Div)):
+            return True
+        if isinstance(node.op, ast.Mult):
+            return any(isinstance(side, ast.Constant) and side.value == 2 for side in (node.left, node.right))
+    return False
+
+
+def _repeats_list(node: ast.BinOp) -> bool:
+    """[0] * n; [0] * 26 has constant size"""
+    for side, other in ((node.left, node.right), (node.right, node.left)):
+        if isinstance(side, ast.List) and not isinstance(other, ast.Constant):
+            return True
+    return False
+
+
+class _Loop:
+    """An enclosing loop and the statements of its body"""
+
+    def __init__(self, statements):
+        self.statements = statements
+
+    def assigned_outside(self, inner: ast.AST) -> Set[str]:
+        """Names the loop (re)binds on every iteration, apart from inside `inner`"""
+        names = set()
+        stack = list(self.statements)
+        while stack:
+            node = stack.pop()
+            if node is inner:
+                continue
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                names.add(node.id)
+            stack.extend(ast.iter_child_nodes(node))
+        return names
+
+
+class _TooDeep(Exception):
+    """A call chain longer than MAX_CALL_DEPTH"""
+    pass
+
+
+class CostModel:
+    """Cost of a parsed module; build one per tree and call report()"""
+
+    def __init__(self, tree: ast.AST):
+        self.tree = tree
+        self.functions: Dict[str, ast.AST] = {}
+        # Calls made directly by each function's own body, gathered in one walk
+        self._calls: Dict[str, List[ast.Call]] = {}
+        stack = [(tree, None)]
+        while stack:
+            node, function = stack.pop()
+            if isinstance(node, _FUNCTIONS):
+                self.functions[node.name] = node
+                self._calls.setdefault(node.name, [])
+                function = node.name
+            elif isinstance(node, ast.Call) and function is not None:
+                self._calls[function].append(node)
+            stack.extend((child, function) for child in ast.iter_child_nodes(node))
+        self._costs: Dict[str, Complexity] = {}
+        self._in_progress: Set[str] = set()
+        self.space = CONSTANT
+        self.confidence = 0.9
+        self.patterns: List[str] = []
+
+    def report(self) -> CostReport:
+        # Entry points are the functions no other function calls
+        called = {_name_of(call.func) for name, calls in self._calls.items() for call in calls
+                  if _name_of(call.func) != name}
+        try:
+            cost = self._block([s for s in self.tree.body if not isinstance(s, (ast.ClassDef,) + _FUNCTIONS)], {}, [])
+            for name in self.functions:
+                if name not in called:
+                    cost = cost + self.function_cost(name)
+        except (_TooDeep, RecursionError):
+            return CostReport(None, None, 0.0)
+        return CostReport(cost, self.space, self.confidence, self.patterns)
+
+    def _pattern(self, name: str):
+        if name not in self.patterns:
+            self.patterns.append(name)
+
+    # Functions and recursion
+
+    def function_cost(self, name: str) -> Complexity:
+        if name in self._costs:
+            return self._costs[name]
+        if name in self._in_progress:
+            # A recursive call: priced by the caller's recursion analysis
+            return CONSTANT
+        if len(self._in_progress) >= MAX_CALL_DEPTH:
+            raise _TooDeep(name)
+        function = self.functions[name]
+        params = [arg for arg in function.args.args if arg.arg not in ("self", "cls")]
+        kinds = {arg.arg: _annotation_kind(arg.annotation) for arg in params}
+        # def f(n, memo={}): a default says what the parameter holds
+        for arg, default in zip(params[len(params) - len(function.args.defaults):], function.args.defaults):
+            kinds[arg.arg] = _kind_of(default, {}) or kinds[arg.arg]
+        self._in_progress.add(name)
+        per_call = self._block(function.body, kinds, [])
+        self._in_progress.discard(name)
+
+        calls = [call for call in self._calls[name] if self._calls_itself(call, name)]
+        cost = per_call if not calls else self._recursion_cost(function, calls, per_call)
+        self._costs[name] = cost
+        return cost
+
+    @staticmethod
+    def _calls_itself(call: ast.Call, name: str) -> bool:
+        func = call.func
+        if isinstance(func, ast.Name):
+            return func.id == name
+        return (isinstance(func, ast.Attribute) and func.attr == name
+                and isinstance(func.value, ast.Name) and func.value.id == "self")
+
+    def _recursion_cost(self, function: ast.AST, calls: List[ast.Call], per_call: Complexity) -> Complexity:
+        params = [arg.arg for arg in function.args.args if arg.arg not in ("self", "cls")]
+        args = [arg for call in calls for arg in call.args]
+        if self._is_memoized(function):
+            # Each distinct state is solved once: one dimension per parameter the calls change
+            varying = {i for call in calls for i, arg in enumerate(call.args)
+                       if i < len(params) and not (isinstance(arg, ast.Name) and arg.id == params[i])}
+            self._pattern("memoized recursion")
+            self.space = self.space + LINEAR
+            return Complexity(max(1, min(len(varying), 2))) * per_call
+        if args and all(isinstance(arg, ast.Attribute) or isinstance(arg, ast.Constant) for arg in args):
+            # node.left / node.right / node.next: every node is visited once
+            self._pattern("tree traversal")
+            self.space = self.space + LINEAR
+            return LINEAR * per_call
+        if any(_halves(arg) or self._is_halving_slice(arg) for arg in args) or self._uses_midpoint(function, args):
+            self.space = self.space + LOGARITHMIC
+            if len(calls) == 1:
+                self._pattern("binary search")
+                return LOGARITHMIC * per_call
+            # Divide and conquer, T(n) = 2T(n/2) + f(n)
+            self._pattern("divide and conquer")
+            if per_call.power > 1 or per_call.exponential:
+                return per_call
+            if per_call.power == 1:
+                return per_call * LOGARITHMIC
+            return LINEAR
+        self.space = self.space + LINEAR
+        if len(calls) == 1:
+            self._pattern("recursion")
+            return LINEAR * per_call
+        self._pattern("exponential recursion")
+        # Backtracking over choices is often intended; say so with lower confidence
+        self.confidence = min(self.confidence, 0.7)
+        return EXPONENTIAL
+
+    @staticmethod
+    def _is_halving_slice(node: ast.AST) -> bool:
+        return (isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice)
+                and any(isinstance(bound, ast.Name) or _halves(bound)
+                        for bound in (node.slice.lower, node.slice.upper) if bound is not None))
+
+    @staticmethod
+    def _uses_midpoint(function: ast.AST, args: List[ast.AST]) -> bool:
+        """Recursive calls on a bound computed as a midpoint: mid = (lo + hi) // 2; f(lo, mid)"""
+        midpoints = {target.id for node in _own_nodes(function) if isinstance(node, ast.Assign) and _halves(node.value)
+                     for target in node.targets if isinstance(target, ast.Name)}
+        return any(isinstance(sub, ast.Name) and sub.id in midpoints for arg in args for sub in ast.walk(arg))
+
+    def _is_memoized(self, function: ast.AST) -> bool:
+        for decorator in function.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if _name_of(target) in _MEMO_DECORATORS:
+                return True
+        # if key in memo: return memo[key]
+        for node in _own_nodes(function):
+            if (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+                    and any(isinstance(op, ast.In) for op in node.test.ops)
+                    and any(isinstance(stmt, ast.Return) and isinstance(stmt.value, ast.Subscript) for stmt in node.body)):
+                return True
+        return False
+
+    # Statements
+
+    def _block(self, statements, kinds: Dict[str, str], loops: List[_Loop]) -> Complexity:
+        cost = CONSTANT
+        for statement in statements:
+            cost = cost + self._statement(statement, kinds, loops)
+        return cost
+
+    def _statement(self, node: ast.AST, kinds: Dict[str, str], loops: List[_Loop]) -> Complexity:
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            iterations = self._for_iterations(node.iter)
+            body = self._block(node.body, kinds, loops + [_Loop(node.body)])
+            return self._expr(node.iter, kinds, loops) + iterations * body + self._block(node.orelse, kinds, loops)
+        if isinstance(node, ast.While):
+            iterations = self._while_iterations(node, loops)
+            inner = loops + [_Loop(node.body)]
+            body = self._expr(node.test, kinds, inner) + self._block(node.body, kinds, inner)
+            return iterations * body + self._block(node.orelse, kinds, loops)
+        if isinstance(node, ast.If):
+            return self._expr(node.test, kinds, loops) + self._block(node.body, kinds, loops) + \
+                self._block(node.orelse, kinds, loops)
+        if isinstance(node, (ast.ClassDef,) + _FUNCTIONS):
+            # Defining costs nothing; calls are priced where they happen
+            return CONSTANT
+        if isinstance(node, _TRIES):
+            cost = self._block(node.body, kinds, loops) + self._block(node.orelse, kinds, loops)
+            for handler in node.handlers:
+                cost = cost + self._block(handler.body, kinds, loops)
+            return cost + self._block(node.finalbody, kinds, loops)
+        if isinstance(node, ast.Match):
+            # Only one case runs, so the dearest one counts
+            cost = self._expr(node.subject, kinds, loops)
+            for case in node.cases:
+                if case.guard is not None:
+                    cost = cost + self._expr(case.guard, kinds, loops)
+                cost = cost + self._block(case.body, kinds, loops)
+            return cost
+        if isinstance(node, (ast.With, ast.AsyncWith)):
+            cost = CONSTANT
+            for item in node.items:
+                cost = cost + self._expr(item.context_expr, kinds, loops)
+            return cost + self._block(node.body, kinds, loops)
+
+        cost = CONSTANT
+        for child in ast.iter_child_nodes(node):
+            cost = cost + self._expr(child, kinds, loops)
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+            kind = _kind_of(node.value, kinds)
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    if kind:
+                        kinds[target.id] = kind
+                    else:
+                        kinds.pop(target.id, None)
+                elif isinstance(target, ast.Subscript) and loops:
+                    # d[key] = value inside a loop grows d
+                    self.space = self.space + LINEAR
+        return cost
+
+    def _for_iterations(self, iterable: ast.AST) -> Complexity:
+        if isinstance(iterable, ast.Call) and _name_of(iterable.func) == "range":
+            if all(isinstance(arg, ast.Constant) for arg in iterable.args):
+                return CONSTANT
+            return LINEAR
+        if isinstance(iterable, (ast.List, ast.Tuple, ast.Set)) or (
+                isinstance(iterable, ast.Constant) and isinstance(iterable.value, str)):
+            return CONSTANT
+        return LINEAR
+
+    def _while_iterations(self, node: ast.While, loops: List[_Loop]) -> Complexity:
+        test_names = {n.id for n in ast.walk(node.test) if isinstance(n, ast.Name)}
+        halving, stepping = False, set()
+        for statement in node.body:
+            for sub in ast.walk(statement):
+                if isinstance(sub, ast.AugAssign) and isinstance(sub.target, ast.Name):
+                    if isinstance(sub.op, (ast.FloorDiv, ast.RShift, ast.LShift, ast.Div)) or (
+                            isinstance(sub.op, ast.Mult) and isinstance(sub.value, ast.Constant) and sub.value.value == 2):
+                        halving = True
+                    elif isinstance(sub.op, (ast.Add, ast.Sub)):
+                        stepping.add(sub.target.id)
+                elif isinstance(sub, ast.Assign) and _halves(sub.value):
+                    halving = True
+        if halving:
+            self._pattern("halving loop")
+            return LOGARITHMIC
+
+        if loops:
+            # A pointer that persists across the outer loop, or a stack drained as it was filled, moves
+            # at most n times in total: amortized O(1) per outer iteration
+            drains = any(isinstance(sub, ast.Call) and _name_of(sub.func) in ("pop", "popleft", "heappop")
+                         and isinstance(sub.func, ast.Attribute) and _name_of(sub.func.value) in test_names
+                         for statement in node.body for sub in ast.walk(statement))
+            pointers = (stepping & test_names) or stepping
+            if drains or (pointers and not pointers & loops[-1].assigned_outside(node)):
+                self._pattern("amortized pointer")
+                return CONSTANT
+        if not stepping and not test_names & _assigned_names(node.body):
+            # No recognizable progress: still linear, but less sure
+            self.confidence = min(self.confidence, 0.75)
+        return LINEAR
+
+    # Expressions
+
+    def _expr(self, expr: ast.AST, kinds: Dict[str, str], loops: List[_Loop]) -> Complexity:
+        cost = CONSTANT
+        stack = [expr]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, _COMPREHENSIONS):
+                cost = cost + self._comprehension(node, kinds, loops)
+                continue
+            if isinstance(node, (ast.Lambda,) + _FUNCTIONS):
+                continue
+            if isinstance(node, ast.Call):
+                cost = cost + self._call(node, kinds, loops)
+            elif isinstance(node, ast.Compare):
+                for op, container in zip(node.ops, node.comparators):
+                    if isinstance(op, (ast.In, ast.NotIn)):
+                        cost = cost + self._membership(container, kinds)
+            elif isinstance(node, ast.Subscript) and isinstance(node.slice, ast.Slice) \
+                    and isinstance(node.ctx, ast.Load):
+                cost = cost + LINEAR
+                self.space = self.space + LINEAR
+            elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult) and _repeats_list(node):
+                cost = cost + LINEAR
+                self.space = self.space + LINEAR
+            stack.extend(ast.iter_child_nodes(node))
+        return cost
+
+    def _comprehension(self, node: ast.AST, kinds: Dict[str, str], loops: List[_Loop]) -> Complexity:
+        cost, size = CONSTANT, CONSTANT
+        for generator in node.generators:
+            cost = cost + size * self._expr(generator.iter, kinds, loops)
+            size = size * self._for_iterations(generator.iter)
+            for condition in generator.ifs:
+                cost = cost + size * self._expr(condition, kinds, loops)
+        elements = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+        space_before = self.space
+        self.space = CONSTANT
+        for element in elements:
+            cost = cost + size * self._expr(element, kinds, loops)
+        element_space, self.space = self.space, space_before
+        if not isinstance(node, ast.GeneratorExp):
+            # The comprehension holds `size` elements, each as large as what its element allocates
+            self.space = self.space + size * element_space
+        return cost + size
+
+    def _call(self, call: ast.Call, kinds: Dict[str, str], loops: List[_Loop]) -> Complexity:
+        func = call.func
+        name = _name_of(func)
+        if isinstance(func, ast.Name) and name in self.functions:
+            return self.function_cost(name)
+        if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self" \
+                and name in self.functions:
+            return self.function_cost(name)
+
+        if loops and name in _GROWING_METHODS:
+            self.space = self.space + LINEAR
+        if name in ("heappush", "heappop", "heapify"):
+            self._pattern("heap")
+        elif name in ("bisect", "bisect_left", "bisect_right"):
+            self._pattern("binary search")
+        elif name in ("sorted", "sort"):
+            self._pattern("sorting")
+
+        if isinstance(func, ast.Attribute) and not (
+                isinstance(func.value, ast.Name) and func.value.id in _LIBRARY_MODULES):
+            return self._method(call, name, kinds)
+        if name in _ITERABLE_CONSUMERS:
+            if not call.args or (name in ("min", "max") and len(call.args) > 1) or isinstance(
+                    call.args[0], (ast.List, ast.Tuple, ast.Set, ast.Constant)):
+                # max(a, b), list(), sorted([a, b]): no input-sized iterable
+                return CONSTANT
+            if name != "sorted":
+                self.space = self.space + (LINEAR if name not in ("sum", "min", "max", "any", "all") else CONSTANT)
+            else:
+                self.space = self.space + LINEAR
+        return CALL_COSTS.get(name, CONSTANT)
+
+    def _method(self, call: ast.Call, name: Optional[str], kinds: Dict[str, str]) -> Complexity:
+        kind = kinds.get(_name_of(call.func.value)) if isinstance(call.func.value, ast.Name) else None
+        if name == "pop":
+            # list.pop(0) shifts every element; pop() and dict.pop(key) do not
+            first = call.args[0] if call.args else None
+            if kind not in _HASHED and isinstance(first, ast.Constant) and first.value == 0:
+                return LINEAR
+            return CONSTANT
+        if name in ("remove", "discard") and kind in _HASHED:
+            return CONSTANT
+        if name in ("copy", "split", "join"):
+            self.space = self.space + LINEAR
+        return METHOD_COSTS.get(name, CONSTANT)
+
+    def _membership(self, container: ast.AST, kinds: Dict[str, str]) -> Complexity:
+        if isinstance(container, ast.Name):
+            kind = kinds.get(container.id)
+            if kind in _HASHED:
+                self._pattern("hash lookup")
+                return CONSTANT
+            return LINEAR if kind in _SEQUENCES else CONSTANT
+        if isinstance(container, (ast.Set, ast.Dict, ast.SetComp, ast.DictComp)):
+            return CONSTANT
+        if isinstance(container, (ast.List, ast.Tuple)):
+            # A literal written out in the code has constant size
+            return CONSTANT
+        if isinstance(container, ast.Call):
+            name = _name_of(container.func)
+            if name in ("keys", "set", "frozenset", "dict", "Counter"):
+                return CONSTANT
+            return LINEAR
+        if isinstance(container, ast.Subscript):
+            base = container.value
+            if isinstance(container.slice, ast.Slice):
+                return LINEAR
+            return LINEAR if isinstance(base, ast.Name) and kinds.get(base.id) in ("list", "param") else CONSTANT
+        return CONSTANT
+
+
+def infer_cost(tree: ast.AST) -> CostReport:
+    """Time and space of a parsed submission"""
+    return CostModel(tree).report()
@@ -0,0 +1,86 @@
+"""
+Empirical Complexity Estimator
+Fits measured (input size, time) samples against candidate growth curves
+and reports the best fitting Big-O class together with a confidence.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Candidate growth curves, labels parse with analyzers.cost_model.Complexity.parse
+CANDIDATES: List[Tuple[str, Callable[[float], float]]] = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: n),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n²)", lambda n: n ** 2),
+    ("O(n³)", lambda n: n ** 3),
+]
+
+# Below this many samples, or when the slowest run is faster than the timer
+# noise floor, any fit is guesswork
+MIN_SAMPLES = 4
+NOISE_FLOOR_SECONDS = 50e-6
+
+
+@dataclass
+class EmpiricalComplexity:
+    time_complexity: str
+    confidence: float
+    samples: List[Tuple[int, float]]
+    residuals: Dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "time": self.time_complexity,
+            "confidence": self.confidence,
+            "samples": [list(s) for s in self.samples],
+        }
+
+
+def _fit(xs: List[float], ys: List[float]) -> float:
+    """
+    Relative residual of the weighted least-squares fit y = a + b*x with b >= 0.
+    Weights of 1/y^2 make every size count equally instead of letting the
+    largest input dominate the fit.
+    """
+    ws = [1.0 / (y * y) if y > 0 else 0.0 for y in ys]
+    total_w = sum(ws)
+    if total_w == 0:
+        return 0.0
+    mean_x = sum(w * x for w, x in zip(ws, xs)) / total_w
+    mean_y = sum(w * y for w, y in zip(ws, ys)) / total_w
+    var_x = sum(w * (x - mean_x) ** 2 for w, x in zip(ws, xs))
+    slope = 0.0
+    if var_x > 0:
+        slope = max(0.0, sum(w * (x - mean_x) * (y - mean_y) for w, x, y in zip(ws, xs, ys)) / var_x)
+    intercept = mean_y - slope * mean_x
+    return sum(w * (y - (intercept + slope * x)) ** 2 for w, x, y in zip(ws, xs, ys))
+
+
+def fit_complexity(samples: List[Tuple[int, float]]) -> Optional[EmpiricalComplexity]:
+    """
+    Pick the candidate curve with the smallest residual.
+    Confidence is how much better the winner fits than the runner-up
+    (0 = indistinguishable, 1 = the runner-up does not fit at all).
+    """
+    if len(samples) < MIN_SAMPLES:
+        return None
+
+    sizes = [float(n) for n, _ in samples]
+    times = [t for _, t in samples]
+
+    residuals = {label: _fit([curve(n) for n in sizes], times) for label, curve in CANDIDATES}
+    ranked = sorted(residuals.items(), key=lambda item: item[1])
+    (best_label, best_rss), (_, second_rss) = ranked[0], ranked[1]
+
+    confidence = 0.0 if second_rss <= 0 else 1.0 - best_rss / second_rss
+    if max(times) < NOISE_FLOOR_SECONDS:
+        confidence = 0.0
+
+    return EmpiricalComplexity(
+        time_complexity=best_label,
+        confidence=round(max(0.0, min(1.0, confidence)), 3),
+        samples=samples,
+        residuals=residuals,
+    )
@@ -5,7 +5,8 @@ Enhanced with positive framing and edge case handling
 """
 from typing import Dict, List, Optional
 from dataclasses import dataclass
-from analyzers.complexity_analyzer import ComplexityAnalyzer
+from analyzers.complexity_analyzer import ComplexityAnalysis
+from analyzers.cost_model import Complexity, EXPONENTIAL
 
 @dataclass
 class Feedback:
@@ -146,8 +147,8 @@ class FeedbackGenerator:
                            benchmark: Dict) -> Optional[Dict]:
         """Check if solution matches any optimal approach"""
         for solution in benchmark['optimal_solutions']:
-            if (analysis.time_complexity == solution['time'] and 
-                analysis.space_complexity == solution['space']):
+            if (analysis.time == Complexity.parse(solution['time']) and 
+                analysis.space == Complexity.parse(solution['space'])):
                 return solution
         return None
     
@@ -159,31 +160,30 @@ class FeedbackGenerator:
                        key=lambda x: self._complexity_rank(x['time']))['time']
         
         # Check if there's significant room for improvement
-        if self._is_significantly_worse(analysis.time_complexity, best_time):
+        if self._is_significantly_worse(analysis.time, best_time):
             return 'improvable'
         
         # Check if close to optimal
-        if self._is_close_to_optimal(analysis.time_complexity, best_time):
+        if self._is_close_to_optimal(analysis.time, best_time):
             return 'good'
         
         # Default to good (positive framing)
         return 'good'
     
-    def _complexity_rank(self, complexity: str) -> int:
-        """Rank complexity for comparison"""
-        order = ['O(1)', 'O(log n)', 'O(n)', 'O(n log n)', 'O(n²)', 'O(n³)', 'O(2^n)']
-        try:
-            return order.index(complexity)
-        except ValueError:
-            return 999  # Unknown complexity
+    def _complexity_rank(self, complexity: str) -> Complexity:
+        """Rank a benchmark label for comparison"""
+        # Unknown labels rank last
+        return Complexity.parse(complexity) or EXPONENTIAL
     
-    def _is_significantly_worse(self, actual: str, optimal: str) -> bool:
+    def _is_significantly_worse(self, actual: Optional[Complexity], optimal: str) -> bool:
         """Check if actual complexity is significantly worse (2+ levels)"""
-        return self._complexity_rank(actual) - self._complexity_rank(optimal) >= 2
+        if actual is None:
+            return True
+        return actual.steps_above(self._complexity_rank(optimal)) >= 2
     
-    def _is_close_to_optimal(self, actual: str, optimal: str) -> bool:
+    def _is_close_to_optimal(self, actual: Optional[Complexity], optimal: str) -> bool:
         """Check if within 1 level of optimal"""
-        return abs(self._complexity_rank(actual) - self._complexity_rank(optimal)) <= 1
+        return actual is not None and abs(actual.steps_above(self._complexity_rank(optimal))) <= 1
     
     def _generate_positive_message(self, tier: str, analysis: ComplexityAnalysis, 
                                    benchmark: Dict, optimal_match: Optional[Dict]) -> str:
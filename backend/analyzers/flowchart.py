@@ -0,0 +1,358 @@
+"""
+Flowchart
+Mermaid flowcharts of Python statements, bounded for any input.
+Statements are walked with an explicit stack (no recursion per nested block),
+consecutive assignments share one box, and a diagram stops at a node and edge
+budget with a marker saying how much was left out. Top-level functions are
+rendered once per function hash and reused across sources; diagrams are
+produced as a stream of text chunks.
+"""
+import ast
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Iterator, List, Optional, Tuple
+
+from config.settings import settings
+
+# Stands in for the id prefix in cached fragments (source text cannot contain NUL)
+_PLACEHOLDER = "\x00"
+_ASSIGNMENTS = (ast.Assign, ast.AugAssign, ast.AnnAssign)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+# Most nodes and edges a single statement adds (an if/else: three nodes, three edges)
+_STATEMENT_NODES = 3
+_STATEMENT_EDGES = 3
+
+
+@dataclass
+class DiagramFragment:
+    """Mermaid lines for a run of statements, linked into a diagram through entry and exit"""
+    lines: List[str]
+    entry: Optional[str]  # first node, None when the statements draw nothing
+    exit: Optional[str]  # node the next fragment continues from
+    nodes: int = 0
+    edges: int = 0
+    truncated: bool = False  # the budget ran out before the last statement
+
+    def with_prefix(self, prefix: str) -> "DiagramFragment":
+        """A copy of a fragment built with the placeholder prefix, using prefix instead"""
+        return replace(
+            self,
+            lines=[line.replace(_PLACEHOLDER, prefix) for line in self.lines],
+            entry=self.entry and self.entry.replace(_PLACEHOLDER, prefix),
+            exit=self.exit and self.exit.replace(_PLACEHOLDER, prefix),
+        )
+
+
+def _source(node: ast.AST) -> str:
+    try:
+        return ast.unparse(node)
+    except RecursionError:
+        # ast.unparse recurses per nesting level; very deep expressions are only named
+        return f"({type(node).__name__.lower()} too deep to show)"
+
+
+def _label(text: str) -> str:
+    """One line of at most FLOWCHART_MAX_LABEL characters, safe inside a quoted Mermaid label"""
+    text = " ".join(text.split())
+    if len(text) > settings.FLOWCHART_MAX_LABEL:
+        text = text[:settings.FLOWCHART_MAX_LABEL - 1] + "…"
+    return text.replace('"', "#quot;")
+
+
+class _Frame:
+    """A statement list being drawn; kind says what happens when it is done"""
+
+    __slots__ = ("statements", "index", "last", "kind", "owner", "header")
+
+    def __init__(self, statements, last, kind, owner=None, header=None):
+        self.statements = statements
+        self.index = 0
+        self.last = last
+        self.kind = kind  # "root", "function" (its last node continues the parent), "loop" (links back), "branch"
+        self.owner = owner
+        self.header = header  # (label, edge label) of a node drawn when the frame starts: the else branch
+
+
+class _Builder:
+    def __init__(self, prefix: str, max_nodes: int, max_edges: int):
+        self.prefix = prefix
+        self.max_nodes = max_nodes
+        self.max_edges = max_edges
+        self.lines: List[str] = []
+        self.nodes = 0
+        self.edges = 0
+
+    def node(self, shape: str) -> str:
+        """Add a node drawn as shape (the Mermaid node text after its id, e.g. '["x = 1"]')"""
+        self.nodes += 1
+        node_id = f"{self.prefix}{self.nodes}"
+        self.lines.append(f"    {node_id}{shape}")
+        return node_id
+
+    def edge(self, source: Optional[str], target: str, label: str = ""):
+        if source is None:
+            return
+        self.edges += 1
+        arrow = f"-->|{label}|" if label else "-->"
+        self.lines.append(f"    {source} {arrow} {target}")
+
+    def room(self, nodes: int, edges: int) -> bool:
+        # One node and one edge stay reserved for the truncation marker
+        return self.nodes + nodes < self.max_nodes and self.edges + edges < self.max_edges
+
+    def build(self, statements: List[ast.stmt]) -> DiagramFragment:
+        stack = [_Frame(statements, None, "root")]
+        truncated_at = None
+        while stack:
+            frame = stack[-1]
+            if frame.header:
+                if not self.room(1, 1):
+                    truncated_at = frame
+                    break
+                label, edge_label = frame.header
+                frame.header = None
+                header_id = self.node(f'["{label}"]')
+                self.edge(frame.owner, header_id, edge_label)
+                frame.last = header_id
+
+            if frame.index >= len(frame.statements):
+                stack.pop()
+                if frame.kind == "loop":
+                    if not self.room(0, 1):
+                        truncated_at = stack[-1] if stack else frame
+                        break
+                    self.edge(frame.last, frame.owner)
+                elif frame.kind == "function":
+                    stack[-1].last = frame.last
+                elif frame.kind == "root":
+                    return self.fragment(frame.last)
+                continue
+
+            if not self.room(_STATEMENT_NODES, _STATEMENT_EDGES):
+                truncated_at = frame
+                break
+            self.statement(frame, stack)
+
+        # Out of budget: end the drawing with a marker
+        marker = self.node('[["… more statements not shown"]]')
+        self.edge(truncated_at.last or truncated_at.owner, marker)
+        return self.fragment(marker, truncated=True)
+
+    def fragment(self, exit_id: Optional[str], truncated: bool = False) -> DiagramFragment:
+        entry = f"{self.prefix}1" if self.nodes else None
+        return DiagramFragment(self.lines, entry, exit_id, self.nodes, self.edges, truncated)
+
+    def statement(self, frame: _Frame, stack: List[_Frame]):
+        node = frame.statements[frame.index]
+        frame.index += 1
+        parent_id = frame.last
+
+        if isinstance(node, _ASSIGNMENTS):
+            # A run of assignments is one box showing its first few lines
+            run = [node]
+            while frame.index < len(frame.statements) and isinstance(frame.statements[frame.index], _ASSIGNMENTS):
+                run.append(frame.statements[frame.index])
+                frame.index += 1
+            shown = [_label(_source(statement)) for statement in run[:settings.FLOWCHART_GROUP_LINES]]
+            if len(run) > len(shown):
+                shown.append(f"… {len(run) - len(shown)} more")
+            assign_id = self.node(f'["{"<br/>".join(shown)}"]')
+            self.edge(parent_id, assign_id)
+            frame.last = assign_id
+
+        elif isinstance(node, _FUNCTIONS):
+            func_id = self.node(f'["{_label(node.name)}()"]')
+            self.edge(parent_id, func_id)
+            frame.last = func_id
+            stack.append(_Frame(node.body, func_id, "function"))
+
+        elif isinstance(node, ast.If):
+            if_id = self.node(f'{{"{_label(_source(node.test))}?"}}')
+            self.edge(parent_id, if_id)
+            true_id = self.node('["True branch"]')
+            self.edge(if_id, true_id, "Yes")
+            frame.last = if_id
+            if node.orelse:
+                stack.append(_Frame(node.orelse, None, "branch", if_id, ("False branch", "No")))
+            stack.append(_Frame(node.body, true_id, "branch"))
+
+        elif isinstance(node, (ast.For, ast.AsyncFor)):
+            text = _label(f"for {_source(node.target)} in {_source(node.iter)}")
+            loop_id = self.node(f'[["{text}"]]')
+            self.edge(parent_id, loop_id)
+            frame.last = loop_id
+            stack.append(_Frame(node.body, loop_id, "loop", loop_id))
+
+        elif isinstance(node, ast.While):
+            while_id = self.node(f'{{"{_label(_source(node.test))}?"}}')
+            self.edge(parent_id, while_id)
+            body_id = self.node('["Loop body"]')
+            self.edge(while_id, body_id, "True")
+            frame.last = while_id
+            stack.append(_Frame(node.body, body_id, "loop", while_id))
+
+        elif isinstance(node, ast.Return):
+            value = _label(_source(node.value)) if node.value else "None"
+            ret_id = self.node(f'(["return {value}"])')
+            self.edge(parent_id, ret_id)
+            frame.last = ret_id
+
+        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Call):
+            # Expression statements that call something
+            call_id = self.node(f'["{_label(_source(node.value.func))}()"]')
+            self.edge(parent_id, call_id)
+            frame.last = call_id
+
+
+def function_hash(node: ast.AST) -> str:
+    """Hash of a subtree's structure and values, not its position (ast.dump recurses; this does not)"""
+    digest = hashlib.sha256()
+    for child in ast.walk(node):
+        parts = [type(child).__name__]
+        for name, value in ast.iter_fields(child):
+            if isinstance(value, list):
+                # Lengths make the breadth-first sequence unambiguous
+                parts.append(f"{name}[{len(value)}]")
+                parts.extend(repr(item) for item in value if not isinstance(item, ast.AST))
+            elif isinstance(value, ast.AST):
+                parts.append(name)
+            else:
+                parts.append(f"{name}={value!r}")
+        digest.update("\x1f".join(parts).encode("utf-8", "surrogatepass") + b"\x1e")
+    return digest.hexdigest()
+
+
+class FragmentCache:
+    """LRU of rendered functions by a hash of their AST, shared by every source that contains them"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = settings.FLOWCHART_CACHE_SIZE if max_entries is None else max_entries
+        self._entries: "OrderedDict[str, DiagramFragment]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def function(self, node: ast.AST, source_lines: Optional[List[str]] = None) -> Tuple[str, DiagramFragment]:
+        """
+        (hash, placeholder-prefixed fragment) of a function definition. With the source's lines
+        the hash is of the function's text; otherwise of its tree, which costs a walk of it
+        """
+        if source_lines is not None and getattr(node, "end_lineno", None):
+            text = "".join(source_lines[node.lineno - 1:node.end_lineno])
+            key = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+        else:
+            key = function_hash(node)
+        with self._lock:
+            fragment = self._entries.get(key)
+            if fragment is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return key, fragment
+            self.misses += 1
+        fragment = _Builder(_PLACEHOLDER, settings.FLOWCHART_MAX_NODES, settings.FLOWCHART_MAX_EDGES).build([node])
+        with self._lock:
+            self._entries[key] = fragment
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return key, fragment
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def render_statements(statements: List[ast.stmt], prefix: str = "N", source: Optional[str] = None) -> DiagramFragment:
+    """
+    Bounded fragment of a statement list parsed from source. Each top-level function comes
+    from the fragment cache; other statements are drawn in runs between them
+    """
+    source_lines = source.splitlines(keepends=True) if source is not None else None
+    parts: List[DiagramFragment] = []
+    run: List[ast.stmt] = []
+    used = set()
+
+    def flush():
+        if run:
+            builder = _Builder(f"{prefix}{len(parts)}_", settings.FLOWCHART_MAX_NODES, settings.FLOWCHART_MAX_EDGES)
+            parts.append(builder.build(list(run)))
+            run.clear()
+
+    for statement in statements:
+        if not isinstance(statement, _FUNCTIONS):
+            run.append(statement)
+            continue
+        flush()
+        key, fragment = flowchart_cache.function(statement, source_lines)
+        function_prefix = f"{prefix}F{key[:10]}_"
+        duplicate = 1
+        while function_prefix in used:
+            duplicate += 1
+            function_prefix = f"{prefix}F{key[:10]}_{duplicate}_"
+        used.add(function_prefix)
+        parts.append(fragment.with_prefix(function_prefix))
+    flush()
+    return join_fragments(parts, f"{prefix}more")
+
+
+def join_fragments(parts: List[DiagramFragment], marker_id: str) -> DiagramFragment:
+    """Fragments chained in order, cut short with a marker node once FLOWCHART_MAX_NODES is reached"""
+    lines: List[str] = []
+    entry = exit_id = None
+    nodes = edges = 0
+    for index, part in enumerate(parts):
+        if part.entry is None:
+            continue
+        # The first part always fits: it was built within the same budget
+        if nodes and (nodes + part.nodes >= settings.FLOWCHART_MAX_NODES
+                      or edges + part.edges + 1 >= settings.FLOWCHART_MAX_EDGES):
+            hidden = sum(p.nodes for p in parts[index:])
+            lines.append(f'    {marker_id}[["… {hidden} more steps not shown"]]')
+            if exit_id:
+                lines.append(f"    {exit_id} --> {marker_id}")
+            return DiagramFragment(lines, entry or marker_id, marker_id, nodes + 1, edges + 1, True)
+        lines.extend(part.lines)
+        if exit_id:
+            lines.append(f"    {exit_id} --> {part.entry}")
+            edges += 1
+        entry = entry or part.entry
+        exit_id = part.exit
+        nodes += part.nodes
+        edges += part.edges
+    return DiagramFragment(lines, entry, exit_id, nodes, edges, any(part.truncated for part in parts))
+
+
+def iter_diagram(fragments: List[DiagramFragment], chunk_lines: int = 256) -> Iterator[str]:
+    """A flowchart of fragments chained between Start and End nodes, as text chunks of chunk_lines lines"""
+    def diagram_lines():
+        yield "flowchart TD"
+        yield "    Start([Start])"
+        last_id = "Start"
+        for fragment in fragments:
+            yield from fragment.lines
+            if fragment.entry:
+                yield f"    {last_id} --> {fragment.entry}"
+                last_id = fragment.exit
+        yield "    Finish([End])"
+        yield f"    {last_id} --> Finish"
+
+    chunk: List[str] = []
+    for line in diagram_lines():
+        if len(chunk) == chunk_lines:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+        chunk.append(line)
+    yield "\n".join(chunk)
+
+
+def assemble_diagram(fragments: List[DiagramFragment]) -> str:
+    """The whole flowchart of iter_diagram as one string"""
+    return "".join(iter_diagram(fragments))
+
+
+# Global Flowchart Cache Instance
+flowchart_cache = FragmentCache()
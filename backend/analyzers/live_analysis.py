@@ -0,0 +1,229 @@
+"""
+Live Analysis
+Incremental analysis of an editor buffer for the VisualDebugger. The buffer is
+split into top-level blocks (a function, a class, a statement) by looking at
+indentation only; each block is parsed and analyzed on its own and kept by a
+hash of its text, so an edit re-analyzes just the blocks it touched and the
+client receives the blocks that appeared and the ids of those that went away.
+EditCoalescer turns a burst of keystrokes into one analysis of the newest buffer.
+"""
+import asyncio
+import ast
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from analyzers.code_analyzer import CodeAnalyzer
+from analyzers.flowchart import DiagramFragment, assemble_diagram
+
+# Lines at column 0 that continue the statement before them
+_CONTINUATIONS = ("else", "elif", "except", "finally", ")", "]", "}")
+# Parse errors meaning the block runs on past the next column-0 line (a bracket or string left open)
+_UNFINISHED = ("was never closed", "unterminated triple-quoted", "unexpected EOF")
+
+
+def split_blocks(code: str) -> List[Tuple[int, str]]:
+    """(first line, source) of each top-level block; decorators stay with what follows, comments with what precedes"""
+    blocks = []
+    current: List[str] = []
+    start = 1
+    decorated = False  # the current block is only decorators so far
+    for number, line in enumerate(code.split("\n"), 1):
+        top_level = bool(line) and not line[0].isspace() and not line.startswith("#")
+        if top_level and current and not decorated and not line.startswith(_CONTINUATIONS) \
+                and not current[-1].endswith("\\"):
+            blocks.append((start, "\n".join(current).rstrip()))
+            current = []
+        if not current:
+            start = number
+        current.append(line)
+        if top_level:
+            decorated = line.startswith("@")
+    if current and "\n".join(current).strip():
+        blocks.append((start, "\n".join(current).rstrip()))
+    return blocks
+
+
+def _parse(source: str, start: int) -> Tuple[Optional[ast.AST], Optional[SyntaxError]]:
+    try:
+        return ast.parse(source), None
+    except SyntaxError as e:
+        if e.lineno is not None:
+            e.lineno += start - 1
+        return None, e
+
+
+def _parse_blocks(blocks: List[Tuple[int, str]]) -> List[Tuple[int, str, Optional[ast.AST], Optional[SyntaxError]]]:
+    """
+    Parse each block. One that ends inside an open bracket or string is joined with the blocks
+    after it until it parses; if it never does, the block is reported alone with its own error.
+    """
+    parsed = []
+    index = 0
+    while index < len(blocks):
+        start, source = blocks[index]
+        tree, error = _parse(source, start)
+        taken = 1
+        if error is not None and any(reason in str(error.msg) for reason in _UNFINISHED):
+            joined = source
+            for extra, (_, following) in enumerate(blocks[index + 1:], 2):
+                joined = joined + "\n" + following
+                joined_tree, joined_error = _parse(joined, start)
+                if joined_tree is not None:
+                    source, tree, error, taken = joined, joined_tree, None, extra
+                    break
+                if not any(reason in str(joined_error.msg) for reason in _UNFINISHED):
+                    break
+        parsed.append((start, source, tree, error))
+        index += taken
+    return parsed
+
+
+@dataclass
+class BlockAnalysis:
+    block_id: str
+    fragment: DiagramFragment
+    variables: List[Dict[str, str]]
+    decisions: int  # cyclomatic complexity minus its base of 1
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "lines": self.fragment.lines,
+            "entry": self.fragment.entry,
+            "exit": self.fragment.exit,
+            "variables": self.variables,
+            "error": self.error,
+        }
+
+
+@dataclass
+class LiveUpdate:
+    """What changed between two analyzed versions of a buffer"""
+    order: List[str]  # block ids of the whole buffer, top to bottom
+    added: Dict[str, BlockAnalysis]
+    removed: List[str]
+    variables_added: List[Dict[str, str]]
+    variables_removed: List[Dict[str, str]]
+    complexity: int
+    errors: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "success": not self.errors,
+            "error": "; ".join(self.errors) or None,
+            "order": self.order,
+            "added": {block_id: block.to_dict() for block_id, block in self.added.items()},
+            "removed": self.removed,
+            "variables": {"added": self.variables_added, "removed": self.variables_removed},
+            "complexity": self.complexity,
+        }
+
+
+class LiveSession:
+    """The analyzed blocks of one editor buffer; update() it with each new version of the text"""
+
+    def __init__(self, analyzer: Optional[CodeAnalyzer] = None):
+        self.analyzer = analyzer or CodeAnalyzer()
+        self.blocks: Dict[str, BlockAnalysis] = {}
+        self.order: List[str] = []
+        self.analyzed = 0  # blocks analyzed over the session, for tests and logging
+
+    def update(self, code: str) -> LiveUpdate:
+        previous_variables = self._variable_keys()
+        blocks: Dict[str, BlockAnalysis] = {}
+        order, added = [], {}
+        for start, source, tree, error in _parse_blocks(split_blocks(code)):
+            block_id = self._block_id(source, blocks)
+            block = self.blocks.get(block_id)
+            if block is None:
+                block = added[block_id] = self._analyze(block_id, source, tree, error)
+            blocks[block_id] = block
+            order.append(block_id)
+        removed = [block_id for block_id in self.order if block_id not in blocks]
+        self.blocks, self.order = blocks, order
+
+        variables = self._variable_keys()
+        return LiveUpdate(
+            order=order,
+            added=added,
+            removed=removed,
+            variables_added=[dict(var) for key, var in variables.items() if key not in previous_variables],
+            variables_removed=[dict(var) for key, var in previous_variables.items() if key not in variables],
+            complexity=1 + sum(block.decisions for block in blocks.values()),
+            errors=[block.error for block in blocks.values() if block.error],
+        )
+
+    def diagram(self) -> str:
+        """The whole flowchart, as the client assembles it from the blocks it was sent"""
+        return assemble_diagram([self.blocks[block_id].fragment for block_id in self.order])
+
+    def variables(self) -> List[Dict[str, str]]:
+        return list(self._variable_keys().values())
+
+    def _variable_keys(self) -> Dict[Tuple[str, str], Dict[str, str]]:
+        variables = {}
+        for block_id in self.order:
+            for var in self.blocks[block_id].variables:
+                variables.setdefault((var["name"], var["scope"]), var)
+        return variables
+
+    @staticmethod
+    def _block_id(source: str, taken: Dict[str, Any]) -> str:
+        # Ids are Mermaid node prefixes: letters, digits and underscores only
+        block_id = "B" + hashlib.sha1(source.encode("utf-8", "surrogatepass")).hexdigest()[:12]
+        duplicate = 1
+        candidate = block_id
+        while candidate in taken:
+            duplicate += 1
+            candidate = f"{block_id}_{duplicate}"
+        return candidate
+
+    def _analyze(self, block_id: str, source: str, tree: Optional[ast.AST],
+                 error: Optional[SyntaxError]) -> BlockAnalysis:
+        self.analyzed += 1
+        if tree is None:
+            message = f"Syntax error: {error.msg} (line {error.lineno})"
+            node = f"{block_id}_error"
+            label = message.replace('"', "#quot;")
+            fragment = DiagramFragment([f'    {node}["⚠️ {label}"]'], node, node, nodes=1)
+            return BlockAnalysis(block_id, fragment, [], 0, message)
+        return BlockAnalysis(
+            block_id,
+            self.analyzer.diagram_fragment(tree.body, f"{block_id}_", source),
+            self.analyzer.tree_variables(tree),
+            self.analyzer.calculate_complexity(tree) - 1,
+        )
+
+
+class EditCoalescer:
+    """
+    Holds the newest buffer of a burst of edits. next() returns it once the editor has been
+    quiet for quiet_s, or max_delay_s after the burst began so continuous typing still updates.
+    """
+
+    def __init__(self, quiet_s: float, max_delay_s: float):
+        self.quiet_s = quiet_s
+        self.max_delay_s = max_delay_s
+        self._latest: Optional[Tuple[str, Any]] = None
+        self._edited = asyncio.Event()
+
+    def push(self, code: str, version: Any = None):
+        self._latest = (code, version)
+        self._edited.set()
+
+    async def next(self) -> Tuple[str, Any]:
+        await self._edited.wait()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_delay_s
+        while True:
+            self._edited.clear()
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(self._edited.wait(), min(self.quiet_s, remaining))
+            except asyncio.TimeoutError:
+                break
+        latest, self._latest = self._latest, None
+        return latest
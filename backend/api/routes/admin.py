@@ -7,6 +7,12 @@ from models.problem import Problem
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
+import threading
+from config.database import SessionLocal
+from judge.async_judge import get_async_judge
+from judge.rejudge import RejudgeJob, checkpoint_path_for
+from judge.result_cache import submission_cache
+from utils.distribution_index import submission_distribution
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -58,3 +64,52 @@ def flag_user(user_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found")
     
     return {"message": f"User {user_id} flagged (Simulation)"}
+
+# Re-judge runs started from the admin panel, by problem id
+_rejudge_runs = {}
+_rejudge_lock = threading.Lock()
+
+
+def _run_rejudge(problem_id: str, restart: bool):
+    def on_progress(progress):
+        _rejudge_runs[problem_id] = progress.to_dict()
+
+    try:
+        job = RejudgeJob(problem_id, checkpoint_path=checkpoint_path_for(problem_id))
+        progress = job.run(SessionLocal, on_progress=on_progress, restart=restart)
+        _rejudge_runs[problem_id] = progress.to_dict()
+        # Verdicts changed under the cached rankings and results
+        db = SessionLocal()
+        try:
+            submission_distribution.rebuild(db, problem_id)
+        finally:
+            db.close()
+        submission_cache.invalidate_problem(problem_id)
+    except Exception as e:
+        _rejudge_runs[problem_id] = {"problem_id": problem_id, "done": True, "error": str(e)}
+
+
+@router.post("/rejudge/{problem_id}")
+def start_rejudge(problem_id: str, restart: bool = False):
+    """Re-judge all submissions of a problem in the background; resumes an interrupted run"""
+    with _rejudge_lock:
+        current = _rejudge_runs.get(problem_id)
+        if current is not None and not current.get("done"):
+            raise HTTPException(status_code=409, detail="Re-judge already running for this problem")
+        _rejudge_runs[problem_id] = {"problem_id": problem_id, "done": False, "processed": 0}
+        threading.Thread(target=_run_rejudge, args=(problem_id, restart), daemon=True).start()
+    return _rejudge_runs[problem_id]
+
+
+@router.get("/rejudge/{problem_id}")
+def rejudge_status(problem_id: str):
+    """Progress and throughput of the latest re-judge run of a problem"""
+    if problem_id not in _rejudge_runs:
+        raise HTTPException(status_code=404, detail="No re-judge run for this problem")
+    return _rejudge_runs[problem_id]
+
+
+@router.get("/judge-metrics")
+def judge_metrics():
+    """Judge queue depth, in-flight jobs and wait times per priority class"""
+    return get_async_judge().metrics()
@@ -4,14 +4,12 @@ import json
 import uuid
 import asyncio
 import random
-from api.routes.run_code import execute_python_code
 
 # Constant for open slot in private matches
 OPEN_SLOT = "__OPEN__"
 
-from api.routes.run_code import execute_python_code
-from api.routes.run_code import execute_python_code
-from test_cases.hidden_tests import get_hidden_tests
+from judge.async_judge import get_async_judge, JudgeBusy
+from test_cases.registry import test_suites
 from config.database import SessionLocal, get_db
 from sqlalchemy.orm import Session
 from models.user import User
@@ -278,18 +276,26 @@ class ConnectionManager:
              return
 
         visible_tests = problem_def['visibleTestCases']
-        hidden_tests = get_hidden_tests(problem_id)
-        
-        all_test_cases = visible_tests + hidden_tests
+        all_test_cases = test_suites.with_hidden(problem_id, visible_tests)
         
         # Execute Code
+        try:
+            # A live match is decided by this verdict, so it jumps ahead of practice runs
+            outcomes = await get_async_judge().run_tests(code, all_test_cases, priority="battle", user=user_id)
+        except JudgeBusy:
+            if user_id in self.active_connections:
+                await self.active_connections[user_id].send_json({
+                    "type": "JUDGE_BUSY",
+                    "message": "Judge is busy, please resubmit in a few seconds."
+                })
+            return
+
         passed_count = 0
         total_tests = len(all_test_cases)
         results = []
 
-        for tc in all_test_cases:
-            # execute_python_code returns: (passed: bool, actual_output: Any, error: str)
-            passed, actual, error = execute_python_code(code, tc)
+        # run_tests returns one (passed: bool, actual_output: Any, error: str) per case
+        for passed, actual, error in outcomes:
             results.append({"passed": passed, "error": error})
             if passed:
                 passed_count += 1
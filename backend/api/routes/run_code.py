@@ -1,20 +1,28 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+import json
 import sys
-import io
 import traceback
-from contextlib import redirect_stdout, redirect_stderr
-from test_cases.hidden_tests import get_hidden_tests
+from test_cases.registry import test_suites
+from judge.async_judge import get_async_judge, judge_or_429, judge_user, JudgeBusy
 # Import analyzers
-from analyzers.complexity_analyzer import ComplexityAnalyzer
+from analyzers.complexity_analyzer import ComplexityAnalyzer, score_time_complexity
+from analyzers.cost_model import Complexity
 from analyzers.feedback_generator import FeedbackGenerator
+from analyzers.empirical_complexity import fit_complexity
 # DB Imports
 from fastapi import Depends
 from sqlalchemy.orm import Session
-from config.database import get_db
+from config.database import SessionLocal, get_db
 from models.user import User
 from models.submission import Submission
+from config.settings import settings
+from utils.distribution_index import submission_distribution
+from judge.result_cache import submission_cache, is_cacheable
 
 router = APIRouter()
 
@@ -34,6 +42,8 @@ class SubmitCodeRequest(BaseModel):
     problemId: str
     testCases: Optional[List[TestCase]] = []
     userId: Optional[str] = None
+    # False: stop at the first failing hidden case (visible cases are always reported)
+    fullReport: bool = False
 
 class TestResult(BaseModel):
     caseNumber: int
@@ -57,93 +67,27 @@ class SubmitCodeResponse(BaseModel):
     results: List[TestResult]
     runtime: str
     memory: str
+    runtimeMs: Optional[float] = None
+    memoryMb: Optional[float] = None
+    operations: Optional[int] = None  # deterministic cost when metering is enabled
+    costMs: Optional[float] = None  # operations at the calibrated ms rate, used for ranking
     # Performance Stats
     runtimePercentile: Optional[float] = None
     memoryPercentile: Optional[float] = None
+    percentileMetric: Optional[str] = None  # 'runtime_ms' (CPU time) or 'cost_ms' (metered): what runtimePercentile ranks
     # Analysis Fields
     points: int = 50
     timeComplexity: str = "N/A"
     spaceComplexity: str = "N/A"
+    complexitySource: str = "static"  # 'static' (AST) or 'empirical' (timed on generated inputs)
+    complexityConfidence: Optional[float] = None
     feedback_tier: str = "improvable"
     is_optimal: bool = False
 
 
 
-def execute_python_code(code: str, test_case: Dict) -> tuple:
-    """
-    Execute Python code with a single test case
-    Returns: (passed, actual_output, error)
-    """
-    try:
-        # Create a namespace for execution
-        namespace = {}
-        
-        # Capture stdout
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
-        
-        try:
-            # Execute the user's code to define the function/class
-            exec(code, namespace)
-            
-            # Check for Solution class (LeetCode style)
-            if 'Solution' in namespace and isinstance(namespace['Solution'], type):
-                solution_cls = namespace['Solution']
-                solution_instance = solution_cls()
-                
-                # Find the method to call (first non-underscore method)
-                method_name = None
-                for name in dir(solution_instance):
-                    if not name.startswith('__'):
-                        attr = getattr(solution_instance, name)
-                        if callable(attr):
-                            method_name = name
-                            break
-                            
-                if not method_name:
-                    return False, None, "No method found in Solution class"
-                    
-                user_function = getattr(solution_instance, method_name)
-                
-            else:
-                # Fallback: Find the first standalone function
-                func_name = None
-                for name, obj in namespace.items():
-                    if callable(obj) and not name.startswith('__'):
-                        func_name = name
-                        break
-                
-                if not func_name:
-                    return False, None, "No function found in code"
-                
-                user_function = namespace[func_name]
-            
-            # Call the function with test inputs
-            input_data = test_case['input']
-            expected_output = test_case['output']
-            
-            # Call function with unpacked arguments
-            if isinstance(input_data, dict):
-                actual_output = user_function(**input_data)
-            else:
-                actual_output = user_function(input_data)
-            
-            # Compare output
-            passed = actual_output == expected_output
-            
-            return passed, actual_output, None
-            
-        finally:
-            # Restore stdout
-            output = sys.stdout.getvalue()
-            sys.stdout = old_stdout
-            
-    except Exception as e:
-        error_msg = f"{type(e).__name__}: {str(e)}"
-        return False, None, error_msg
-
 @router.post("/api/run-code", response_model=RunCodeResponse)
-async def run_code(request: RunCodeRequest):
+async def run_code(request: RunCodeRequest, http_request: Request):
     """
     Execute code against visible test cases
     """
@@ -154,15 +98,14 @@ async def run_code(request: RunCodeRequest):
         if request.language != 'python':
             raise HTTPException(status_code=400, detail="Only Python is supported currently")
         
-        results = []
+        test_dicts = [
+            {'input': test_case.input, 'output': test_case.output}
+            for test_case in request.testCases
+        ]
+        outcomes = await judge_or_429(request.code, test_dicts, user=judge_user(None, http_request))
         
-        for i, test_case in enumerate(request.testCases):
-            test_dict = {
-                'input': test_case.input,
-                'output': test_case.output
-            }
-            passed, actual, error = execute_python_code(request.code, test_dict)
-            
+        results = []
+        for i, (test_case, (passed, actual, error)) in enumerate(zip(request.testCases, outcomes)):
             result = TestResult(
                 caseNumber=i + 1,
                 passed=passed,
@@ -186,151 +129,302 @@ async def run_code(request: RunCodeRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/api/submit-code", response_model=SubmitCodeResponse)
-async def submit_code(request: SubmitCodeRequest, db: Session = Depends(get_db)):
-    sys.stderr.write(f"[RunCode] Submit HIT! Algo: {request.language}\n")
-    sys.stderr.write(f"Code Snippet: {request.code[:100]!r}\n")
-    sys.stderr.flush()
+def _validate_submission(request: SubmitCodeRequest):
+    if not request.code:
+        raise HTTPException(status_code=400, detail="No code provided")
+    
+    if request.language != 'python':
+        raise HTTPException(status_code=400, detail="Only Python is supported currently")
+
+
+def _submission_suite(request: SubmitCodeRequest):
+    """All cases a submission is judged on (visible first, then hidden) and the visible count"""
+    visible_test_cases = [{"input": tc.input, "output": tc.output} for tc in request.testCases]
+    # Hidden cases come pre-validated, pre-canonicalized and pre-serialized from the suite registry
+    return test_suites.with_hidden(request.problemId, visible_test_cases), len(visible_test_cases)
+
+
+def _cached_verdict(request: SubmitCodeRequest, all_test_cases: List[Dict]):
+    """Same code modulo whitespace/comments against the same suite: reuse the stored verdict"""
+    mode = ":full" if request.fullReport else ":fast"
+    cache_key = submission_cache.key(request.problemId, all_test_cases, request.code, mode)
+    return cache_key, submission_cache.get(cache_key)
+
+
+def _judge_options(request: SubmitCodeRequest, visible_count: int) -> Dict[str, Any]:
     """
-    Execute code against all test cases (visible + hidden)
+    Hidden cases are the scored suite: measure their runtime and memory.
+    Unless a full report is requested, judging stops at the first failing hidden case.
     """
+    return {
+        "measure_from": visible_count,
+        "fail_fast_from": None if request.fullReport else visible_count,
+    }
+
+
+# Generated cases larger than this report a summary of their values instead of the values
+REPORTED_GENERATED_SIZE = 100
+
+
+def _summarized(value: Any) -> Any:
+    if isinstance(value, (list, tuple, dict, set)) and len(value) > 10:
+        return f"<{type(value).__name__} of {len(value)} items>"
+    if isinstance(value, str) and len(value) > 100:
+        return f"<str of length {len(value)}>"
+    return value
+
+
+def _case_result(index: int, test_case: Dict, outcome: tuple, visible_count: int) -> TestResult:
+    passed, actual, error = outcome
+    data, expected = test_case['input'], test_case['output']
+    if test_case.get('generated_size', 0) > REPORTED_GENERATED_SIZE:
+        data = {name: _summarized(arg) for name, arg in data.items()}
+        expected, actual = _summarized(expected), _summarized(actual)
+    return TestResult(
+        caseNumber=index + 1,
+        passed=passed,
+        input=data,
+        expected=expected,
+        actual=actual,
+        error=error,
+        hidden=index >= visible_count
+    )
+
+
+async def _finish_submission(request: SubmitCodeRequest, db: Session, all_test_cases: List[Dict],
+                             visible_count: int, report, cache_key, cached, analysis,
+                             user: Optional[str]) -> SubmitCodeResponse:
+    """
+    Verdict, complexity analysis, percentiles and persistence of a judged submission.
+    user is who judge jobs are queued for (see judge_user).
+    """
+    results = [
+        _case_result(i, test_case, outcome, visible_count)
+        for i, (test_case, outcome) in enumerate(zip(all_test_cases, report.results))
+    ]
+    
+    # A fail-fast run may have stopped early, so the suite size is the denominator
+    all_passed = len(results) == len(all_test_cases) and all(r.passed for r in results)
+    passed_count = sum(1 for r in results if r.passed)
+    
+    # Accepted code is also timed on generated inputs of growing size (sandboxed, time-boxed)
+    empirical = None
+    if all_passed and not cached:
+        try:
+            samples = await get_async_judge().profile(request.code, request.problemId, user=user)
+            empirical = fit_complexity(samples)
+        except JudgeBusy:
+            pass
+    
+    # Run Code Analysis
+    analyzer = ComplexityAnalyzer()
+    feedback_gen = FeedbackGenerator()
+    
+    # Analysis Variables
+    points = 50
+    time_comp = "N/A"
+    space_comp = "N/A"
+    tier = "improvable"
+    is_optimal = False
+    complexity_source = "static"
+    complexity_confidence = None
+    
     try:
-        if not request.code:
-            raise HTTPException(status_code=400, detail="No code provided")
+        if analysis is None:
+            analysis = analyzer.analyze(request.code)
+            if empirical:
+                analysis.empirical = empirical.to_dict()
         
-        if request.language != 'python':
-            raise HTTPException(status_code=400, detail="Only Python is supported currently")
+        time = analysis.time
+        time_comp = analysis.time_complexity
+        space_comp = analysis.space_complexity
         
-        # Get hidden test cases from centralized module
-        hidden_test_cases_raw = get_hidden_tests(request.problemId)
-        hidden_test_cases = [
-            {"input": tc["input"], "output": tc["output"]}
-            for tc in hidden_test_cases_raw
-        ]
+        # Measured growth beats the cost model when the fit is convincing
+        measured = analysis.empirical
+        if measured:
+            complexity_confidence = measured["confidence"]
+            if complexity_confidence >= settings.EMPIRICAL_MIN_CONFIDENCE:
+                time = Complexity.parse(measured["time"])
+                time_comp = measured["time"]
+                complexity_source = "empirical"
         
-        # Combine all test cases
-        visible_test_cases = [{"input": tc.input, "output": tc.output} for tc in request.testCases]
-        all_test_cases = visible_test_cases + hidden_test_cases
+        # Determine tier based on complexity
+        sys.stderr.write(f"[RunCode] Complexity Analysis: Time={time_comp} Space={space_comp}\n")
+        sys.stderr.flush()
+
+        tier, points, is_optimal = score_time_complexity(time)
         
-        results = []
-        for i, test_case in enumerate(all_test_cases):
-            passed, actual, error = execute_python_code(request.code, test_case)
-            
-            result = TestResult(
-                caseNumber=i + 1,
-                passed=passed,
-                input=test_case['input'],
-                expected=test_case['output'],
-                actual=actual,
-                error=error,
-                hidden=i >= len(visible_test_cases)
+    except Exception as e:
+        print(f"Analysis failed: {e}")
+    
+    if not cached and is_cacheable(report.results):
+        submission_cache.set(cache_key, (report, analysis))
+    
+    # Measured Performance Metrics (hidden suite, best of JUDGE_MEASURE_REPEAT runs per case)
+    runtime_ms = round(report.runtime_ms, 2)
+    memory_mb = round(report.memory_mb, 1)
+    # With metering on, ranking uses the noise-free cost instead of CPU time (its own distribution, never mixed)
+    cost_ms = round(report.cost_ms, 2) if report.cost_ms is not None else None
+    percentile_metric = "cost_ms" if cost_ms is not None else "runtime_ms"
+    
+    runtime_beats = 0.0
+    memory_beats = 0.0
+    
+    if all_passed and report.measured:
+        # Rank against every accepted run of this problem before recording this one.
+        # A cold partition is loaded from history, so this stays off the event loop.
+        try:
+            runtime_beats, memory_beats = await run_in_threadpool(
+                submission_distribution.percentiles, db, request.problemId, request.language,
+                cost_ms if cost_ms is not None else runtime_ms, memory_mb, metric=percentile_metric
             )
-            results.append(result)
-        
-        all_passed = all(r.passed for r in results)
-        passed_count = sum(1 for r in results if r.passed)
-        
-        # Run Code Analysis
-        analyzer = ComplexityAnalyzer()
-        feedback_gen = FeedbackGenerator()
-        
-        # Analysis Variables
-        points = 50
-        time_comp = "N/A"
-        space_comp = "N/A"
-        tier = "improvable"
-        is_optimal = False
-        
+        except Exception as e:
+            print(f"Percentile lookup failed: {e}", flush=True)
+
+
+    
+    # Save submission to database
+    if request.userId:
         try:
-            # My new analyzer only takes code arg and returns a dict
-            analysis = analyzer.analyze(request.code)
-            
-            # Simple fallback for FeedbackGenerator since I haven't inspected it
-            # Assuming it might need an object, I'll mock the expected object structure or just skip for now
-            # But wait, looking at the code, it uses analysis for feedback.
-            # Let's just use the raw values for the response
-            
-            time_comp = analysis.get("time", "N/A")
-            space_comp = analysis.get("space", "N/A")
-            
-            # Determine tier based on complexity
-            # Determine tier based on complexity
-            sys.stderr.write(f"[RunCode] Complexity Analysis: Time={time_comp} Space={space_comp}\n")
-            sys.stderr.flush()
-
-            # Check for O(n^2) or O(n^3) - handling both ASCII and Unicode
-            if any(x in time_comp for x in ["n^2", "n²", "n^3", "n³"]):
-                tier = "improvable"
-                points = 60
-                is_optimal = False
-            elif "log" in time_comp or time_comp == "O(n)":
-                tier = "optimal" # Consider O(n) optimal for most easy/medium problems
-                points = 100
-                is_optimal = True
-            elif time_comp == "O(1)":
-                tier = "optimal"
-                points = 100
-                is_optimal = True
-            else:
-                # Default for O(n!) or unknown
-                 tier = "improvable"
-            
+            status = "accepted" if all_passed else "failed"
+            new_submission = Submission(
+                user_id=request.userId,
+                problem_id=request.problemId,
+                code=request.code,
+                language=request.language,
+                status=status,
+                points=points if all_passed else 0,
+                runtime_ms=runtime_ms if report.measured else None,
+                cost_ms=cost_ms if report.measured else None,
+                memory_mb=memory_mb if report.measured else None
+            )
+            db.add(new_submission)
+            db.add(new_submission)
+            db.commit()
+            if all_passed and report.measured:
+                await run_in_threadpool(submission_distribution.record, db, request.problemId, request.language,
+                                        runtime_ms, memory_mb, cost_ms=cost_ms)
+            # Debugging Log that we know works:
+            print(f"Saved sub: User={request.userId} Prob={request.problemId} Stat={status} Time={time_comp} Tier={tier} Optimal={is_optimal}", flush=True)
         except Exception as e:
-            print(f"Analysis failed: {e}")
-        
-        # Mock Performance Metrics
-        import random
-        runtime_ms = random.randint(30, 100)
-        memory_mb = round(random.uniform(10.0, 20.0), 1)
-        
-        runtime_beats = 0.0
-        memory_beats = 0.0
-        
-        if all_passed:
-            runtime_beats = round(random.uniform(40.0, 99.0), 2)
-            memory_beats = round(random.uniform(40.0, 99.0), 2)
+            print(f"Error saving submission: {e}", flush=True)
+            traceback.print_exc()
+
+    return SubmitCodeResponse(
+        success=True,
+        allPassed=all_passed,
+        passedCount=passed_count,
+        totalCount=len(all_test_cases),
+        results=results,
+        runtime=f"{runtime_ms}ms" if report.measured else "N/A",
+        memory=f"{memory_mb}MB" if report.measured else "N/A",
+        runtimeMs=runtime_ms if report.measured else None,
+        memoryMb=memory_mb if report.measured else None,
+        operations=report.operations,
+        costMs=cost_ms,
+        runtimePercentile=runtime_beats,
+        memoryPercentile=memory_beats,
+        percentileMetric=percentile_metric if report.measured else None,
+        points=points,
+        timeComplexity=time_comp,
+        spaceComplexity=space_comp,
+        complexitySource=complexity_source,
+        complexityConfidence=complexity_confidence,
+        feedback_tier=tier,
+        is_optimal=is_optimal
+    )
 
 
+@router.post("/api/submit-code", response_model=SubmitCodeResponse)
+async def submit_code(request: SubmitCodeRequest, http_request: Request, db: Session = Depends(get_db)):
+    sys.stderr.write(f"[RunCode] Submit HIT! Algo: {request.language}\n")
+    sys.stderr.write(f"Code Snippet: {request.code[:100]!r}\n")
+    sys.stderr.flush()
+    """
+    Execute code against all test cases (visible + hidden)
+    """
+    try:
+        _validate_submission(request)
+        all_test_cases, visible_count = _submission_suite(request)
         
-        # Save submission to database
-        if request.userId:
-            try:
-                status = "accepted" if all_passed else "failed"
-                new_submission = Submission(
-                    user_id=request.userId,
-                    problem_id=request.problemId,
-                    code=request.code,
-                    language=request.language,
-                    status=status,
-                    points=points if all_passed else 0
-                )
-                db.add(new_submission)
-                db.add(new_submission)
-                db.commit()
-                # Debugging Log that we know works:
-                print(f"Saved sub: User={request.userId} Prob={request.problemId} Stat={status} Time={time_comp} Tier={tier} Optimal={is_optimal}", flush=True)
-            except Exception as e:
-                print(f"Error saving submission: {e}", flush=True)
-                traceback.print_exc()
-
-        return SubmitCodeResponse(
-            success=True,
-            allPassed=all_passed,
-            passedCount=passed_count,
-            totalCount=len(results),
-            results=results,
-            runtime=f"{runtime_ms}ms",
-            memory=f"{memory_mb}MB",
-            runtimePercentile=runtime_beats,
-            memoryPercentile=memory_beats,
-            points=points,
-            timeComplexity=time_comp,
-            spaceComplexity=space_comp,
-            feedback_tier=tier,
-            is_optimal=is_optimal
-        )
+        user = judge_user(request.userId, http_request)
+        cache_key, cached = _cached_verdict(request, all_test_cases)
+        if cached:
+            report, analysis = cached
+        else:
+            options = _judge_options(request, visible_count)
+            report = await judge_or_429(request.code, all_test_cases, user=user, **options)
+            analysis = None
+        
+        return await _finish_submission(request, db, all_test_cases, visible_count,
+                                        report, cache_key, cached, analysis, user)
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+async def _stream_submission(request: SubmitCodeRequest, http_request: Request,
+                             all_test_cases: List[Dict], visible_count: int):
+    try:
+        user = judge_user(request.userId, http_request)
+        cache_key, cached = _cached_verdict(request, all_test_cases)
+        if cached:
+            report, analysis = cached
+            for i, outcome in enumerate(report.results):
+                yield _sse("case", _case_result(i, all_test_cases[i], outcome, visible_count))
+        else:
+            report, analysis = None, None
+            stream = get_async_judge().judge_stream(
+                request.code, all_test_cases,
+                warmup=settings.JUDGE_MEASURE_WARMUP, repeat=settings.JUDGE_MEASURE_REPEAT,
+                meter=settings.JUDGE_METERING, user=user,
+                **_judge_options(request, visible_count)
+            )
+            try:
+                async for event in stream:
+                    if event[0] == "report":
+                        report = event[1]
+                        continue
+                    _, i, outcome = event
+                    yield _sse("case", _case_result(i, all_test_cases[i], outcome, visible_count))
+                    if await http_request.is_disconnected():
+                        # Closing the stream cancels the cases not run yet
+                        return
+            finally:
+                await stream.aclose()
+        
+        yield _sse("analyzing", {"passedCount": sum(1 for passed, _, _ in report.results if passed)})
+        db = SessionLocal()
+        try:
+            response = await _finish_submission(request, db, all_test_cases, visible_count,
+                                                report, cache_key, cached, analysis, user)
+        finally:
+            db.close()
+        yield _sse("result", response)
+    except JudgeBusy:
+        yield _sse("error", {"status": 429, "detail": "Judge is busy: too many submissions queued. Please retry in a few seconds."})
+    except Exception as e:
+        yield _sse("error", {"status": 500, "detail": str(e)})
+
+
+@router.post("/api/submit-code/stream")
+async def submit_code_stream(request: SubmitCodeRequest, http_request: Request):
+    """
+    Streaming submit-code (Server-Sent Events): a `case` event per test as soon
+    as it has run, an `analyzing` event once judging is done, then a `result`
+    event carrying the same body as /api/submit-code. Failures arrive as an
+    `error` event. Disconnecting cancels the remaining cases.
+    """
+    _validate_submission(request)
+    all_test_cases, visible_count = _submission_suite(request)
+    return StreamingResponse(
+        _stream_submission(request, http_request, all_test_cases, visible_count),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,14 +1,15 @@
 """
 API routes for code submissions
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from analyzers.complexity_analyzer import ComplexityAnalyzer
+from analyzers.cost_model import EXPONENTIAL, QUADRATIC
 from analyzers.feedback_generator import FeedbackGenerator
-from analyzers.code_executor import CodeExecutor
-from test_cases.problems import get_test_cases
+from judge.async_judge import judge_or_429, judge_user
+from test_cases.registry import test_suites
 import traceback
 
 router = APIRouter()
@@ -51,7 +52,7 @@ class AnalysisResult(BaseModel):
     test_results: List[TestCaseResult] = []
 
 @router.post("/submit", response_model=dict)
-async def submit_code(submission: CodeSubmission):
+async def submit_code(submission: CodeSubmission, http_request: Request):
     """
     Submit code for analysis (Synchronous for immediate feedback)
     """
@@ -65,7 +66,8 @@ async def submit_code(submission: CodeSubmission):
             submission.code,
             submission.language,
             submission.problem_id,
-            submission.user_tier or 'free'
+            submission.user_tier or 'free',
+            judge_user(submission.user_id, http_request)
         )
         
         # Store result
@@ -77,6 +79,8 @@ async def submit_code(submission: CodeSubmission):
             "message": "Analysis complete."
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Submission error: {e}")
         traceback.print_exc()
@@ -92,36 +96,39 @@ async def get_analysis(submission_id: str):
     
     return submission_results[submission_id]
 
-async def analyze_submission(submission_id: str, code: str, language: str, problem_id: str, user_tier: str = 'free') -> AnalysisResult:
+def _syntax_error(code: str, language: str) -> Optional[str]:
+    """Why the code cannot be judged at all, checked by compiling it (nothing is executed)"""
+    if language != "python":
+        return f"Language '{language}' not supported yet. Only Python is supported."
+    try:
+        compile(code, "<solution>", "exec")
+    except SyntaxError as e:
+        return f"Syntax Error on line {e.lineno}: {e.msg}"
+    return None
+
+async def analyze_submission(submission_id: str, code: str, language: str, problem_id: str, user_tier: str = 'free',
+                             user: Optional[str] = None) -> AnalysisResult:
     """
     Analyze code submission and return result
     """
     try:
         # Get test cases for the problem
-        test_data = get_test_cases(problem_id)
+        suite = test_suites.get(problem_id)
         
-        if not test_data:
+        if not suite or not suite.function_name or not suite.visible_cases:
             # No test cases defined, skip execution
             return await _analyze_without_tests(submission_id, code, language, problem_id, user_tier)
         
-        # Execute code against test cases
-        executor = CodeExecutor()
-        execution_result = executor.execute_tests(
-            code=code,
-            function_name=test_data["function_name"],
-            test_cases=test_data["test_cases"],
-            language=language
-        )
-        
-        # Check for syntax errors
-        if execution_result.syntax_error:
+        # Syntax errors are reported without a trip to the judge
+        syntax_error = _syntax_error(code, language)
+        if syntax_error:
             return AnalysisResult(
                 submission_id=submission_id,
                 time_complexity="N/A",
                 space_complexity="N/A",
                 is_optimal=False,
                 feedback_tier="improvable",
-                feedback_message=f"❌ {execution_result.syntax_error}",
+                feedback_message=f"❌ {syntax_error}",
                 feedback_title="Syntax Error",
                 feedback_icon="❌",
                 hints=["Check your syntax and try again.", "Make sure all parentheses and brackets are properly closed."],
@@ -129,29 +136,34 @@ async def analyze_submission(submission_id: str, code: str, language: str, probl
                 execution_time_ms=0.0,
                 show_celebration=False,
                 tests_passed=0,
-                tests_total=execution_result.tests_total,
+                tests_total=len(suite.visible_cases),
                 test_results=[]
             )
         
+        # User code only ever runs in the judge workers, under their time and memory limits
+        report = await judge_or_429(code, list(suite.visible_cases), measure_from=0, user=user)
+        
         # Convert test results to API format
         test_results_api = [
             TestCaseResult(
-                passed=tr.passed,
-                description=tr.description,
-                input=tr.input,
-                expected=tr.expected,
-                actual=tr.actual,
-                error=tr.error
+                passed=passed,
+                description=case.get("description") or f"Test {i + 1}",
+                input=case["input"],
+                expected=case["expected"],
+                actual=actual,
+                error=error or (None if passed else "Output doesn't match expected result")
             )
-            for tr in execution_result.test_results
+            for i, (case, (passed, actual, error)) in enumerate(zip(suite.visible_cases, report.results))
         ]
+        tests_passed = sum(1 for tr in test_results_api if tr.passed)
+        tests_total = len(test_results_api)
         
         # If tests failed, return failure feedback
-        if not execution_result.all_passed:
-            failed_tests = [tr for tr in execution_result.test_results if not tr.passed]
+        if tests_passed < tests_total:
+            failed_tests = [tr for tr in test_results_api if not tr.passed]
             first_failure = failed_tests[0] if failed_tests else None
             
-            error_msg = f"❌ {execution_result.tests_passed}/{execution_result.tests_total} test cases passed."
+            error_msg = f"❌ {tests_passed}/{tests_total} test cases passed."
             if first_failure and first_failure.error:
                 error_msg += f"\n\nFirst failure: {first_failure.description}\n{first_failure.error}"
             
@@ -168,8 +180,8 @@ async def analyze_submission(submission_id: str, code: str, language: str, probl
                 patterns_detected=[],
                 execution_time_ms=0.0,
                 show_celebration=False,
-                tests_passed=execution_result.tests_passed,
-                tests_total=execution_result.tests_total,
+                tests_passed=tests_passed,
+                tests_total=tests_total,
                 test_results=test_results_api
             )
         
@@ -181,12 +193,9 @@ async def analyze_submission(submission_id: str, code: str, language: str, probl
         print(f"[DEBUG] Submission {submission_id} Problem {problem_id}")
         print(f"[DEBUG] Analysis: Time={analysis.time_complexity} Space={analysis.space_complexity}")
         
-        feedback = feedback_gen.generate_feedback(analysis, problem_id, user_tier)
-        analysis = analyzer.analyze(code, language)
         feedback = feedback_gen.generate_feedback(analysis, problem_id, user_tier)
         
-        # FORCE OVERRIDE for Unicode Complexity (O(n²))
-        t_comp = str(analysis.time_complexity)
+        t_comp = analysis.time_complexity
         
         # DEBUG: Log everything to stderr
         import sys
@@ -194,9 +203,10 @@ async def analyze_submission(submission_id: str, code: str, language: str, probl
         sys.stderr.write(f"[Submissions] Detected Time: {t_comp}\n")
         sys.stderr.flush()
 
-        if "²" in t_comp or "n^2" in t_comp or "³" in t_comp:
+        # Polynomial degree 2 and up is never reported as optimal
+        if analysis.time is not None and QUADRATIC <= analysis.time < EXPONENTIAL:
             feedback.tier = "improvable"
-            feedback.message = f"Found: {t_comp}. This is likely a nested loop."
+            feedback.message = f"Found: {t_comp}. This is likely a nested loop or a linear operation inside a loop."
             feedback.title = "Optimization Needed"
             feedback.icon = "💡"
             feedback.show_celebration = False
@@ -221,14 +231,16 @@ async def analyze_submission(submission_id: str, code: str, language: str, probl
             feedback_icon=feedback.icon,
             hints=feedback.hints,
             patterns_detected=analysis.patterns,
-            execution_time_ms=sum(tr.execution_time_ms for tr in execution_result.test_results) / len(execution_result.test_results),
+            execution_time_ms=round(report.runtime_ms, 3),
             show_celebration=feedback.show_celebration,
             points=points,
-            tests_passed=execution_result.tests_passed,
-            tests_total=execution_result.tests_total,
+            tests_passed=tests_passed,
+            tests_total=tests_total,
             test_results=test_results_api
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Analysis unexpected error: {e}")
         traceback.print_exc()
@@ -3,10 +3,15 @@ Visualization API Routes
 Endpoints for code visualization (flowcharts, variable analysis)
 """
 
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Dict, Any
 from analyzers.code_analyzer import CodeAnalyzer
+from analyzers.live_analysis import EditCoalescer, LiveSession
+from config.settings import settings
 
 router = APIRouter(prefix="/api/visualization", tags=["visualization"])
 analyzer = CodeAnalyzer()
@@ -66,6 +71,26 @@ async def generate_flowchart(input_data: CodeInput):
         )
 
 
+@router.post("/flowchart/stream")
+async def stream_flowchart(input_data: CodeInput):
+    """
+    Mermaid flowchart of code as a plain-text stream
+    
+    Large programs are sent in chunks as the diagram is produced instead of as one JSON string
+    """
+    if input_data.language != "python":
+        raise HTTPException(
+            status_code=400,
+            detail="Only Python is currently supported"
+        )
+    
+    return StreamingResponse(
+        analyzer.stream_mermaid_diagram(input_data.code),
+        media_type="text/plain; charset=utf-8",
+        headers={"X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/variables", response_model=VariableResponse)
 async def analyze_variables(input_data: CodeInput):
     """
@@ -129,3 +154,49 @@ async def full_analysis(input_data: CodeInput):
             "variables": [],
             "complexity": 0
         }
+
+
+@router.websocket("/live")
+async def live_analysis(websocket: WebSocket):
+    """
+    Incremental analysis for the editor
+    
+    The client sends {"type": "edit", "code": ..., "version": n} on every change. A burst of
+    edits is analyzed once, and each reply is a delta against the blocks sent before:
+    {"type": "delta", "version": n, "order": [...], "added": {...}, "removed": [...], ...}
+    """
+    await websocket.accept()
+    session = LiveSession(analyzer)
+    edits = EditCoalescer(settings.LIVE_ANALYSIS_QUIET_MS / 1000, settings.LIVE_ANALYSIS_MAX_DELAY_MS / 1000)
+    
+    async def send_updates():
+        while True:
+            code, version = await edits.next()
+            try:
+                # Parsing and rendering a large buffer must not stall every other connection
+                update = await run_in_threadpool(session.update, code)
+            except Exception as e:
+                await websocket.send_json({"type": "error", "version": version, "error": str(e)})
+                continue
+            await websocket.send_json({"type": "delta", "version": version, **update.to_dict()})
+    
+    sender = asyncio.create_task(send_updates())
+    try:
+        while True:
+            receive = asyncio.ensure_future(websocket.receive_json())
+            done, _ = await asyncio.wait({receive, sender}, return_when=asyncio.FIRST_COMPLETED)
+            if sender in done:
+                # A failed send (client gone) ends the connection instead of leaving edits unanswered
+                receive.cancel()
+                print(f"[Visualization] Live analysis sender stopped: {sender.exception()}")
+                await websocket.close(code=1011)
+                break
+            data = receive.result()
+            if data.get("type") == "edit":
+                edits.push(data.get("code") or "", data.get("version"))
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"[Visualization] Live analysis error: {e}")
+    finally:
+        sender.cancel()
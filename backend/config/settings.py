@@ -1,8 +1,13 @@
 """
 Configuration settings for BeatCoders backend
 """
-from pydantic import BaseSettings
-from typing import List
+import os
+from typing import Dict, List
+
+try:
+    from pydantic import BaseSettings
+except ImportError:  # pydantic v2 moved BaseSettings into pydantic-settings
+    from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     # API Settings
@@ -25,11 +30,53 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
     # Code Execution
-    MAX_EXECUTION_TIME: int = 5  # seconds
-    MAX_MEMORY_MB: int = 128
+    MAX_EXECUTION_TIME: int = 5  # seconds, wall and CPU budget for a whole submission
+    MAX_MEMORY_MB: int = 128  # address space user code may allocate
+    JUDGE_TEST_TIME_LIMIT: float = 2.0  # seconds, wall and CPU budget for one test case
+    
+    # Judge Pool
+    JUDGE_POOL_SIZE: int = os.cpu_count() or 2
+    JUDGE_MAX_JOBS_PER_WORKER: int = 200  # recycle a worker after this many jobs
+    JUDGE_WORKER_MAX_MEMORY_MB: int = 512  # recycle a worker once its RSS grows past this
+    JUDGE_FORK_PER_JOB: bool = True  # run each job in a child forked from its pre-warmed worker
+    JUDGE_MAX_IN_FLIGHT: int = 0  # concurrent judge jobs, 0 = one per pool worker
+    JUDGE_MAX_QUEUE: int = 32  # jobs per priority class allowed to wait for a worker before we answer 429
+    JUDGE_MAX_QUEUED_PER_USER: int = 4  # pending judge jobs one user may have before we answer 429
+    # Share of judge workers per priority class under contention (weighted fair queuing)
+    JUDGE_PRIORITY_WEIGHTS: Dict[str, float] = {"battle": 8.0, "submit": 4.0, "run": 2.0, "rejudge": 1.0}
+    JUDGE_MEASURE_WARMUP: int = 1  # untimed runs per hidden case before measuring
+    JUDGE_MEASURE_REPEAT: int = 3  # timed runs per hidden case, best one is reported
+    JUDGE_RESULT_CACHE_SIZE: int = 1024  # judged submissions remembered by normalized AST
+    JUDGE_PROFILE_BUDGET: float = 1.0  # seconds spent timing accepted code on generated inputs
+    EMPIRICAL_MIN_CONFIDENCE: float = 0.65  # below this the static Big-O estimate is used
+    JUDGE_METERING: bool = False  # score accepted runs by counted operations instead of CPU time
+    JUDGE_METER_NS_PER_OP: float = 0.0  # ms-equivalent rate per operation, 0 = calibrate at startup
+    TEST_SUITE_RELOAD_INTERVAL: float = 5.0  # seconds between checks for edited test data
+    # Hidden suites are extended with seeded random cases checked against reference solutions
+    TEST_GENERATED_CASES: bool = True
+    TEST_GENERATED_SEED: int = 1
+    TEST_GENERATED_SIZES: List[int] = [0, 1, 2, 3, 5, 10, 100, 1000, 10000]
+    TEST_GENERATED_PER_SIZE: int = 2
+    # Distributed judging: "local" forks judge workers in the API, "queue" hands jobs to judge-worker processes
+    JUDGE_MODE: str = "local"
+    JUDGE_QUEUE_PATH: str = "./data/judge_queue.db"  # SQLite job queue shared by the API and judge workers
+    JUDGE_QUEUE_TIMEOUT: float = 60.0  # seconds the API waits for a queued job's result
+    JUDGE_LEASE_SECONDS: float = 30.0  # a job whose worker stops renewing its lease is redelivered after this
+    JUDGE_HEARTBEAT_SECONDS: float = 5.0  # judge workers report in and renew leases this often
+    JUDGE_JOB_MAX_ATTEMPTS: int = 3  # deliveries before a job is given up as failed
     
     # Analysis
     ENABLE_ML_ANALYSIS: bool = False  # Set to True when ML model is ready
+    AST_CACHE_SIZE: int = 256  # parsed sources (and the analyses derived from them) kept per process
+    # Flowcharts stop at these budgets; longer assignment runs show their first FLOWCHART_GROUP_LINES lines
+    FLOWCHART_MAX_NODES: int = 200
+    FLOWCHART_MAX_EDGES: int = 400
+    FLOWCHART_MAX_LABEL: int = 60  # characters per line of a node label
+    FLOWCHART_GROUP_LINES: int = 3
+    FLOWCHART_CACHE_SIZE: int = 512  # rendered functions kept per process, by AST hash
+    # Live VisualDebugger channel: a burst of edits is analyzed once the editor is quiet this long...
+    LIVE_ANALYSIS_QUIET_MS: int = 150
+    LIVE_ANALYSIS_MAX_DELAY_MS: int = 1000  # ...or this long after the burst began
     
     class Config:
         env_file = ".env"
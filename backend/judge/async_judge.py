@@ -0,0 +1,192 @@
+"""
+Async Judge
+Async front for the judge pool. Blocking pool calls run on a dedicated thread
+executor so the event loop stays free for other HTTP and WebSocket traffic.
+Each job carries a priority class and a user; the pool's scheduler orders
+them, and this front bounds the backlog per class and per user.
+judge_user and judge_or_429 are the helpers routes share to queue a job for a
+request and turn a saturated judge into a retryable 429.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import HTTPException, Request
+
+from config.settings import settings
+from judge.measure import JudgeReport
+from judge.pool import get_judge_pool
+from judge.scheduler import PRIORITY_CLASSES
+
+
+class JudgeBusy(Exception):
+    """Raised when every judge slot is taken and the wait queue is full"""
+    pass
+
+
+class AsyncJudge:
+    """Async interface to the judge pool with a bounded backlog per priority class and per user"""
+
+    def __init__(self, max_in_flight: Optional[int] = None, max_queue: Optional[int] = None,
+                 pool=None, max_per_user: Optional[int] = None):
+        self.max_in_flight = max_in_flight or settings.JUDGE_MAX_IN_FLIGHT or settings.JUDGE_POOL_SIZE
+        self.max_queue = settings.JUDGE_MAX_QUEUE if max_queue is None else max_queue
+        self.max_per_user = max_per_user or settings.JUDGE_MAX_QUEUED_PER_USER
+        self._pool = pool
+        # A waiting job parks its thread in the pool's scheduler, so every admissible job needs one
+        self._executor = ThreadPoolExecutor(
+            max_workers=(self.max_in_flight + self.max_queue) * len(PRIORITY_CLASSES), thread_name_prefix="judge"
+        )
+        self.pending = {cls: 0 for cls in PRIORITY_CLASSES}
+        self._pending_by_user: Dict[str, int] = {}
+        self._pending_lock = threading.Lock()
+
+    @property
+    def pool(self):
+        return self._pool or get_judge_pool()
+
+    async def run_tests(self, code: str, test_cases: List[Dict], fresh_instance: bool = False,
+                        priority: str = "run", user: Optional[str] = None) -> List[tuple]:
+        """
+        Run code against test cases without blocking the event loop.
+        Raises JudgeBusy instead of queueing when the class's or the user's backlog is full.
+        """
+        return await self._submit(functools.partial(
+            self.pool.run_tests, code, test_cases, fresh_instance, priority=priority, user=user
+        ), priority, user)
+
+    async def judge(self, code: str, test_cases: List[Dict], fresh_instance: bool = False,
+                    measure_from: Optional[int] = None, warmup: int = 0, repeat: int = 1,
+                    fail_fast_from: Optional[int] = None, meter: bool = False,
+                    priority: str = "submit", user: Optional[str] = None) -> JudgeReport:
+        """Async JudgePool.judge: verdicts plus measured runtime and memory"""
+        return await self._submit(functools.partial(
+            self.pool.judge, code, test_cases, fresh_instance, measure_from, warmup, repeat, fail_fast_from, meter,
+            priority=priority, user=user
+        ), priority, user)
+
+    async def judge_stream(self, code: str, test_cases: List[Dict], priority: str = "submit",
+                           user: Optional[str] = None, **judge_kwargs) -> AsyncIterator[tuple]:
+        """
+        Async JudgePool.judge that yields ("case", index, (passed, actual, error))
+        as each case finishes, then ("report", JudgeReport). Closing the
+        generator early (client gone) cancels the cases not yet run.
+        """
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def on_case(index, result):
+            loop.call_soon_threadsafe(events.put_nowait, ("case", index, result))
+
+        task = asyncio.ensure_future(self._submit(functools.partial(
+            self.pool.judge, code, test_cases, on_case=on_case, cancelled=cancelled,
+            priority=priority, user=user, **judge_kwargs
+        ), priority, user))
+        # Nobody awaits an abandoned run; don't let its outcome be logged as unretrieved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        next_event = None
+        try:
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({next_event, task}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event in done:
+                    yield next_event.result()
+                    continue
+                next_event.cancel()
+                # Case events are queued before the run's result, so drain them first
+                while not events.empty():
+                    yield events.get_nowait()
+                yield ("report", task.result())
+                return
+        finally:
+            cancelled.set()
+            if next_event is not None:
+                next_event.cancel()
+
+    async def profile(self, code: str, problem_id: str, budget_s: Optional[float] = None,
+                      priority: str = "submit", user: Optional[str] = None) -> List[tuple]:
+        """Async JudgePool.profile: (size, seconds) samples for empirical complexity"""
+        return await self._submit(functools.partial(
+            self.pool.profile, code, problem_id, budget_s, priority=priority, user=user
+        ), priority, user)
+
+    def metrics(self) -> Dict:
+        """Admitted jobs per class plus the pool's queue depth and wait times"""
+        metrics = {"pending": dict(self.pending), "users_pending": len(self._pending_by_user)}
+        if hasattr(self.pool, "metrics"):
+            metrics.update(self.pool.metrics())
+        return metrics
+
+    async def _submit(self, call, priority: str, user: Optional[str]):
+        # Running jobs plus max_queue waiting ones, per class: a flood of runs never 429s a battle
+        with self._pending_lock:
+            if self.pending[priority] >= self.max_in_flight + self.max_queue:
+                raise JudgeBusy(f"Judge is busy ({self.pending[priority]} {priority} jobs pending)")
+            if user is not None and self._pending_by_user.get(user, 0) >= self.max_per_user:
+                raise JudgeBusy(f"Too many pending judge jobs for this user ({self.max_per_user} max)")
+            self.pending[priority] += 1
+            if user is not None:
+                self._pending_by_user[user] = self._pending_by_user.get(user, 0) + 1
+
+        # The slot is held until the job itself is done: cancelling the awaiting
+        # coroutine does not stop a job that is already running on its thread
+        job = self._executor.submit(call)
+        job.add_done_callback(lambda _: self._release(priority, user))
+        return await asyncio.wrap_future(job)
+
+    def _release(self, priority: str, user: Optional[str]):
+        # Runs on the executor thread that finished the job, or here if it was cancelled before starting
+        with self._pending_lock:
+            self.pending[priority] -= 1
+            if user is not None:
+                self._pending_by_user[user] -= 1
+                if not self._pending_by_user[user]:
+                    del self._pending_by_user[user]
+
+
+_judge: Optional[AsyncJudge] = None
+_judge_lock = threading.Lock()
+
+
+def get_async_judge() -> AsyncJudge:
+    """Return the process-wide async judge"""
+    global _judge
+    with _judge_lock:
+        if _judge is None:
+            _judge = AsyncJudge()
+        return _judge
+
+
+def judge_user(user_id: Optional[str], http_request: Request) -> Optional[str]:
+    """Who a judge job is queued for: the user when known, else the client address"""
+    if user_id:
+        return user_id
+    return http_request.client.host if http_request.client else None
+
+
+async def judge_or_429(code: str, test_cases: List[Dict], measure_from: Optional[int] = None,
+                       fail_fast_from: Optional[int] = None, user: Optional[str] = None):
+    """
+    Run code on the judge, turning a saturated judge into a 429 the client can retry.
+    Returns (passed, actual, error) tuples from a Run (run priority), or a
+    JudgeReport when measuring a submission (submit priority).
+    """
+    judge = get_async_judge()
+    try:
+        if measure_from is None:
+            return await judge.run_tests(code, test_cases, priority="run", user=user)
+        return await judge.judge(
+            code, test_cases, measure_from=measure_from,
+            warmup=settings.JUDGE_MEASURE_WARMUP, repeat=settings.JUDGE_MEASURE_REPEAT,
+            fail_fast_from=fail_fast_from, meter=settings.JUDGE_METERING,
+            priority="submit", user=user
+        )
+    except JudgeBusy:
+        raise HTTPException(
+            status_code=429,
+            detail="Judge is busy: too many submissions queued. Please retry in a few seconds.",
+            headers={"Retry-After": "2"}
+        )
@@ -0,0 +1,127 @@
+"""
+Output Checkers
+How a problem decides whether an output is correct. Each checker turns the
+expected output into a canonical form once (prepare, run when the suite is
+built) and then compares every actual output against it (check, run per
+case in the judge workers). Cases name their checker; problems pick theirs
+in test_cases.checkers, which also holds the answer verifiers of problems
+with more than one valid output.
+    exact             expected == actual
+    unordered         the outer list in any order
+    unordered_nested  the outer list and its inner lists in any order
+    float             numbers within a tolerance, recursively through lists
+"""
+import math
+from typing import Any, Callable, Dict, Optional
+
+from judge.compare import _sorted, canonical_output
+
+DEFAULT_CHECKER = "exact"
+
+
+class Checker:
+    """Exact comparison; subclasses override prepare and/or check"""
+
+    def prepare(self, expected: Any) -> Any:
+        """Canonical form of an expected output, computed once per case"""
+        return expected
+
+    def check(self, canonical: Any, actual: Any, load_input: Callable[[], Dict]) -> bool:
+        """
+        Whether the actual output is correct. load_input builds a pristine copy of
+        the case's input; only checkers that verify answers need to call it.
+        """
+        return canonical == actual
+
+
+class UnorderedChecker(Checker):
+
+    def prepare(self, expected: Any) -> Any:
+        return _sorted(expected) if isinstance(expected, list) else expected
+
+    def check(self, canonical: Any, actual: Any, load_input: Callable[[], Dict]) -> bool:
+        if isinstance(canonical, list):
+            return isinstance(actual, list) and len(actual) == len(canonical) and _sorted(actual) == canonical
+        return canonical == actual
+
+
+class UnorderedNestedChecker(Checker):
+
+    def prepare(self, expected: Any) -> Any:
+        return canonical_output(expected)
+
+    def check(self, canonical: Any, actual: Any, load_input: Callable[[], Dict]) -> bool:
+        if isinstance(canonical, list):
+            return isinstance(actual, list) and len(actual) == len(canonical) and canonical_output(actual) == canonical
+        return canonical == actual
+
+
+class FloatChecker(Checker):
+
+    def __init__(self, rel_tol: float = 1e-6, abs_tol: float = 1e-6):
+        self.rel_tol = rel_tol
+        self.abs_tol = abs_tol
+
+    def check(self, canonical: Any, actual: Any, load_input: Callable[[], Dict]) -> bool:
+        return self._close(canonical, actual)
+
+    def _close(self, expected: Any, actual: Any) -> bool:
+        if isinstance(expected, (int, float)) and not isinstance(expected, bool):
+            return (isinstance(actual, (int, float)) and not isinstance(actual, bool)
+                    and math.isclose(expected, actual, rel_tol=self.rel_tol, abs_tol=self.abs_tol))
+        if isinstance(expected, (list, tuple)):
+            return (isinstance(actual, (list, tuple)) and len(actual) == len(expected)
+                    and all(self._close(e, a) for e, a in zip(expected, actual)))
+        return expected == actual
+
+
+class VerifyChecker(Checker):
+    """
+    Any valid answer: outputs equal to the expected one (under `base`) pass
+    without touching the input; anything else is checked by verify(input, actual).
+    """
+
+    def __init__(self, verify: Callable[[Dict, Any], bool], base: Optional[Checker] = None):
+        self.verify = verify
+        self.base = base or Checker()
+
+    def prepare(self, expected: Any) -> Any:
+        return self.base.prepare(expected)
+
+    def check(self, canonical: Any, actual: Any, load_input: Callable[[], Dict]) -> bool:
+        return self.base.check(canonical, actual, load_input) or bool(self.verify(load_input(), actual))
+
+
+CHECKERS: Dict[str, Checker] = {
+    "exact": Checker(),
+    "unordered": UnorderedChecker(),
+    "unordered_nested": UnorderedNestedChecker(),
+    "float": FloatChecker(),
+}
+
+
+def get_checker(name: str) -> Checker:
+    """A built-in checker or a problem's own (test_cases.checkers); KeyError for unknown names"""
+    checker = CHECKERS.get(name)
+    if checker is None:
+        # Imported here: the test data package itself depends on the judge
+        from test_cases.checkers import CUSTOM_CHECKERS
+        checker = CUSTOM_CHECKERS[name]
+    return checker
+
+
+def case_checker(test_case: Dict) -> str:
+    """Checker name of a case; the legacy order_independent flag means unordered_nested"""
+    return test_case.get("checker") or ("unordered_nested" if test_case.get("order_independent") else DEFAULT_CHECKER)
+
+
+def case_passes(test_case: Dict, actual: Any, load_input: Callable[[], Dict]) -> bool:
+    """Judge one output against its case, using the canonical form stored with the case when present"""
+    checker = get_checker(case_checker(test_case))
+    expected = test_case["output"] if "output" in test_case else test_case.get("expected")
+    canonical = test_case["canonical"] if "canonical" in test_case else checker.prepare(expected)
+    try:
+        return checker.check(canonical, actual, load_input)
+    except Exception:
+        # A verifier tripping over a malformed answer means the answer is wrong
+        return False
@@ -0,0 +1,34 @@
+"""
+Output Comparison
+Order-insensitive canonical forms, used by the checkers in judge.checkers,
+and a plain expected-vs-actual comparison for callers outside a suite.
+"""
+from typing import Any, Optional
+
+
+def _sorted(items: list) -> list:
+    try:
+        return sorted(items)
+    except TypeError:
+        # Mixed element types: any total order will do as long as both sides use it
+        return sorted(items, key=repr)
+
+
+def canonical_output(value: Any) -> Any:
+    """
+    Order-insensitive form of a list output (e.g. group anagrams):
+    inner lists sorted, then the outer list sorted.
+    """
+    if not isinstance(value, list):
+        return value
+    return _sorted([_sorted(x) if isinstance(x, list) else x for x in value])
+
+
+def outputs_match(expected: Any, actual: Any, order_independent: bool = False,
+                  canonical_expected: Optional[Any] = None) -> bool:
+    """Compare an output with its expectation, ignoring order where the case allows it"""
+    if order_independent and isinstance(expected, list) and isinstance(actual, list):
+        if canonical_expected is None:
+            canonical_expected = canonical_output(expected)
+        return canonical_expected == canonical_output(actual)
+    return expected == actual
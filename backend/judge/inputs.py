@@ -0,0 +1,118 @@
+"""
+Test Input Delivery
+User code may mutate its arguments (nums.sort(), grid[i][j] = 0), so every
+run needs a pristine input. Each input is pickled once; a run gets its own
+copy from pickle.loads, which is far cheaper than deepcopy on large inputs.
+Registry suites are packed once into a single blob that the pool ships to a
+worker the first time it needs that suite version and refers to by version
+afterwards, so large stress inputs are not re-serialized per request.
+Cases from test packs (judge.test_packs) carry a reference instead and are
+read from the memory-mapped pack when they run.
+"""
+import copy
+import hashlib
+import pickle
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+from judge import test_packs
+
+PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+def pack_case(test_case: Dict) -> Dict:
+    """Copy of a case carrying its input pickled as 'packed_input'; packed and pack cases are returned as is"""
+    if "packed_input" in test_case or "pack" in test_case:
+        return test_case
+    packed = dict(test_case)
+    packed["packed_input"] = pickle.dumps(test_case["input"], protocol=PROTOCOL)
+    return packed
+
+
+def fresh_input(test_case: Dict) -> Any:
+    """A private copy of the case's input that the user code is free to mutate"""
+    if "pack" in test_case:
+        return test_packs.load_input(test_case["pack"])
+    packed = test_case.get("packed_input")
+    if packed is not None:
+        return pickle.loads(packed)
+    return copy.deepcopy(test_case["input"])
+
+
+def unpack_blob(blob: bytes) -> tuple:
+    """Worker side: the packed cases of a suite blob"""
+    return tuple(pickle.loads(blob))
+
+
+def _unpacked(packed: Dict) -> Dict:
+    if "pack" in packed:
+        # Its input is a summary; the real one is only ever built by the worker running it
+        return packed
+    case = {k: v for k, v in packed.items() if k != "packed_input"}
+    case["input"] = fresh_input(packed)
+    return case
+
+
+class PackedCases(Sequence):
+    """
+    Test cases serialized once. Indexes and iterates like the list of judge
+    case dicts it was built from (so callers can zip, slice and count it),
+    and optionally starts with a few plain cases sent along with every job,
+    like the visible cases of a submission.
+        hidden = PackedCases(suite.hidden_cases)    # once per suite version
+        cases = hidden.with_prefix(visible_cases)   # per request, shares the blob
+    """
+
+    def __init__(self, cases: Iterable[Dict], prefix: Iterable[Dict] = (), version: Optional[str] = None):
+        self._cases: Optional[tuple] = tuple(cases)
+        self.prefix = list(prefix)
+        self.blob = pickle.dumps([pack_case(case) for case in self._cases], protocol=PROTOCOL)
+        # Identifies the packed part; callers that already hash their suites pass that version in
+        self.version = version or hashlib.sha256(self.blob).hexdigest()[:16]
+        self.count = len(self._cases)
+
+    @property
+    def cases(self) -> tuple:
+        """The packed part as judge case dicts (decoded from the blob after unpickling)"""
+        if self._cases is None:
+            self._cases = tuple(_unpacked(case) for case in unpack_blob(self.blob))
+        return self._cases
+
+    def with_prefix(self, prefix: Iterable[Dict]) -> "PackedCases":
+        packed = object.__new__(PackedCases)
+        packed.__dict__.update(self.__dict__)
+        packed.prefix = list(prefix)
+        return packed
+
+    def __len__(self) -> int:
+        return len(self.prefix) + self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("test case index out of range")
+        if index < len(self.prefix):
+            return self.prefix[index]
+        return self.cases[index - len(self.prefix)]
+
+    def __iter__(self):
+        yield from self.prefix
+        yield from self.cases
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Crossing a process boundary (job queue) only needs the blob, not the case dicts too
+        state = dict(self.__dict__)
+        state["_cases"] = None
+        return state
+
+
+def job_cases(test_cases) -> tuple:
+    """
+    (plain cases, (version, blob) or None) as the pool puts them in a job:
+    packed suites travel by reference, everything else as packed plain cases.
+    """
+    if isinstance(test_cases, PackedCases):
+        return [pack_case(case) for case in test_cases.prefix], (test_cases.version, test_cases.blob)
+    return [pack_case(case) for case in test_cases], None
@@ -0,0 +1,207 @@
+"""
+Judge Job Queue
+Durable queue between API processes and standalone judge workers
+(scripts/judge_worker.py), kept in a SQLite file that every box can reach.
+Delivery is at-least-once: a worker leases a job for a limited time and
+keeps the lease alive while it runs; a job whose lease expires (worker died
+or hung) goes back to the queue, up to a maximum number of attempts.
+Workers also record heartbeats so the API can tell whether anyone is there.
+
+The interface (enqueue / lease / extend / complete / wait / heartbeat) is all
+a backend has to provide, so a Redis-based queue can stand in for this one.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS judge_jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT UNIQUE NOT NULL,
+    priority INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result BLOB,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_judge_jobs_claim ON judge_jobs (status, priority, seq);
+CREATE TABLE IF NOT EXISTS judge_workers (
+    worker_id TEXT PRIMARY KEY,
+    host TEXT,
+    pid INTEGER,
+    capacity INTEGER,
+    jobs_done INTEGER NOT NULL DEFAULT 0,
+    started_at REAL NOT NULL,
+    heartbeat_at REAL NOT NULL
+);
+"""
+
+# Poll interval bounds while waiting for a result
+POLL_MIN_SECONDS = 0.01
+POLL_MAX_SECONDS = 0.2
+
+
+class JobFailed(Exception):
+    """Raised by wait() when a job ran out of attempts without a result"""
+    pass
+
+
+class SQLiteJobQueue:
+    """Job queue in a SQLite database file, safe across threads and processes"""
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread; autocommit so transactions are explicit
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # Producer side (API)
+
+    def enqueue(self, payload: Dict[str, Any], priority: int = 0) -> str:
+        """Queue a job; lower priority numbers are served first"""
+        job_id = uuid.uuid4().hex
+        self._conn().execute(
+            "INSERT INTO judge_jobs (id, priority, payload, created_at) VALUES (?, ?, ?, ?)",
+            (job_id, priority, pickle.dumps(payload), time.time())
+        )
+        return job_id
+
+    def wait(self, job_id: str, timeout: float) -> Any:
+        """
+        Block until the job has a result and return it, deleting the job.
+        Raises TimeoutError (job left queued for a later cleanup) or JobFailed.
+        """
+        deadline = time.monotonic() + timeout
+        poll = POLL_MIN_SECONDS
+        while True:
+            row = self._conn().execute(
+                "SELECT status, result FROM judge_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is not None and row[0] in ("done", "failed"):
+                self._conn().execute("DELETE FROM judge_jobs WHERE id = ?", (job_id,))
+                if row[0] == "failed":
+                    raise JobFailed(pickle.loads(row[1]) if row[1] else "Judge job failed")
+                return pickle.loads(row[1])
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"No judge result for job {job_id} after {timeout:.0f}s")
+            time.sleep(poll)
+            poll = min(poll * 2, POLL_MAX_SECONDS)
+
+    def cancel(self, job_id: str):
+        """Drop a job nobody is waiting for any more (it may still run if already leased)"""
+        self._conn().execute("DELETE FROM judge_jobs WHERE id = ?", (job_id,))
+
+    # Consumer side (judge workers)
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Claim the next job: a queued one, or one whose lease expired.
+        Returns (job_id, payload), or None when there is nothing to do.
+        """
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM judge_jobs "
+                "WHERE status = 'queued' OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY priority, seq LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            job_id, payload, attempts = row
+            if attempts >= self.max_attempts:
+                # Delivered max_attempts times and never finished: most likely it kills workers
+                conn.execute(
+                    "UPDATE judge_jobs SET status = 'failed', result = ?, lease_owner = NULL WHERE id = ?",
+                    (pickle.dumps(f"Judge job abandoned after {attempts} attempts"), job_id)
+                )
+                conn.execute("COMMIT")
+                return self.lease(worker_id, lease_seconds)
+            conn.execute(
+                "UPDATE judge_jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1 WHERE id = ?",
+                (worker_id, now + lease_seconds, job_id)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return job_id, pickle.loads(payload)
+
+    def extend(self, job_ids: List[str], worker_id: str, lease_seconds: float):
+        """Keep leases alive for jobs this worker is still running"""
+        if not job_ids:
+            return
+        expires = time.time() + lease_seconds
+        self._conn().executemany(
+            "UPDATE judge_jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+            [(expires, job_id, worker_id) for job_id in job_ids]
+        )
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        """
+        Store a job's result. A duplicate delivery that finishes second is
+        ignored; returns whether this result was the one kept.
+        """
+        cursor = self._conn().execute(
+            "UPDATE judge_jobs SET status = 'done', result = ?, lease_owner = ? "
+            "WHERE id = ? AND status = 'leased'",
+            (pickle.dumps(result), worker_id, job_id)
+        )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, worker_id: str, host: str, pid: int, capacity: int, jobs_done: int):
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO judge_workers (worker_id, host, pid, capacity, jobs_done, started_at, heartbeat_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(worker_id) DO UPDATE SET jobs_done = excluded.jobs_done, heartbeat_at = excluded.heartbeat_at",
+            (worker_id, host, pid, capacity, jobs_done, now, now)
+        )
+
+    def retire(self, worker_id: str):
+        """Remove a worker that shut down cleanly"""
+        self._conn().execute("DELETE FROM judge_workers WHERE worker_id = ?", (worker_id,))
+
+    # Monitoring
+
+    def workers(self, alive_within: float) -> List[Dict[str, Any]]:
+        """Workers whose last heartbeat is at most alive_within seconds old"""
+        rows = self._conn().execute(
+            "SELECT worker_id, host, pid, capacity, jobs_done, heartbeat_at FROM judge_workers "
+            "WHERE heartbeat_at >= ? ORDER BY worker_id",
+            (time.time() - alive_within,)
+        ).fetchall()
+        keys = ("worker_id", "host", "pid", "capacity", "jobs_done", "heartbeat_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def depth(self) -> Dict[str, int]:
+        """Jobs per status"""
+        rows = self._conn().execute("SELECT status, COUNT(*) FROM judge_jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def purge(self, older_than: float):
+        """Delete jobs created more than older_than seconds ago whose caller gave up on them"""
+        self._conn().execute("DELETE FROM judge_jobs WHERE created_at < ?", (time.time() - older_than,))
@@ -0,0 +1,138 @@
+"""
+Execution Limits
+Wall-clock, CPU time and address-space limits for code running in a judge worker.
+Limits a submission could otherwise raise back with setrlimit are set as hard
+limits: the address space in every worker, the CPU budget plus no new
+processes and no file writes in each single-use job child (see lock_down).
+Everything degrades to a no-op on platforms without setitimer/resource (Windows)
+or when called off the main thread, where signals cannot be delivered.
+"""
+import math
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+# CPU seconds past a job's budget before the kernel kills its child outright (SIGXCPU comes first)
+CPU_HARD_GRACE_S = 2
+
+TIME_LIMIT_EXCEEDED = "Time Limit Exceeded"
+MEMORY_LIMIT_EXCEEDED = "Memory Limit Exceeded"
+
+
+class TimeLimitExceeded(BaseException):
+    """
+    Raised inside user code when its time budget runs out.
+    Derives from BaseException so `except Exception` in user code cannot swallow it.
+    """
+    pass
+
+
+def _raise_time_limit(signum, frame):
+    raise TimeLimitExceeded(TIME_LIMIT_EXCEEDED)
+
+
+def _signals_available() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def time_limit(seconds: float):
+    """Arm a wall-clock timer and a CPU timer for the duration of the block"""
+    if not seconds or seconds <= 0 or not _signals_available():
+        yield
+        return
+
+    prev_alarm = signal.signal(signal.SIGALRM, _raise_time_limit)
+    prev_prof = signal.signal(signal.SIGPROF, _raise_time_limit)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    signal.setitimer(signal.ITIMER_PROF, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGALRM, prev_alarm)
+        signal.signal(signal.SIGPROF, prev_prof)
+
+
+@contextmanager
+def cpu_budget(seconds: float):
+    """
+    Cap total CPU time of the process for the block via RLIMIT_CPU (whole seconds).
+    Catches CPU burnt outside the main thread, which ITIMER_PROF alone would miss.
+    """
+    if resource is None or not seconds or not _signals_available():
+        yield
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+
+    prev_xcpu = signal.signal(signal.SIGXCPU, _raise_time_limit)
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    try:
+        yield
+    finally:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+        signal.signal(signal.SIGXCPU, prev_xcpu)
+
+
+def _address_space_bytes() -> int:
+    """Current virtual memory size of this process, 0 if unknown"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[0])
+        return pages * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def set_memory_limit(max_memory_mb: int):
+    """
+    Cap the address space of this process at its current size plus max_memory_mb,
+    so allocations beyond the budget raise MemoryError instead of swapping the node.
+    """
+    if resource is None or not max_memory_mb:
+        return
+    baseline = _address_space_bytes()
+    if not baseline:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    limit = baseline + max_memory_mb * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    # Hard as well as soft, so the code running here cannot lift it again
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def lock_down(cpu_seconds: Optional[float]):
+    """
+    Harden a process that runs exactly one job and then exits (a forked job child).
+    Its CPU time is capped for good at cpu_seconds from now plus CPU_HARD_GRACE_S,
+    and it may neither create processes nor write to files (pipes and terminals
+    are unaffected). None of this can be undone from inside, which is why a
+    long-lived worker, which must restore its limits between jobs, never calls it.
+    RLIMIT_NPROC counts every process of the user and is not enforced for root.
+    """
+    if resource is None:
+        return
+    if cpu_seconds:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        limit = math.ceil(usage.ru_utime + usage.ru_stime + cpu_seconds) + CPU_HARD_GRACE_S
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, limit))
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    # A write past the limit then fails with EFBIG instead of killing the process
+    signal.signal(signal.SIGXFSZ, signal.SIG_IGN)
+    resource.setrlimit(resource.RLIMIT_FSIZE, (0, 0))
@@ -0,0 +1,139 @@
+"""
+Judge Measurement
+Real per-test CPU time and peak memory for a loaded solution.
+Timing runs use the calling thread's CPU clock, which is read from the
+scheduler rather than sampled on timer ticks (the process clock is coarse while
+the ITIMER_PROF/RLIMIT_CPU guards are armed), with optional warm-up and
+repeats (best of N), memory is taken from a separate tracemalloc run so the
+allocation tracer never inflates the timings.
+"""
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+from judge.inputs import fresh_input
+from judge.limits import TimeLimitExceeded, time_limit
+
+# Extra measurement runs for a case may use at most this share of the remaining submission budget
+MEASURE_BUDGET_SHARE = 0.5
+
+
+@dataclass
+class CaseMetrics:
+    cpu_ms: float
+    wall_ms: float
+    peak_memory_kb: float = 0.0
+    samples: int = 1
+    operations: Optional[int] = None  # metered line count, None when not metered
+
+
+@dataclass
+class JudgeReport:
+    results: List[tuple]
+    # One entry per test case, None where the case was not measured
+    metrics: List[Optional[CaseMetrics]] = field(default_factory=list)
+    runtime_ms: float = 0.0  # sum of best CPU times over measured cases
+    memory_mb: float = 0.0  # worker RSS at job start plus the worst tracemalloc peak
+    operations: Optional[int] = None  # metered line count over measured cases, None when not metered
+    cost_ms: Optional[float] = None  # operations at the calibrated rate, set by the pool
+    cancelled: bool = False  # stopped early because the client went away
+
+    @property
+    def measured(self) -> bool:
+        return any(m is not None for m in self.metrics)
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process right now"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        if resource is None:
+            return 0.0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed_call(solution, test_case: Dict, fresh_instance: bool) -> tuple:
+    """Call the solution on a private copy of the input, returns (cpu_ns, wall_ns)"""
+    input_data = fresh_input(test_case)
+    user_function = solution.entry_point(fresh_instance)
+    wall_start = time.perf_counter_ns()
+    cpu_start = time.thread_time_ns()
+    if isinstance(input_data, dict):
+        user_function(**input_data)
+    else:
+        user_function(input_data)
+    cpu_ns = time.thread_time_ns() - cpu_start
+    wall_ns = time.perf_counter_ns() - wall_start
+    return cpu_ns, wall_ns
+
+
+def peak_memory_kb(solution, test_case: Dict, fresh_instance: bool) -> float:
+    """Peak Python heap allocated by one call, traced with tracemalloc"""
+    input_data = fresh_input(test_case)
+    user_function = solution.entry_point(fresh_instance)
+    tracemalloc.start()
+    try:
+        if isinstance(input_data, dict):
+            user_function(**input_data)
+        else:
+            user_function(input_data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure_case(solution, test_case: Dict, fresh_instance: bool, first_sample: tuple,
+                 warmup: int, repeat: int, budget: Optional[float]) -> CaseMetrics:
+    """
+    Measure a case that already passed once.
+    first_sample is the (cpu_ns, wall_ns) of that correctness run: it counts as
+    the first warm-up when warmup > 0, otherwise as the first timed sample.
+    Extra runs are skipped rather than allowed to eat the submission budget.
+    """
+    cpu_samples, wall_samples = [], []
+    if warmup > 0:
+        warmup -= 1
+    else:
+        cpu_samples.append(first_sample[0])
+        wall_samples.append(first_sample[1])
+        repeat -= 1
+
+    extra_runs = warmup + max(repeat, 0) + 1  # +1 for the memory run
+    if budget is not None and first_sample[1] * extra_runs / 1e9 > budget * MEASURE_BUDGET_SHARE:
+        extra_runs = 0
+
+    peak_kb = 0.0
+    if extra_runs:
+        try:
+            with time_limit(budget):
+                for _ in range(warmup):
+                    timed_call(solution, test_case, fresh_instance)
+                for _ in range(max(repeat, 0)):
+                    cpu_ns, wall_ns = timed_call(solution, test_case, fresh_instance)
+                    cpu_samples.append(cpu_ns)
+                    wall_samples.append(wall_ns)
+                peak_kb = peak_memory_kb(solution, test_case, fresh_instance)
+        except (TimeLimitExceeded, Exception):
+            # The verdict is already in; a flaky re-run only costs us samples
+            pass
+
+    if not cpu_samples:
+        cpu_samples.append(first_sample[0])
+        wall_samples.append(first_sample[1])
+
+    return CaseMetrics(
+        cpu_ms=min(cpu_samples) / 1e6,
+        wall_ms=min(wall_samples) / 1e6,
+        peak_memory_kb=peak_kb,
+        samples=len(cpu_samples),
+    )
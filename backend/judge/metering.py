@@ -0,0 +1,134 @@
+"""
+Judge Metering
+Deterministic cost of a submission: the number of source lines it executes.
+Counts only lines of the submission itself (library and builtin code is free,
+so `sorted(xs)` or `x in big_list` is one operation however large xs is),
+so the same code on the same input always gets the same count, whatever the
+load on the judge host. A count is not a time: it is ranked in its own
+distribution (cost_ms) and never mixed with measured CPU time. Uses sys.monitoring on Python 3.12+ and falls back to
+sys.settrace. Tracing is slow, so it is only used for the final scored run.
+"""
+import sys
+import time
+from typing import Dict, Optional
+
+from judge.inputs import fresh_input
+
+# Filename LoadedSolution compiles submissions under
+SUBMISSION_FILENAME = "<solution>"
+
+# Reference workload for calibrating line events against wall time on this host
+_CALIBRATION_CODE = """
+def _calibration(n):
+    total = 0
+    seen = {}
+    for i in range(n):
+        total += i * i % 7
+        if i % 3 == 0:
+            seen[i] = total
+    return total, len(seen)
+"""
+_CALIBRATION_SIZE = 20000
+
+_monitoring = getattr(sys, "monitoring", None)
+
+
+class OperationMeter:
+    """
+    Context manager counting line events executed in submission code.
+        with OperationMeter() as meter:
+            solution(...)
+        meter.count
+    """
+
+    def __init__(self, filename: str = SUBMISSION_FILENAME):
+        self.filename = filename
+        self.count = 0
+        self._tool_id = None
+        self._old_trace = None
+
+    def __enter__(self):
+        self.count = 0
+        if _monitoring is not None and self._start_monitoring():
+            return self
+        self._old_trace = sys.gettrace()
+        sys.settrace(self._trace_call)
+        return self
+
+    def __exit__(self, *exc):
+        if self._tool_id is not None:
+            _monitoring.set_events(self._tool_id, _monitoring.events.NO_EVENTS)
+            _monitoring.register_callback(self._tool_id, _monitoring.events.LINE, None)
+            _monitoring.free_tool_id(self._tool_id)
+            self._tool_id = None
+        else:
+            sys.settrace(self._old_trace)
+        return False
+
+    # sys.monitoring (3.12+)
+
+    def _start_monitoring(self) -> bool:
+        for tool_id in (_monitoring.PROFILER_ID, _monitoring.OPTIMIZER_ID):
+            if _monitoring.get_tool(tool_id) is None:
+                _monitoring.use_tool_id(tool_id, "beatcoders-meter")
+                self._tool_id = tool_id
+                break
+        else:
+            # Another profiler owns the slots; settrace still works
+            return False
+        # Lines outside the submission are disabled after their first event
+        _monitoring.restart_events()
+        _monitoring.register_callback(self._tool_id, _monitoring.events.LINE, self._on_line)
+        _monitoring.set_events(self._tool_id, _monitoring.events.LINE)
+        return True
+
+    def _on_line(self, code, line_number):
+        if code.co_filename != self.filename:
+            return _monitoring.DISABLE
+        self.count += 1
+
+    # sys.settrace fallback
+
+    def _trace_call(self, frame, event, arg):
+        if frame.f_code.co_filename != self.filename:
+            return None
+        return self._trace_line
+
+    def _trace_line(self, frame, event, arg):
+        if event == "line":
+            self.count += 1
+        return self._trace_line
+
+
+def metered_call(solution, test_case: Dict, fresh_instance: bool) -> int:
+    """Call the solution on a private copy of the input and return its operation count"""
+    input_data = fresh_input(test_case)
+    user_function = solution.entry_point(fresh_instance)
+    with OperationMeter() as meter:
+        if isinstance(input_data, dict):
+            user_function(**input_data)
+        else:
+            user_function(input_data)
+    return meter.count
+
+
+def calibrate_ns_per_operation(repeat: int = 5) -> float:
+    """
+    Wall nanoseconds one operation costs on this host when not traced.
+    Multiplying a count by this gives a millisecond figure users recognise,
+    without bringing the noise back: the factor is fixed for the process.
+    """
+    namespace = {}
+    exec(compile(_CALIBRATION_CODE, SUBMISSION_FILENAME, "exec"), namespace)
+    workload = namespace["_calibration"]
+
+    best_ns: Optional[int] = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        workload(_CALIBRATION_SIZE)
+        elapsed = time.perf_counter_ns() - start
+        best_ns = elapsed if best_ns is None else min(best_ns, elapsed)
+
+    with OperationMeter() as meter:
+        workload(_CALIBRATION_SIZE)
+    return best_ns / max(meter.count, 1)
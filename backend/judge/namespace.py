@@ -0,0 +1,107 @@
+"""
+Solution Namespace
+The globals a submission is executed in, shared by the judge workers and
+CodeExecutor. Like on LeetCode, starter-code names (List, Optional, deque,
+heapq, ...) are available without imports; anything else a submission
+imports must be on the allowlist, and file and interpreter access is removed. The template is built once per
+process at import time; each submission gets a shallow copy, which costs
+microseconds instead of re-importing anything.
+"""
+import builtins
+from typing import Any, Dict
+
+# Executed once into the template
+PRELUDE = """
+from typing import *
+import collections
+import heapq
+import bisect
+import math
+import functools
+import itertools
+from collections import Counter, OrderedDict, defaultdict, deque
+from heapq import heapify, heappop, heappush
+from bisect import bisect_left, bisect_right, insort
+from functools import cache, lru_cache, reduce
+"""
+
+# Modules submissions may still import explicitly (e.g. `from typing import List` in starter code)
+ALLOWED_MODULES = frozenset({
+    "typing", "collections", "heapq", "bisect", "math", "functools", "itertools",
+    "string", "operator", "re", "random", "copy",
+})
+
+# Builtins judged code never gets: files, the console, nested compilation and interpreter exit
+BLOCKED_BUILTINS = frozenset({
+    "open", "input", "breakpoint", "help", "exit", "quit", "exec", "eval", "compile", "__loader__", "__spec__",
+})
+
+
+def _restricted_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level != 0 or name.split(".")[0] not in ALLOWED_MODULES:
+        raise ImportError(f"Import of '{name}' is not allowed")
+    return __import__(name, globals, locals, fromlist, level)
+
+
+# Builtins for code executed inside the API process (CodeExecutor). Judge workers
+# are isolated processes with their own limits and get JUDGE_BUILTINS.
+RESTRICTED_BUILTINS = {
+    "range": range,
+    "len": len,
+    "enumerate": enumerate,
+    "zip": zip,
+    "map": map,
+    "filter": filter,
+    "sorted": sorted,
+    "sum": sum,
+    "max": max,
+    "min": min,
+    "abs": abs,
+    "int": int,
+    "str": str,
+    "float": float,
+    "bool": bool,
+    "list": list,
+    "dict": dict,
+    "set": set,
+    "tuple": tuple,
+    "True": True,
+    "False": False,
+    "None": None,
+    "__import__": _restricted_import,
+}
+
+# Everything else from builtins, with imports going through the allowlist
+JUDGE_BUILTINS = {
+    name: value for name, value in builtins.__dict__.items() if name not in BLOCKED_BUILTINS
+}
+JUDGE_BUILTINS["__import__"] = _restricted_import
+
+_MISSING = object()
+
+
+def _build_template() -> Dict[str, Any]:
+    template: Dict[str, Any] = {}
+    exec(compile(PRELUDE, "<prelude>", "exec"), template)
+    del template["__builtins__"]
+    # Keeps `if __name__ == "__main__":` blocks in submissions from running
+    template["__name__"] = "solution"
+    return template
+
+
+TEMPLATE = _build_template()
+
+
+def solution_namespace(restricted: bool = False) -> Dict[str, Any]:
+    """Fresh globals for one submission, with its own copy of the builtins it may rebind"""
+    namespace = dict(TEMPLATE)
+    namespace["__builtins__"] = dict(RESTRICTED_BUILTINS if restricted else JUDGE_BUILTINS)
+    return namespace
+
+
+def user_defined(namespace: Dict[str, Any]) -> Dict[str, Any]:
+    """Names the submission itself defined (or rebound), in definition order"""
+    return {
+        name: value for name, value in namespace.items()
+        if not name.startswith("__") and TEMPLATE.get(name, _MISSING) is not value
+    }
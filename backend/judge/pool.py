@@ -0,0 +1,331 @@
+"""
+Judge Pool
+Pre-forked, pre-warmed worker processes that own all user-code execution.
+The API process never runs untrusted code itself; it hands jobs to an idle
+worker and waits for the reply. Which waiting job gets the next idle worker is
+decided by judge.scheduler (priority classes, per-user fairness). Workers are
+recycled after a fixed number of jobs or once their memory grows past a ceiling.
+With JUDGE_FORK_PER_JOB each worker is a fork server: it never runs user code
+itself but forks a child per job from its warm interpreter (see runner.run_forked).
+"""
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings
+from judge import runner
+from judge.inputs import job_cases
+from judge.measure import JudgeReport
+from judge.scheduler import FairScheduler
+
+
+class WorkerCrashed(Exception):
+    """Raised when a judge worker dies while running a job"""
+    pass
+
+
+class WorkerTimeout(Exception):
+    """Raised when a worker does not answer within the submission wall-clock limit"""
+    pass
+
+# Grace period on top of the submission limit before the pool kills a worker itself
+KILL_GRACE_SECONDS = 1.0
+# How often a streaming request checks whether its client went away
+EVENT_POLL_SECONDS = 0.05
+# Operation-to-milliseconds rate used while calibration is unavailable
+DEFAULT_NS_PER_OPERATION = 30.0
+
+
+def _get_context():
+    # fork gives us workers that inherit the already-imported runner for free
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+
+
+class _Worker:
+    """Handle on one worker process and its pipe"""
+
+    def __init__(self, ctx, max_memory_mb: Optional[int] = None, fork_per_job: bool = False):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=runner.worker_main, args=(child_conn, max_memory_mb, fork_per_job),
+                                   daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.jobs_done = 0
+        self.rss_mb = 0.0
+        self.needs_recycle = False
+        # Suite versions this worker has cached, mirroring runner's LRU
+        self.suites: "OrderedDict[str, bool]" = OrderedDict()
+
+    def request(self, job: Dict, timeout: Optional[float] = None, on_event: Optional[Callable] = None,
+                cancelled: Optional[threading.Event] = None) -> Dict:
+        """
+        Send a job and wait for its reply. Streaming jobs send events first:
+        each goes to on_event, and once `cancelled` is set the worker is asked
+        to stop at the next test case boundary. A packed suite the worker
+        already holds is sent by version only.
+        """
+        reply = self._exchange(self._with_cached_suite(job), timeout, on_event, cancelled)
+        if "missing_suite" in reply:
+            # Our view of the worker's cache was stale: ship the suite this time
+            self.suites.pop(reply["missing_suite"], None)
+            reply = self._exchange(self._with_cached_suite(job), timeout, on_event, cancelled)
+        self.jobs_done += 1
+        self.rss_mb = reply.get("rss_mb", 0.0)
+        self.needs_recycle = reply.get("recycle", False)
+        return reply
+
+    def _with_cached_suite(self, job: Dict) -> Dict:
+        suite = job.get("suite")
+        if suite is None:
+            return job
+        version = suite[0]
+        if version in self.suites:
+            self.suites.move_to_end(version)
+            return dict(job, suite=(version, None))
+        self.suites[version] = True
+        while len(self.suites) > runner.SUITE_CACHE_SIZE:
+            self.suites.popitem(last=False)
+        return job
+
+    def _exchange(self, job: Dict, timeout: Optional[float], on_event: Optional[Callable],
+                  cancelled: Optional[threading.Event]) -> Dict:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        cancel_sent = False
+        try:
+            self.conn.send(job)
+            while True:
+                if cancelled is not None and cancelled.is_set() and not cancel_sent:
+                    self.conn.send({"kind": "cancel"})
+                    cancel_sent = True
+                wait = EVENT_POLL_SECONDS if cancelled is not None else None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    wait = remaining if wait is None else min(wait, remaining)
+                if wait is not None and (wait <= 0 or not self.conn.poll(wait)):
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise WorkerTimeout(f"Judge worker {self.process.pid} exceeded {timeout:.1f}s")
+                    continue
+                reply = self.conn.recv()
+                if "event" not in reply:
+                    break
+                if on_event is not None:
+                    on_event(reply)
+        except (EOFError, OSError, BrokenPipeError) as e:
+            raise WorkerCrashed(f"Judge worker {self.process.pid} exited unexpectedly") from e
+        return reply
+
+    def stop(self, force: bool = False):
+        if force:
+            # Still busy running user code, no point asking nicely; a forked job child goes with its group
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except (AttributeError, OSError):
+                pass
+            self.process.kill()
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class JudgePool:
+    """Fixed-size pool of judge worker processes"""
+
+    def __init__(self, size: Optional[int] = None, max_jobs_per_worker: Optional[int] = None,
+                 max_memory_mb: Optional[int] = None, test_time_limit: Optional[float] = None,
+                 total_time_limit: Optional[float] = None, job_memory_mb: Optional[int] = None,
+                 fork_per_job: Optional[bool] = None):
+        self.size = size or settings.JUDGE_POOL_SIZE
+        self.max_jobs_per_worker = max_jobs_per_worker or settings.JUDGE_MAX_JOBS_PER_WORKER
+        self.max_memory_mb = max_memory_mb or settings.JUDGE_WORKER_MAX_MEMORY_MB
+        # Limits applied to user code: per test case, per submission, and address space per worker
+        self.test_time_limit = test_time_limit or settings.JUDGE_TEST_TIME_LIMIT
+        self.total_time_limit = total_time_limit or settings.MAX_EXECUTION_TIME
+        self.job_memory_mb = job_memory_mb or settings.MAX_MEMORY_MB
+        # Workers as fork-server templates: each job runs in a fresh child of its worker
+        self.fork_per_job = settings.JUDGE_FORK_PER_JOB if fork_per_job is None else fork_per_job
+        self._ctx = _get_context()
+        self.scheduler = FairScheduler(settings.JUDGE_PRIORITY_WEIGHTS)
+        self._closed = False
+        self.recycled = 0
+        self._ns_per_operation: Optional[float] = None
+        for _ in range(self.size):
+            self.scheduler.add(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.job_memory_mb, self.fork_per_job)
+
+    def run_tests(self, code: str, test_cases: List[Dict], fresh_instance: bool = False,
+                  priority: str = "run", user: Optional[str] = None) -> List[tuple]:
+        """
+        Run code against test cases on a worker.
+        The code is loaded once per job; fresh_instance forces a new Solution() per case.
+        Returns one (passed, actual, error) tuple per test case.
+        """
+        return self.judge(code, test_cases, fresh_instance, priority=priority, user=user).results
+
+    def judge(self, code: str, test_cases: List[Dict], fresh_instance: bool = False,
+              measure_from: Optional[int] = None, warmup: int = 0, repeat: int = 1,
+              fail_fast_from: Optional[int] = None, meter: bool = False,
+              on_case: Optional[Callable[[int, tuple], None]] = None,
+              cancelled: Optional[threading.Event] = None,
+              priority: str = "submit", user: Optional[str] = None) -> JudgeReport:
+        """
+        Run code against test cases on a worker, measuring runtime and memory
+        of cases from index measure_from onwards when all pass (None = no measurement).
+        fail_fast_from stops judging at that index or later after the first failure.
+        meter adds a deterministic operation count to the measurement, and
+        cost_ms, that count converted at the pool's calibrated rate.
+        on_case(index, (passed, actual, error)) is called as each case finishes;
+        setting `cancelled` stops the run before its next case.
+        priority and user place the job in the scheduler's queues.
+        test_cases may be a PackedCases, whose suite is shipped to each worker once.
+        """
+        plain_cases, suite = job_cases(test_cases)
+        job = {
+            "kind": "tests",
+            "code": code,
+            "test_cases": plain_cases,
+            "suite": suite,
+            "fresh_instance": fresh_instance,
+            "test_time_limit": self.test_time_limit,
+            "total_time_limit": self.total_time_limit,
+            "measure_from": measure_from,
+            "warmup": warmup,
+            "repeat": repeat,
+            "fail_fast_from": fail_fast_from,
+            "meter": meter,
+            "stream": on_case is not None or cancelled is not None,
+        }
+
+        def on_event(event):
+            if on_case is not None and event["event"] == "case":
+                on_case(event["index"], event["result"])
+
+        def failed(error):
+            return JudgeReport(results=[(False, None, error)] * len(test_cases), metrics=[None] * len(test_cases))
+
+        try:
+            reply = self._dispatch(job, timeout=self.total_time_limit + KILL_GRACE_SECONDS,
+                                   priority=priority, user=user, on_event=on_event, cancelled=cancelled)
+        except WorkerTimeout:
+            return failed(runner.TIME_LIMIT_EXCEEDED)
+        except WorkerCrashed:
+            return failed(runner.ABNORMAL_EXIT)
+
+        if not reply.get("ok"):
+            return failed(reply.get("error"))
+        report = reply["report"]
+        if report.operations is not None:
+            report.cost_ms = report.operations * self.ns_per_operation() / 1e6
+        return report
+
+    def ns_per_operation(self) -> float:
+        """
+        Conversion rate from operations to milliseconds. Taken from settings
+        when pinned there, otherwise calibrated once on a worker and kept for
+        the life of the pool so equal counts always map to equal costs.
+        """
+        if self._ns_per_operation is None:
+            rate = settings.JUDGE_METER_NS_PER_OP
+            if not rate:
+                try:
+                    reply = self._dispatch({"kind": "calibrate"}, timeout=self.total_time_limit)
+                    rate = reply.get("ns_per_operation") if reply.get("ok") else None
+                except (WorkerTimeout, WorkerCrashed):
+                    rate = None
+            if not rate:
+                # Don't cache a failed calibration
+                return DEFAULT_NS_PER_OPERATION
+            self._ns_per_operation = rate
+        return self._ns_per_operation
+
+    def profile(self, code: str, problem_id: str, budget_s: Optional[float] = None,
+                priority: str = "submit", user: Optional[str] = None) -> List[tuple]:
+        """
+        Time accepted code on generated inputs of growing size within budget_s.
+        Returns (size, seconds) samples, empty when the problem has no generator.
+        """
+        budget_s = budget_s or settings.JUDGE_PROFILE_BUDGET
+        job = {"kind": "profile", "code": code, "problem_id": problem_id, "budget": budget_s}
+        try:
+            # Input generation runs outside the user-code timers, hence the doubled budget
+            reply = self._dispatch(job, timeout=2 * budget_s + KILL_GRACE_SECONDS, priority=priority, user=user)
+        except (WorkerTimeout, WorkerCrashed):
+            return []
+        return reply.get("samples", []) if reply.get("ok") else []
+
+    def _dispatch(self, job: Dict[str, Any], timeout: Optional[float] = None, priority: str = "submit",
+                  user: Optional[str] = None, **stream) -> Dict[str, Any]:
+        if self._closed:
+            raise RuntimeError("Judge pool is shut down")
+
+        worker = self.scheduler.acquire(priority, user)
+        try:
+            try:
+                reply = worker.request(job, timeout, **stream)
+            except (WorkerCrashed, WorkerTimeout) as e:
+                self._replace(worker, force=isinstance(e, WorkerTimeout))
+                raise
+
+            if (self._closed or worker.needs_recycle or worker.jobs_done >= self.max_jobs_per_worker
+                    or worker.rss_mb > self.max_memory_mb):
+                self._replace(worker)
+            else:
+                self.scheduler.add(worker)
+            return reply
+        finally:
+            self.scheduler.done(priority)
+
+    def _replace(self, worker: _Worker, force: bool = False):
+        worker.stop(force)
+        self.recycled += 1
+        if not self._closed:
+            self.scheduler.add(self._spawn())
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, in-flight jobs and wait times per priority class"""
+        return {"size": self.size, "recycled": self.recycled, "classes": self.scheduler.metrics()}
+
+    def shutdown(self):
+        self._closed = True
+        for worker in self.scheduler.drain_idle():
+            worker.stop()
+
+
+_pool: Optional[JudgePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_judge_pool() -> JudgePool:
+    """
+    Return the process-wide judge pool, forking it on first use.
+    In queue mode this is a RemoteJudgePool and nothing is forked here.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if settings.JUDGE_MODE == "queue":
+                from judge.remote import RemoteJudgePool
+                _pool = RemoteJudgePool()
+            else:
+                _pool = JudgePool()
+        return _pool
+
+
+def shutdown_judge_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,69 @@
+"""
+Judge Profiler
+Times an accepted solution on generated inputs of geometrically increasing
+size, inside a judge worker and within a fixed time budget. The samples feed
+analyzers.empirical_complexity.
+"""
+import io
+import random
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from judge.limits import TimeLimitExceeded, time_limit
+from test_cases.generators import get_input_generator
+
+Sample = Tuple[int, float]  # (input size, best wall time in seconds)
+
+
+def profile_solution(solution, problem_id: str, budget_s: float, start_size: int = 64,
+                     growth: int = 2, max_size: int = 2 ** 18, repeat: int = 3,
+                     seed: int = 0) -> List[Sample]:
+    """
+    Best-of-`repeat` timings of a loaded solution at sizes start_size * growth^k.
+    Stops at max_size, on the first error, or when the next size would not fit
+    into what is left of budget_s.
+    """
+    generator = get_input_generator(problem_id)
+    if generator is None:
+        return []
+
+    samples: List[Sample] = []
+    deadline = time.monotonic() + budget_s
+    n = start_size
+
+    old_stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        while n <= max_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+
+            best: Optional[int] = None
+            try:
+                with time_limit(remaining):
+                    for _ in range(repeat):
+                        # Same seed per size: every repeat sees the same fresh input
+                        test_input = generator(n, random.Random(seed + n))
+                        user_function = solution.entry_point()
+                        start = time.perf_counter_ns()
+                        user_function(**test_input)
+                        elapsed = time.perf_counter_ns() - start
+                        best = elapsed if best is None else min(best, elapsed)
+            except (TimeLimitExceeded, MemoryError, RecursionError):
+                break
+            except Exception:
+                # Generated inputs are valid; a crash here is the solution's and not ours to judge
+                break
+
+            samples.append((n, best / 1e9))
+
+            # The next size costs at least `growth` times more; stop if it cannot fit
+            if best / 1e9 * repeat * growth > deadline - time.monotonic():
+                break
+            n *= growth
+    finally:
+        sys.stdout = old_stdout
+
+    return samples
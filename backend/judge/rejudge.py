@@ -0,0 +1,221 @@
+"""
+Bulk Re-judge
+Re-checks stored submissions of a problem against its current test suite,
+e.g. after a hidden case was added. Rows are streamed in keyset-paginated
+chunks (never loaded all at once), judged in parallel on the judge pool and
+written back one transaction per chunk. A checkpoint file written after each
+commit lets an interrupted run resume where it stopped.
+Only a deterministic failure (wrong answer, runtime error) changes a row's
+verdict: a timeout or crashed worker may be host load, so it is retried at
+submit priority and, if still inconclusive, leaves the row as it was.
+"""
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Optional, Sequence
+
+from analyzers.complexity_analyzer import ComplexityAnalyzer, score_time_complexity
+from judge import runner
+from judge.limits import TIME_LIMIT_EXCEEDED
+from judge.pool import JudgePool, get_judge_pool
+from judge.result_cache import ResultCache, suite_version
+from models.submission import Submission
+from test_cases.registry import test_suites
+
+# Failures a slow or overloaded judge host can cause on its own
+INCONCLUSIVE_ERRORS = (TIME_LIMIT_EXCEEDED, runner.ABNORMAL_EXIT)
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "rejudge")
+
+
+def checkpoint_path_for(problem_id: str) -> str:
+    """Default checkpoint file of a problem's re-judge run"""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    slug = re.sub(r"[^a-z0-9]+", "-", problem_id.lower()).strip("-")
+    return os.path.join(CHECKPOINT_DIR, f"{slug}.json")
+
+
+def scored_suite(problem_id: str) -> Sequence[Dict]:
+    """Visible cases of the problem followed by its hidden cases, packed once by the suite registry"""
+    suite = test_suites.get(problem_id)
+    return suite.packed if suite else []
+
+
+def verdict_of(results: Sequence[tuple], suite: Sequence[Dict]) -> Optional[bool]:
+    """True when every case passes, False on a deterministic failure, None when only a timeout or crash failed it"""
+    if len(results) == len(suite) and all(r[0] for r in results):
+        return True
+    if any(not passed and error not in INCONCLUSIVE_ERRORS for passed, _, error in results):
+        return False
+    return None
+
+
+@dataclass
+class RejudgeProgress:
+    problem_id: str
+    suite: str  # suite_version() the run was started with
+    last_id: int = 0  # highest submission id already committed
+    processed: int = 0
+    changed: int = 0
+    accepted: int = 0
+    failed: int = 0
+    inconclusive: int = 0  # rows left unchanged because only timeouts or crashes failed them
+    elapsed_s: float = 0.0
+    done: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.processed / self.elapsed_s if self.elapsed_s else 0.0
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["rows_per_second"] = round(self.rows_per_second, 1)
+        return data
+
+
+class RejudgeJob:
+    """
+    Re-judge every submission of one problem.
+        job = RejudgeJob("Two Sum", checkpoint_path="rejudge-two-sum.json")
+        progress = job.run(SessionLocal, on_progress=print)
+    """
+
+    def __init__(self, problem_id: str, chunk_size: int = 500, checkpoint_path: Optional[str] = None,
+                 pool: Optional[JudgePool] = None, workers: Optional[int] = None):
+        self.problem_id = problem_id
+        self.chunk_size = chunk_size
+        self.checkpoint_path = checkpoint_path
+        self.pool = pool or get_judge_pool()
+        self.workers = workers or self.pool.size
+        # Resubmissions of the same code are common; judge each distinct program once
+        self._verdicts = ResultCache(max_size=10000)
+        self._analyzer = ComplexityAnalyzer()
+
+    def run(self, session_factory: Callable, on_progress: Optional[Callable[[RejudgeProgress], None]] = None,
+            restart: bool = False) -> RejudgeProgress:
+        db = session_factory()
+        try:
+            suite = scored_suite(self.problem_id)
+            progress = None if restart else self._load_checkpoint(suite_version(suite))
+            if progress is None:
+                progress = RejudgeProgress(problem_id=self.problem_id, suite=suite_version(suite))
+            started = time.monotonic() - progress.elapsed_s
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                while True:
+                    rows = self._next_chunk(db, progress.last_id)
+                    if not rows:
+                        break
+                    self._apply(db, rows, self._judge_chunk(executor, rows, suite), progress)
+                    progress.last_id = rows[-1].id
+                    progress.elapsed_s = time.monotonic() - started
+                    self._save_checkpoint(progress)
+                    if on_progress:
+                        on_progress(progress)
+
+            progress.done = True
+            self._save_checkpoint(progress)
+            return progress
+        finally:
+            db.close()
+
+    def _next_chunk(self, db, after_id: int) -> list:
+        # Keyset pagination: an indexed range scan per chunk, however deep into the table we are
+        return (
+            db.query(Submission.id, Submission.code, Submission.status, Submission.points)
+            .filter(Submission.problem_id == self.problem_id, Submission.id > after_id)
+            .order_by(Submission.id)
+            .limit(self.chunk_size)
+            .all()
+        )
+
+    def _judge_chunk(self, executor, rows: list, suite: Sequence[Dict]) -> Dict[str, Optional[bool]]:
+        """Verdict per distinct code in the chunk (see verdict_of)"""
+        pending = {}
+        for row in rows:
+            code = row.code or ""
+            if code in pending:
+                continue
+            key = self._verdicts.key(self.problem_id, suite, code)
+            if self._verdicts.get(key) is None:
+                # Background priority: live traffic gets the workers first
+                pending[code] = (key, executor.submit(self._verdict, code, suite, "rejudge"))
+            else:
+                pending[code] = (key, None)
+
+        retries = {}
+        verdicts = {}
+        for code, (key, future) in pending.items():
+            verdicts[code] = self._verdicts.get(key) if future is None else future.result()
+            if verdicts[code] is None:
+                # Timed out or crashed while queued behind live traffic: try once more at submit priority
+                retries[code] = executor.submit(self._verdict, code, suite, "submit")
+        for code, future in retries.items():
+            verdicts[code] = future.result()
+
+        for code, (key, future) in pending.items():
+            # An inconclusive verdict is not cached, so the next run judges the code again
+            if future is not None and verdicts[code] is not None:
+                self._verdicts.set(key, verdicts[code])
+        return verdicts
+
+    def _verdict(self, code: str, suite: Sequence[Dict], priority: str) -> Optional[bool]:
+        # Only the verdict matters here: stop at the first failing case, skip measurement
+        return verdict_of(self.pool.judge(code, suite, fail_fast_from=0, priority=priority).results, suite)
+
+    def _points(self, code: str, row) -> int:
+        if row.status == "accepted":
+            return row.points
+        # Newly accepted: score it the way submit-code would from the static analysis
+        try:
+            time = self._analyzer.analyze(code).time
+        except Exception as e:
+            # One unanalyzable submission must not stop the whole run; it scores as unknown complexity
+            print(f"[Rejudge] Analysis failed, scoring as unknown: {e}", flush=True)
+            time = None
+        tier, points, is_optimal = score_time_complexity(time)
+        return points
+
+    def _apply(self, db, rows: list, verdicts: Dict[str, Optional[bool]], progress: RejudgeProgress):
+        updates = []
+        for row in rows:
+            accepted = verdicts[row.code or ""]
+            if accepted is None:
+                # Not enough evidence to overturn the stored verdict either way
+                progress.inconclusive += 1
+                continue
+            status = "accepted" if accepted else "failed"
+            points = self._points(row.code or "", row) if accepted else 0
+            if status != row.status or points != row.points:
+                updates.append({"id": row.id, "status": status, "points": points})
+            progress.accepted += accepted
+            progress.failed += not accepted
+        progress.processed += len(rows)
+        progress.changed += len(updates)
+        if updates:
+            # One transaction per chunk, written without loading ORM objects
+            db.bulk_update_mappings(Submission, updates)
+            db.commit()
+
+    def _load_checkpoint(self, suite: str) -> Optional[RejudgeProgress]:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            data = json.load(f)
+        data.pop("rows_per_second", None)
+        progress = RejudgeProgress(**data)
+        # A finished run, another problem or a changed suite means starting over
+        if progress.done or progress.problem_id != self.problem_id or progress.suite != suite:
+            return None
+        return progress
+
+    def _save_checkpoint(self, progress: RejudgeProgress):
+        if not self.checkpoint_path:
+            return
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(progress.to_dict(), f)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,215 @@
+"""
+Distributed Judging
+In queue mode (JUDGE_MODE=queue) the API forks no judge workers. RemoteJudgePool
+has the same interface as JudgePool but puts each job on the shared job queue
+and waits for its result; standalone judge-worker processes
+(scripts/judge_worker.py), on this machine or others, run a QueueWorker that
+leases jobs and executes them on their own local JudgePool.
+"""
+import os
+import socket
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from config.settings import settings
+from judge import runner
+from judge.job_queue import JobFailed, SQLiteJobQueue
+from judge.measure import JudgeReport
+from judge.pool import DEFAULT_NS_PER_OPERATION
+from judge.scheduler import PRIORITY_CLASSES
+
+# Pool methods a queued job may call on the worker side
+REMOTE_METHODS = ("judge", "profile", "ns_per_operation")
+# Idle backoff bounds while the queue is empty
+IDLE_MIN_SECONDS = 0.02
+IDLE_MAX_SECONDS = 0.5
+# Queued jobs older than this were given up on by their caller
+STALE_JOB_SECONDS = 3600.0
+
+
+def get_job_queue() -> SQLiteJobQueue:
+    return SQLiteJobQueue(settings.JUDGE_QUEUE_PATH, max_attempts=settings.JUDGE_JOB_MAX_ATTEMPTS)
+
+
+class RemoteJudgePool:
+    """JudgePool stand-in that hands every job to the judge-worker fleet"""
+
+    def __init__(self, queue: Optional[SQLiteJobQueue] = None, timeout: Optional[float] = None):
+        self.queue = queue or get_job_queue()
+        # How long a caller waits for a worker to pick up and finish its job
+        self.timeout = timeout or settings.JUDGE_QUEUE_TIMEOUT
+        # Used by callers that size their own concurrency after the pool
+        self.size = settings.JUDGE_POOL_SIZE
+        self._ns_per_operation: Optional[float] = None
+
+    def _call(self, method: str, kwargs: Dict[str, Any], priority: str = "submit") -> Any:
+        job_id = self.queue.enqueue({"method": method, "kwargs": kwargs}, PRIORITY_CLASSES.index(priority))
+        try:
+            return self.queue.wait(job_id, self.timeout)
+        except TimeoutError:
+            self.queue.cancel(job_id)
+            raise
+
+    def run_tests(self, code: str, test_cases: List[Dict], fresh_instance: bool = False,
+                  priority: str = "run", user: Optional[str] = None) -> List[tuple]:
+        return self.judge(code, test_cases, fresh_instance, priority=priority, user=user).results
+
+    def judge(self, code: str, test_cases: List[Dict], fresh_instance: bool = False,
+              measure_from: Optional[int] = None, warmup: int = 0, repeat: int = 1,
+              fail_fast_from: Optional[int] = None, meter: bool = False,
+              on_case: Optional[Callable[[int, tuple], None]] = None,
+              cancelled: Optional[threading.Event] = None,
+              priority: str = "submit", user: Optional[str] = None) -> JudgeReport:
+        """
+        JudgePool.judge on a remote worker. Case results are not streamed
+        across the queue: on_case sees them all once the report arrives, and
+        `cancelled` only prevents a job from being queued in the first place.
+        """
+        def failed(error):
+            return JudgeReport(results=[(False, None, error)] * len(test_cases), metrics=[None] * len(test_cases))
+
+        if cancelled is not None and cancelled.is_set():
+            return JudgeReport(results=[], metrics=[], cancelled=True)
+        kwargs = {
+            "code": code,
+            # A PackedCases pickles down to its blob, so the suite crosses the queue pre-serialized
+            "test_cases": test_cases,
+            "fresh_instance": fresh_instance,
+            "measure_from": measure_from,
+            "warmup": warmup,
+            "repeat": repeat,
+            "fail_fast_from": fail_fast_from,
+            "meter": meter,
+            "priority": priority,
+            "user": user,
+        }
+        try:
+            report = self._call("judge", kwargs, priority)
+        except TimeoutError:
+            return failed("Runtime Error: execution did not finish, no judge worker answered in time")
+        except JobFailed:
+            return failed(runner.ABNORMAL_EXIT)
+
+        if report.operations is not None:
+            # Convert at this pool's rate, not the worker's, so every node scores alike
+            report.cost_ms = report.operations * self.ns_per_operation() / 1e6
+        if on_case is not None:
+            for i, result in enumerate(report.results):
+                on_case(i, result)
+        return report
+
+    def ns_per_operation(self) -> float:
+        """Pinned rate from settings, otherwise calibrated once by one of the workers"""
+        if self._ns_per_operation is None:
+            rate = settings.JUDGE_METER_NS_PER_OP
+            if not rate:
+                try:
+                    rate = self._call("ns_per_operation", {})
+                except (TimeoutError, JobFailed):
+                    rate = None
+            if not rate:
+                return DEFAULT_NS_PER_OPERATION
+            self._ns_per_operation = rate
+        return self._ns_per_operation
+
+    def profile(self, code: str, problem_id: str, budget_s: Optional[float] = None,
+                priority: str = "submit", user: Optional[str] = None) -> List[tuple]:
+        kwargs = {"code": code, "problem_id": problem_id, "budget_s": budget_s, "priority": priority, "user": user}
+        try:
+            return self._call("profile", kwargs, priority)
+        except (TimeoutError, JobFailed):
+            return []
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth per job status and the workers that sent a recent heartbeat"""
+        return {
+            "mode": "queue",
+            "queue": self.queue.depth(),
+            "workers": self.queue.workers(alive_within=3 * settings.JUDGE_HEARTBEAT_SECONDS),
+        }
+
+    def shutdown(self):
+        # Nothing to reap; the workers belong to their own processes
+        pass
+
+
+class QueueWorker:
+    """
+    Consumer side of the job queue: `concurrency` threads lease jobs and run
+    them on a local pool, while the main thread records heartbeats and keeps
+    the leases of running jobs alive.
+    """
+
+    def __init__(self, queue: SQLiteJobQueue, pool, concurrency: Optional[int] = None,
+                 lease_seconds: Optional[float] = None, heartbeat_seconds: Optional[float] = None,
+                 worker_id: Optional[str] = None):
+        self.queue = queue
+        self.pool = pool
+        self.concurrency = concurrency or pool.size
+        self.lease_seconds = lease_seconds or settings.JUDGE_LEASE_SECONDS
+        self.heartbeat_seconds = heartbeat_seconds or settings.JUDGE_HEARTBEAT_SECONDS
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.jobs_done = 0
+        self.stopping = threading.Event()
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def run(self):
+        """Consume jobs until stop() is called; jobs already leased are finished first"""
+        consumers = [
+            threading.Thread(target=self._consume, name=f"judge-consumer-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in consumers:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in consumers):
+                self._beat()
+                if not self.stopping.wait(self.heartbeat_seconds):
+                    continue
+                for thread in consumers:
+                    thread.join(self.heartbeat_seconds)
+                    self._beat()
+        finally:
+            self.queue.retire(self.worker_id)
+
+    def stop(self):
+        self.stopping.set()
+
+    def _beat(self):
+        with self._lock:
+            active = list(self._active)
+        self.queue.extend(active, self.worker_id, self.lease_seconds)
+        self.queue.heartbeat(self.worker_id, socket.gethostname(), os.getpid(), self.concurrency, self.jobs_done)
+        self.queue.purge(STALE_JOB_SECONDS)
+
+    def _consume(self):
+        idle = IDLE_MIN_SECONDS
+        while not self.stopping.is_set():
+            leased = self.queue.lease(self.worker_id, self.lease_seconds)
+            if leased is None:
+                self.stopping.wait(idle)
+                idle = min(idle * 2, IDLE_MAX_SECONDS)
+                continue
+            idle = IDLE_MIN_SECONDS
+            job_id, payload = leased
+            with self._lock:
+                self._active.add(job_id)
+            try:
+                result = self._execute(payload)
+            except Exception as e:
+                # Leave the job leased: it is retried after the lease expires, up to the attempt limit
+                print(f"[JudgeWorker] Job {job_id} failed: {e}", flush=True)
+                continue
+            finally:
+                with self._lock:
+                    self._active.discard(job_id)
+            self.queue.complete(job_id, self.worker_id, result)
+            self.jobs_done += 1
+
+    def _execute(self, payload: Dict[str, Any]) -> Any:
+        method = payload.get("method")
+        if method not in REMOTE_METHODS:
+            raise ValueError(f"Unknown judge job method: {method}")
+        return getattr(self.pool, method)(**payload.get("kwargs", {}))
@@ -0,0 +1,106 @@
+"""
+Submission Result Cache
+Skips re-judging code that has already been judged against the same suite.
+Keys are (problem id, test-suite version, hash of the normalized AST), so
+whitespace, comment and docstring edits hit the cache while any change to
+the test data produces a new suite version and misses.
+"""
+import ast
+import hashlib
+import json
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from judge.inputs import PackedCases
+from judge.limits import TIME_LIMIT_EXCEEDED
+
+CacheKey = Tuple[str, str, str]
+
+
+def _strip_docstrings(tree: ast.AST) -> ast.AST:
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            body = node.body
+            if (body and isinstance(body[0], ast.Expr)
+                    and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str)):
+                node.body = body[1:] or [ast.Pass()]
+    return tree
+
+
+def code_fingerprint(code: str) -> str:
+    """Hash of the code's AST without docstrings; falls back to the raw text if it does not parse"""
+    try:
+        normalized = ast.dump(_strip_docstrings(ast.parse(code)), include_attributes=False)
+    except (SyntaxError, ValueError):
+        normalized = "raw:" + code
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def suite_version(test_cases: List[Dict]) -> str:
+    """Stable hash of a test suite's inputs and expected outputs"""
+    if isinstance(test_cases, PackedCases):
+        # The packed part already has a version; only the plain prefix needs hashing
+        if not test_cases.prefix:
+            return test_cases.version
+        combined = suite_version(test_cases.prefix) + test_cases.version
+        return hashlib.sha256(combined.encode("utf-8")).hexdigest()[:16]
+    payload = json.dumps(test_cases, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def is_cacheable(results: List[tuple]) -> bool:
+    """Verdicts that depend on host load (timeouts, crashed workers) are not worth remembering"""
+    for _, _, error in results:
+        if error and (error.startswith(TIME_LIMIT_EXCEEDED) or error.startswith("Runtime Error: execution")):
+            return False
+    return True
+
+
+class ResultCache:
+    """Bounded LRU of judged submissions"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[CacheKey, Any]" = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, problem_id: str, test_cases: List[Dict], code: str, mode: str = "") -> CacheKey:
+        return (problem_id, suite_version(test_cases) + mode, code_fingerprint(code))
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        with self.lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: CacheKey, value: Any):
+        with self.lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_problem(self, problem_id: str):
+        """Drop every entry of a problem, e.g. after its hidden tests were edited"""
+        with self.lock:
+            for key in [k for k in self._entries if k[0] == problem_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self.lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Global Cache Instance
+submission_cache = ResultCache(max_size=settings.JUDGE_RESULT_CACHE_SIZE)
@@ -0,0 +1,463 @@
+"""
+Judge Runner
+Executes user code inside a judge worker process
+"""
+import gc
+import io
+import multiprocessing
+import os
+import pickle
+import signal
+import sys
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+from judge.limits import (
+    TimeLimitExceeded, TIME_LIMIT_EXCEEDED, MEMORY_LIMIT_EXCEEDED,
+    time_limit, cpu_budget, set_memory_limit, lock_down
+)
+from judge.checkers import case_passes
+from judge.inputs import fresh_input, pack_case, unpack_blob
+from judge import test_packs
+# Importing the namespace template also pre-warms the modules submissions use most
+from judge.namespace import solution_namespace, user_defined
+from judge.measure import JudgeReport, measure_case, current_rss_mb
+from judge.metering import metered_call, calibrate_ns_per_operation
+from judge.profiler import profile_solution
+
+
+# Error reported for a job whose process died without replying
+ABNORMAL_EXIT = "Runtime Error: execution terminated abnormally"
+
+
+class SubmissionError(Exception):
+    """Raised when the submission does not expose anything we can call"""
+    pass
+
+
+class LoadedSolution:
+    """
+    A submission compiled and executed once, with its entry point resolved.
+    Every test case is then driven through the same loaded callable.
+    """
+
+    def __init__(self, code: str):
+        # Copy of the pre-built template namespace, then define the user's function/class
+        self.namespace = solution_namespace()
+        exec(compile(code, "<solution>", "exec"), self.namespace)
+
+        self.solution_cls = None
+        self.method_name = None
+        self.function = None
+        self._instance_entry = None
+        # (cpu_ns, wall_ns) of the most recent run_case call
+        self.last_sample = (0, 0)
+
+        # Check for Solution class (LeetCode style)
+        if 'Solution' in self.namespace and isinstance(self.namespace['Solution'], type):
+            self.solution_cls = self.namespace['Solution']
+            instance = self.solution_cls()
+
+            # Find the method to call (first non-underscore method)
+            for name in dir(instance):
+                if not name.startswith('__') and callable(getattr(instance, name)):
+                    self.method_name = name
+                    break
+
+            if not self.method_name:
+                raise SubmissionError("No method found in Solution class")
+
+            self._instance_entry = getattr(instance, self.method_name)
+            # A Solution with its own __init__ keeps state on self, so it gets a fresh instance per case
+            self.stateful = '__init__' in vars(self.solution_cls)
+        else:
+            # Fallback: Find the first standalone function
+            for name, obj in user_defined(self.namespace).items():
+                if callable(obj):
+                    self.function = obj
+                    break
+
+            if self.function is None:
+                raise SubmissionError("No function found in code")
+            self.stateful = False
+
+    def entry_point(self, fresh_instance: bool = False):
+        """Return the callable for one test case"""
+        if self.solution_cls is None:
+            return self.function
+        if fresh_instance or self.stateful:
+            return getattr(self.solution_cls(), self.method_name)
+        return self._instance_entry
+
+    def run_case(self, test_case: Dict, fresh_instance: bool = False,
+                 time_limit_s: Optional[float] = None) -> tuple:
+        """
+        Execute a single test case against the loaded solution
+        Returns: (passed, actual_output, error)
+        """
+        try:
+            with time_limit(time_limit_s):
+                user_function = self.entry_point(fresh_instance)
+
+                # Call function with unpacked arguments, on a private copy of the input
+                input_data = fresh_input(test_case)
+                wall_start = time.perf_counter_ns()
+                cpu_start = time.thread_time_ns()
+                if isinstance(input_data, dict):
+                    actual_output = user_function(**input_data)
+                else:
+                    actual_output = user_function(input_data)
+                self.last_sample = (time.thread_time_ns() - cpu_start, time.perf_counter_ns() - wall_start)
+
+            passed = case_passes(test_case, actual_output, lambda: fresh_input(test_case))
+            return passed, actual_output, None
+        except TimeLimitExceeded:
+            return False, None, TIME_LIMIT_EXCEEDED
+        except MemoryError:
+            return False, None, MEMORY_LIMIT_EXCEEDED
+        except Exception as e:
+            return False, None, f"{type(e).__name__}: {str(e)}"
+
+
+def judge_suite(code: str, test_cases: List[Dict], fresh_instance: bool = False,
+                test_time_limit: Optional[float] = None, total_time_limit: Optional[float] = None,
+                measure_from: Optional[int] = None, warmup: int = 0, repeat: int = 1,
+                fail_fast_from: Optional[int] = None, meter: bool = False,
+                on_case: Optional[Callable[[int, tuple], bool]] = None) -> JudgeReport:
+    """
+    Compile and load the code once, then run it against every test case.
+    Each case gets at most test_time_limit seconds (wall and CPU), the whole
+    submission at most total_time_limit; cases past the budget are reported
+    as Time Limit Exceeded without running.
+    If every case passes, cases from index measure_from onwards are also
+    measured (best CPU time of `repeat` runs after `warmup` runs, plus peak memory)
+    and, with meter set, also counted with the deterministic operation meter.
+    With fail_fast_from set, judging stops before any case at or past that
+    index once something has failed; results then cover only the cases run.
+    on_case(index, result) is called after every case; returning False
+    cancels the rest of the run.
+    Every run of a case sees a pristine copy of its input (see judge.inputs).
+    """
+    test_cases = [pack_case(case) for case in test_cases]
+    deadline = time.monotonic() + total_time_limit if total_time_limit else None
+
+    def case_budget():
+        if deadline is None:
+            return test_time_limit
+        remaining = deadline - time.monotonic()
+        return min(test_time_limit, remaining) if test_time_limit else remaining
+
+    def failed(error):
+        return JudgeReport(results=[(False, None, error)] * len(test_cases), metrics=[None] * len(test_cases))
+
+    baseline_rss_mb = current_rss_mb()
+
+    # Capture stdout
+    old_stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        with cpu_budget(total_time_limit):
+            try:
+                with time_limit(case_budget()):
+                    solution = LoadedSolution(code)
+            except SubmissionError as e:
+                return failed(str(e))
+            except TimeLimitExceeded:
+                return failed(TIME_LIMIT_EXCEEDED)
+            except MemoryError:
+                return failed(MEMORY_LIMIT_EXCEEDED)
+            except Exception as e:
+                return failed(f"{type(e).__name__}: {str(e)}")
+
+            results, samples = [], []
+            cancelled = False
+            for i, test_case in enumerate(test_cases):
+                # Fail fast: once past fail_fast_from, any failure so far decides the verdict
+                if fail_fast_from is not None and i >= fail_fast_from and not all(r[0] for r in results):
+                    break
+
+                budget = case_budget()
+                if budget is not None and budget <= 0:
+                    results.append((False, None, TIME_LIMIT_EXCEEDED))
+                    samples.append(None)
+                else:
+                    results.append(solution.run_case(test_case, fresh_instance, budget))
+                    samples.append(solution.last_sample)
+
+                if on_case is not None and on_case(i, results[-1]) is False:
+                    cancelled = True
+                    break
+
+            report = JudgeReport(results=results, metrics=[None] * len(results), cancelled=cancelled)
+
+            # Runtime and memory only matter for accepted code, so rejected runs skip the extra work
+            accepted = len(results) == len(test_cases) and all(r[0] for r in results)
+            if measure_from is not None and accepted:
+                for i in range(measure_from, len(test_cases)):
+                    report.metrics[i] = measure_case(solution, test_cases[i], fresh_instance, samples[i],
+                                                     warmup, repeat, case_budget())
+                measured = [m for m in report.metrics if m is not None]
+                if measured:
+                    report.runtime_ms = sum(m.cpu_ms for m in measured)
+                    report.memory_mb = baseline_rss_mb + max(m.peak_memory_kb for m in measured) / 1024
+                    if meter:
+                        report.operations = meter_cases(solution, test_cases, report.metrics,
+                                                        fresh_instance, case_budget)
+            return report
+    except TimeLimitExceeded:
+        # The process-wide CPU budget fired between cases
+        return failed(TIME_LIMIT_EXCEEDED)
+    finally:
+        # Restore stdout
+        sys.stdout = old_stdout
+
+
+def meter_cases(solution, test_cases: List[Dict], metrics: list, fresh_instance: bool,
+                case_budget) -> Optional[int]:
+    """
+    One metered run per measured case, after all timing is done so tracing
+    never slows the timed runs. Returns the total count, or None if any case
+    could not be metered within its budget (a partial total would under-score).
+    """
+    total = 0
+    for test_case, metrics_i in zip(test_cases, metrics):
+        if metrics_i is None:
+            continue
+        budget = case_budget()
+        if budget is not None and budget <= 0:
+            return None
+        try:
+            with time_limit(budget):
+                metrics_i.operations = metered_call(solution, test_case, fresh_instance)
+        except (TimeLimitExceeded, Exception):
+            return None
+        total += metrics_i.operations
+    return total
+
+
+def run_tests(code: str, test_cases: List[Dict], fresh_instance: bool = False,
+              test_time_limit: Optional[float] = None, total_time_limit: Optional[float] = None) -> List[tuple]:
+    """Judge without measurement. Returns one (passed, actual, error) tuple per case."""
+    return judge_suite(code, test_cases, fresh_instance, test_time_limit, total_time_limit).results
+
+
+def profile_code(code: str, problem_id: str, budget_s: float) -> list:
+    """Load the code and time it on generated inputs of growing size, [] if that is not possible"""
+    old_stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        with time_limit(budget_s):
+            solution = LoadedSolution(code)
+    except (TimeLimitExceeded, Exception):
+        return []
+    finally:
+        sys.stdout = old_stdout
+    return profile_solution(solution, problem_id, budget_s)
+
+
+def _picklable(value):
+    """Results travel back over a pipe, so fall back to repr() for exotic return values"""
+    try:
+        pickle.dumps(value)
+        return value
+    except Exception:
+        return repr(value)
+
+
+def _rss_mb() -> float:
+    """Peak resident set size of this worker in MB (ru_maxrss is KB on Linux)"""
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _streamer(conn):
+    """
+    on_case callback of a streaming job: sends each verdict to the pool as an
+    event and reports whether the pool has asked us to stop since.
+    """
+    def on_case(index: int, result: tuple) -> bool:
+        passed, actual, error = result
+        conn.send({"event": "case", "index": index, "result": (passed, _picklable(actual), error)})
+        while conn.poll():
+            message = conn.recv()
+            if message is None or message.get("kind") == "cancel":
+                return False
+        return True
+    return on_case
+
+
+# Packed suites kept per worker, by version; the pool mirrors this LRU to know what it can omit
+SUITE_CACHE_SIZE = 16
+_suites: "OrderedDict[str, tuple]" = OrderedDict()
+
+
+class MissingSuite(Exception):
+    """A job referred to a suite version this worker no longer has"""
+    pass
+
+
+def job_test_cases(job: Dict) -> List[Dict]:
+    """The job's plain cases followed by its packed suite, decoding and caching a shipped blob"""
+    cases = list(job["test_cases"])
+    suite = job.get("suite")
+    if suite is None:
+        return cases
+    version, blob = suite
+    if blob is not None:
+        _suites[version] = unpack_blob(blob)
+        while len(_suites) > SUITE_CACHE_SIZE:
+            _suites.popitem(last=False)
+    elif version not in _suites:
+        raise MissingSuite(version)
+    _suites.move_to_end(version)
+    return cases + list(_suites[version])
+
+
+def handle_job(job: Dict, conn=None) -> Dict:
+    """Dispatch a single job received from the pool"""
+    kind = job.get("kind")
+    if kind == "tests":
+        report = judge_suite(
+            job["code"], job_test_cases(job), job.get("fresh_instance", False),
+            job.get("test_time_limit"), job.get("total_time_limit"),
+            job.get("measure_from"), job.get("warmup", 0), job.get("repeat", 1),
+            job.get("fail_fast_from"), job.get("meter", False),
+            _streamer(conn) if job.get("stream") and conn is not None else None
+        )
+        report.results = [(passed, _picklable(actual), error) for passed, actual, error in report.results]
+        return {
+            "ok": True,
+            "report": report,
+            # A worker that just ran out of memory may be fragmented; let the pool replace it
+            "recycle": any(error == MEMORY_LIMIT_EXCEEDED for _, _, error in report.results),
+        }
+    if kind == "profile":
+        return {"ok": True, "samples": profile_code(job["code"], job["problem_id"], job["budget"])}
+    if kind == "calibrate":
+        return {"ok": True, "ns_per_operation": calibrate_ns_per_operation()}
+    return {"ok": False, "error": f"Unknown job kind: {kind}"}
+
+
+# Run by every parked child before it waits for its job
+WARMUP_JOB = {
+    "kind": "tests",
+    "code": "class Solution:\n    def solve(self, nums: List[int]) -> int:\n        return sum(nums)\n",
+    "test_cases": [{"input": {"nums": [1, 2, 3]}, "output": 6}],
+    "measure_from": 0,
+}
+
+
+class ParkedChild:
+    """
+    A child forked from this worker ahead of time and parked until it is
+    handed a job, so starting a job costs a pipe write instead of a fork.
+    The worker is the template: user code only ever runs in children, so
+    nothing a submission does to its heap or modules leaks into the next one.
+    """
+
+    def __init__(self, conn):
+        job_reader, self._jobs = multiprocessing.Pipe(duplex=False)
+        self._replies, reply_writer = multiprocessing.Pipe(duplex=False)
+        self.pid = os.fork()
+        if self.pid == 0:
+            self._jobs.close()
+            self._replies.close()
+            try:
+                # Take the copy-on-write page faults of a typical job now, while nobody is waiting
+                handle_job(WARMUP_JOB)
+                job = job_reader.recv()
+                # Single use from here on, so the job's limits can be made permanent
+                lock_down(job.get("total_time_limit") or job.get("budget"))
+                try:
+                    reply = handle_job(job, conn)
+                except Exception as e:
+                    reply = {"ok": False, "error": f"{type(e).__name__}: {str(e)}"}
+                reply_writer.send(reply)
+            except (EOFError, OSError):
+                # Worker shutting down, never got a job
+                pass
+            finally:
+                os._exit(0)
+        job_reader.close()
+        reply_writer.close()
+
+    def run(self, job: Dict) -> Dict:
+        """Hand the job over and wait for the child's reply; the child exits after replying"""
+        try:
+            self._jobs.send(job)
+            reply = self._replies.recv()
+        except (EOFError, OSError):
+            # The child died before replying (os._exit, segfault, killed by a limit)
+            reply = {"ok": False, "error": ABNORMAL_EXIT}
+        # Whatever the job did to its heap goes away with the child
+        reply.pop("recycle", None)
+        return reply
+
+    def close(self):
+        """Reap the child (a parked one exits once its job pipe closes)"""
+        self._jobs.close()
+        self._replies.close()
+        os.waitpid(self.pid, 0)
+
+
+def worker_main(conn, max_memory_mb: Optional[int] = None, fork_per_job: bool = False):
+    """
+    Entry point of a judge worker process.
+    Serves jobs from the pool until it receives None or the pipe closes.
+    With fork_per_job, each job runs in its own child forked from this process
+    ahead of time (see ParkedChild).
+    """
+    # Ctrl+C on the API process should not dump a traceback from every worker
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    set_memory_limit(max_memory_mb)
+    fork_per_job = fork_per_job and hasattr(os, "fork")
+    child = None
+    if fork_per_job:
+        # Lead a process group so the pool can kill a runaway child along with us
+        os.setpgrp()
+        # Everything loaded so far is shared copy-on-write with the children; keep the GC off those pages
+        gc.freeze()
+        child = ParkedChild(conn)
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        if job.get("kind") == "cancel":
+            # Arrived after its job had already finished
+            continue
+
+        try:
+            if child is None:
+                reply = handle_job(job, conn)
+            else:
+                if job.get("kind") == "tests":
+                    # Keep our suite cache and pack mappings current so the children forked from now on inherit them
+                    test_packs.map_packs(job_test_cases(job))
+                reply = child.run(job)
+        except MissingSuite as e:
+            reply = {"ok": False, "missing_suite": str(e)}
+        except Exception as e:
+            reply = {"ok": False, "error": f"{type(e).__name__}: {str(e)}"}
+
+        reply["rss_mb"] = _rss_mb()
+        reply["pid"] = os.getpid()
+        conn.send(reply)
+        if child is not None and "missing_suite" not in reply:
+            # Off the critical path: the reply is already on its way
+            child.close()
+            child = ParkedChild(conn)
+
+    if child is not None:
+        child.close()
+    conn.close()
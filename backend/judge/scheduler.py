@@ -0,0 +1,154 @@
+"""
+Judge Scheduler
+Decides which waiting job gets the next idle judge worker.
+Jobs belong to a priority class (live battle, submit, run, background
+re-judge). Classes share the workers by weighted fair queuing (start-time
+fair queuing over per-class virtual time), so a busy high class gets most of
+the capacity without starving the lower ones. Inside a class, users take
+turns round-robin, so one user spamming Run only delays their own runs.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Hashable, List, Optional
+
+# Highest first; also the tie-break order between classes with equal virtual time
+PRIORITY_CLASSES = ("battle", "submit", "run", "rejudge")
+DEFAULT_WEIGHTS = {"battle": 8.0, "submit": 4.0, "run": 2.0, "rejudge": 1.0}
+
+# Recent waits kept per class for the latency metrics
+WAIT_SAMPLES = 256
+
+
+class _Waiter:
+    __slots__ = ("ready", "worker", "enqueued_at")
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.worker = None
+        self.enqueued_at = time.monotonic()
+
+
+class _ClassStats:
+    def __init__(self):
+        self.dispatched = 0
+        self.in_flight = 0
+        self.waits_ms: Deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def snapshot(self, queued: int) -> Dict[str, Any]:
+        waits = sorted(self.waits_ms)
+        return {
+            "queued": queued,
+            "in_flight": self.in_flight,
+            "dispatched": self.dispatched,
+            "wait_ms_avg": round(sum(waits) / len(waits), 2) if waits else 0.0,
+            "wait_ms_p95": round(waits[int(0.95 * (len(waits) - 1))], 2) if waits else 0.0,
+            "wait_ms_max": round(waits[-1], 2) if waits else 0.0,
+        }
+
+
+class FairScheduler:
+    """
+    Hands idle workers to waiting jobs.
+        worker = scheduler.acquire("run", user_id)   # blocks until it is our turn
+        ...
+        scheduler.done("run")
+        scheduler.add(worker)                        # or a replacement worker
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        weights = dict(weights or DEFAULT_WEIGHTS)
+        self.weights = {cls: float(weights.get(cls, DEFAULT_WEIGHTS[cls])) for cls in PRIORITY_CLASSES}
+        self._lock = threading.Lock()
+        self._idle: Deque[Any] = deque()
+        # class -> user -> waiters; OrderedDict order is the round-robin order of users
+        self._queues: Dict[str, "OrderedDict[Hashable, Deque[_Waiter]]"] = {
+            cls: OrderedDict() for cls in PRIORITY_CLASSES
+        }
+        self._queued = {cls: 0 for cls in PRIORITY_CLASSES}
+        self._finish_tag = {cls: 0.0 for cls in PRIORITY_CLASSES}
+        self._virtual_time = 0.0
+        self._stats = {cls: _ClassStats() for cls in PRIORITY_CLASSES}
+
+    def acquire(self, priority: str = "submit", user: Optional[Hashable] = None):
+        """Block until a worker is assigned to this job and return it"""
+        if priority not in self.weights:
+            raise ValueError(f"Unknown judge priority: {priority}")
+        with self._lock:
+            if self._idle:
+                # Nobody can be waiting while a worker sits idle
+                self._stats[priority].waits_ms.append(0.0)
+                self._start(priority)
+                return self._idle.popleft()
+
+            waiter = _Waiter()
+            if self._queued[priority] == 0:
+                # A class returning from idle doesn't get credit for the time it didn't use
+                self._finish_tag[priority] = max(self._finish_tag[priority], self._virtual_time)
+            self._queues[priority].setdefault(user, deque()).append(waiter)
+            self._queued[priority] += 1
+
+        waiter.ready.wait()
+        return waiter.worker
+
+    def add(self, worker):
+        """A worker became idle (finished a job, or freshly spawned)"""
+        with self._lock:
+            priority = self._next_class()
+            if priority is None:
+                self._idle.append(worker)
+                return
+            waiter = self._pop_waiter(priority)
+            self._stats[priority].waits_ms.append((time.monotonic() - waiter.enqueued_at) * 1000)
+            self._start(priority)
+            waiter.worker = worker
+        waiter.ready.set()
+
+    def done(self, priority: str):
+        """The job that acquired a worker under this class has finished"""
+        with self._lock:
+            self._stats[priority].in_flight -= 1
+
+    def drain_idle(self) -> List[Any]:
+        """Take every idle worker out of the scheduler (shutdown)"""
+        with self._lock:
+            workers = list(self._idle)
+            self._idle.clear()
+            return workers
+
+    def depth(self, priority: Optional[str] = None) -> int:
+        """Jobs waiting for a worker, in one class or overall"""
+        if priority is not None:
+            return self._queued[priority]
+        return sum(self._queued.values())
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {cls: self._stats[cls].snapshot(self._queued[cls]) for cls in PRIORITY_CLASSES}
+
+    def _start(self, priority: str):
+        stats = self._stats[priority]
+        stats.dispatched += 1
+        stats.in_flight += 1
+
+    def _next_class(self) -> Optional[str]:
+        """Backlogged class with the smallest finish tag; ties go to the higher class"""
+        best = None
+        for cls in PRIORITY_CLASSES:
+            if self._queued[cls] and (best is None or self._finish_tag[cls] < self._finish_tag[best]):
+                best = cls
+        return best
+
+    def _pop_waiter(self, priority: str) -> _Waiter:
+        users = self._queues[priority]
+        user, waiters = next(iter(users.items()))
+        waiter = waiters.popleft()
+        # Next turn goes to the next user in line
+        del users[user]
+        if waiters:
+            users[user] = waiters
+        self._queued[priority] -= 1
+
+        self._virtual_time = self._finish_tag[priority]
+        self._finish_tag[priority] += 1.0 / self.weights[priority]
+        return waiter
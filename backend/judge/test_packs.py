@@ -0,0 +1,264 @@
+"""
+Test Packs
+Stress-size inputs (10^6-element arrays) stored as columnar binary data
+under data/packs instead of Python literals or JSON. A pack is a directory
+with a manifest.json describing its cases and a data file holding every
+large argument as a little-endian column. The API only reads manifests;
+judge workers memory-map the data file and build an input when a case
+runs, so all workers share one physical copy through the page cache.
+    data/packs/two-sum-stress/manifest.json
+    data/packs/two-sum-stress/columns-<version>.bin
+"""
+import copy
+import glob
+import hashlib
+import json
+import mmap
+import os
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+PACKS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "packs")
+FORMAT = 1
+_ALIGN = 8
+
+# Column types: list[int] as int64, list[float] as float64, str as UTF-8,
+# list[str] as int64 end offsets followed by UTF-8, rectangular list[list[int]] as int64 with a shape
+_TYPECODES = {"i8": "q", "f8": "d"}
+
+
+class StalePack(LookupError):
+    """A case refers to a pack version that is no longer on disk"""
+    pass
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data) -> list:
+    if sys.byteorder == "little":
+        return data.cast(typecode).tolist()
+    values = array(typecode)
+    values.frombytes(data)
+    values.byteswap()
+    return values.tolist()
+
+
+def encode_column(value: Any) -> Optional[Tuple[Dict, bytes]]:
+    """(column description, bytes) for a value worth storing as a column, else None"""
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return {"type": "str", "count": len(value)}, data
+    if not isinstance(value, list) or not value:
+        return None
+    try:
+        if all(type(v) is int for v in value):
+            return {"type": "i8", "count": len(value)}, _little_endian(array("q", value))
+        if all(type(v) is float for v in value):
+            return {"type": "f8", "count": len(value)}, _little_endian(array("d", value))
+        if all(type(v) is str for v in value):
+            encoded = [v.encode("utf-8") for v in value]
+            ends, total = array("q"), 0
+            for item in encoded:
+                total += len(item)
+                ends.append(total)
+            return {"type": "str[]", "count": len(value)}, _little_endian(ends) + b"".join(encoded)
+        width = len(value[0]) if isinstance(value[0], list) else 0
+        if width and all(isinstance(row, list) and len(row) == width and all(type(v) is int for v in row)
+                         for row in value):
+            flat = array("q", (v for row in value for v in row))
+            return {"type": "i8", "count": len(value), "shape": [len(value), width]}, _little_endian(flat)
+    except OverflowError:
+        # Integers beyond int64 stay inline
+        pass
+    return None
+
+
+def _summary(column: Dict) -> str:
+    if column["type"] == "str":
+        return f"<str of length {column['count']}>"
+    return f"<list of {column['count']} items>"
+
+
+class TestPack:
+    """One pack on disk. Reading the manifest is cheap; the data is mapped on first use."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT:
+            raise ValueError(f"Unsupported test pack format in {directory}")
+        self.name = os.path.basename(directory)
+        self.problem_id: str = manifest["problem"]
+        self.version: str = manifest["version"]
+        self.columns: List[Dict] = manifest["columns"]
+        self.cases: List[Dict] = manifest["cases"]
+        self._data_path = os.path.join(directory, manifest["data"])
+        self._map: Optional[mmap.mmap] = None
+
+    def _data(self) -> memoryview:
+        if self._map is None:
+            with open(self._data_path, "rb") as f:
+                # The mapping stays valid after the file is closed, and after a rebuilt pack replaces it
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)
+
+    def column(self, index: int) -> Any:
+        """Materialize one column as the Python value it was built from"""
+        column = self.columns[index]
+        data = self._data()[column["offset"]:column["offset"] + column["length"]]
+        kind = column["type"]
+        if kind == "str":
+            return str(data, "utf-8")
+        if kind == "str[]":
+            count = column["count"]
+            ends = _from_little_endian("q", data[:8 * count])
+            text, start, items = data[8 * count:], 0, []
+            for end in ends:
+                items.append(str(text[start:end], "utf-8"))
+                start = end
+            return items
+        values = _from_little_endian(_TYPECODES[kind], data)
+        if "shape" in column:
+            width = column["shape"][1]
+            return [values[i:i + width] for i in range(0, len(values), width)]
+        return values
+
+    def case_input(self, index: int) -> Dict[str, Any]:
+        """A fresh input for case `index`; the caller may mutate it"""
+        return {
+            name: self.column(arg["$column"]) if isinstance(arg, dict) and "$column" in arg else copy.deepcopy(arg)
+            for name, arg in self.cases[index]["args"].items()
+        }
+
+    def raw_cases(self) -> List[Dict[str, Any]]:
+        """Registry cases: a summary as the input, and a reference the workers resolve"""
+        raw = []
+        for i, case in enumerate(self.cases):
+            summary = {
+                name: _summary(self.columns[arg["$column"]]) if isinstance(arg, dict) and "$column" in arg else arg
+                for name, arg in case["args"].items()
+            }
+            item = {
+                "input": summary,
+                "output": case["output"],
+                "description": case.get("description", f"{self.name} #{i + 1}"),
+                "pack": [self.name, self.version, i],
+                "generated_size": case.get("size"),
+            }
+            if case.get("order_independent"):
+                item["order_independent"] = True
+            raw.append(item)
+        return raw
+
+
+def write_pack(name: str, problem_id: str, cases: List[Dict[str, Any]], packs_dir: Optional[str] = None) -> TestPack:
+    """
+    Store cases ({"input", "output", "description", "order_independent", "size"})
+    as a pack. Replacing an existing pack is atomic for readers: the data file
+    is versioned and the manifest is swapped in last.
+    """
+    directory = os.path.join(packs_dir or PACKS_DIR, name)
+    os.makedirs(directory, exist_ok=True)
+
+    columns, chunks, offset, manifest_cases = [], [], 0, []
+    for case in cases:
+        args = {}
+        for arg_name, value in case["input"].items():
+            encoded = encode_column(value)
+            if encoded is None:
+                args[arg_name] = value
+                continue
+            column, data = encoded
+            column.update(offset=offset, length=len(data))
+            padding = -len(data) % _ALIGN
+            chunks.append(data + b"\0" * padding)
+            offset += len(data) + padding
+            args[arg_name] = {"$column": len(columns)}
+            columns.append(column)
+        item = {"args": args, "output": case["output"], "description": case.get("description", "")}
+        for key in ("order_independent", "size"):
+            if case.get(key):
+                item[key] = case[key]
+        manifest_cases.append(item)
+
+    data = b"".join(chunks)
+    digest = hashlib.sha256(data)
+    digest.update(json.dumps([problem_id, columns, manifest_cases], sort_keys=True).encode("utf-8"))
+    version = digest.hexdigest()[:16]
+    data_name = f"columns-{version}.bin"
+
+    data_path = os.path.join(directory, data_name)
+    with open(f"{data_path}.tmp", "wb") as f:
+        f.write(data)
+    os.replace(f"{data_path}.tmp", data_path)
+
+    manifest = {"format": FORMAT, "problem": problem_id, "version": version, "data": data_name,
+                "columns": columns, "cases": manifest_cases}
+    manifest_path = os.path.join(directory, "manifest.json")
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    for old in glob.glob(os.path.join(directory, "columns-*.bin")):
+        if old != data_path:
+            os.remove(old)
+    return TestPack(directory)
+
+
+def list_packs(packs_dir: Optional[str] = None) -> List[TestPack]:
+    """Every readable pack, by name"""
+    packs = []
+    for manifest in sorted(glob.glob(os.path.join(packs_dir or PACKS_DIR, "*", "manifest.json"))):
+        try:
+            packs.append(TestPack(os.path.dirname(manifest)))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[TestPacks] Skipping unreadable pack {manifest}: {e}", flush=True)
+    return packs
+
+
+def packs_signature(packs_dir: Optional[str] = None) -> tuple:
+    """Cheap change detector for the packs directory"""
+    manifests = sorted(glob.glob(os.path.join(packs_dir or PACKS_DIR, "*", "manifest.json")))
+    return tuple((path, os.path.getmtime(path)) for path in manifests)
+
+
+# Packs this process has opened, by name
+_open_packs: Dict[str, TestPack] = {}
+
+
+def open_pack(name: str, version: Optional[str] = None) -> TestPack:
+    """A pack by name, reopened when the one in memory is not the requested version"""
+    pack = _open_packs.get(name)
+    if pack is None or (version is not None and pack.version != version):
+        try:
+            pack = TestPack(os.path.join(PACKS_DIR, name))
+        except OSError:
+            raise StalePack(f"Test pack {name} is missing")
+        _open_packs[name] = pack
+    if version is not None and pack.version != version:
+        raise StalePack(f"Test pack {name} changed since its suite was loaded")
+    return pack
+
+
+def load_input(ref) -> Dict[str, Any]:
+    """Input of a registry case from its (name, version, index) reference"""
+    name, version, index = ref
+    return open_pack(name, version).case_input(index)
+
+
+def map_packs(test_cases) -> None:
+    """Open and map the packs a suite refers to, so processes forked afterwards inherit the mapping"""
+    for case in test_cases:
+        ref = case.get("pack")
+        if ref is not None:
+            try:
+                open_pack(ref[0], ref[1])._data()
+            except (StalePack, OSError, ValueError):
+                # Reported by the case itself when it runs
+                pass
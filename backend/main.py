@@ -85,6 +85,27 @@ def run_migrations():
                 conn.execute(text("ALTER TABLE users ADD COLUMN profile_views INTEGER DEFAULT 0"))
                 conn.commit()
             print("Migration successful.")
+        
+        # Migration 4: Add measured runtime/memory to submissions table
+        if 'submissions' in inspector.get_table_names():
+            sub_columns = [c['name'] for c in inspector.get_columns('submissions')]
+            if 'runtime_ms' not in sub_columns:
+                print("Migrating: Adding runtime_ms/memory_mb to submissions table...")
+                with engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE submissions ADD COLUMN runtime_ms FLOAT"))
+                    conn.execute(text("ALTER TABLE submissions ADD COLUMN memory_mb FLOAT"))
+                    conn.commit()
+                print("Migration successful.")
+            if 'cost_ms' not in sub_columns:
+                print("Migrating: Adding cost_ms to submissions table...")
+                with engine.connect() as conn:
+                    conn.execute(text("ALTER TABLE submissions ADD COLUMN cost_ms FLOAT"))
+                    conn.commit()
+                print("Migration successful.")
+            with engine.connect() as conn:
+                # Percentile index partitions load by (problem, language, status)
+                conn.execute(text("CREATE INDEX IF NOT EXISTS ix_submissions_problem_lang_status ON submissions (problem_id, language, status)"))
+                conn.commit()
     except Exception as e:
         print(f"Migration check failed: {e}")
 
@@ -111,6 +132,20 @@ app.include_router(micro_lessons.router, prefix="/api", tags=["micro-lessons"])
 app.include_router(admin.router) # Admin routes (prefix defined in router)
 app.include_router(social.router, prefix="/api", tags=["social"])
 
+# Judge pool lifecycle: fork workers before the first request, reap them on exit
+from judge.pool import get_judge_pool, shutdown_judge_pool
+from test_cases.registry import test_suites
+
+@app.on_event("startup")
+def start_judge_pool():
+    # Suites first, so forked workers inherit them too
+    test_suites.load()
+    get_judge_pool()
+
+@app.on_event("shutdown")
+def stop_judge_pool():
+    shutdown_judge_pool()
+
 @app.get("/api")
 async def root():
     return {
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float
 from sqlalchemy.sql import func
 from config.database import Base
 
@@ -12,4 +12,7 @@ class Submission(Base):
     language = Column(String)
     status = Column(String)  # 'accepted', 'failed'
     points = Column(Integer, default=0)
+    runtime_ms = Column(Float, nullable=True)  # measured CPU time over the hidden suite
+    cost_ms = Column(Float, nullable=True)  # metered operations at the calibrated rate, when JUDGE_METERING is on
+    memory_mb = Column(Float, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,95 @@
+import sys
+import os
+import argparse
+import ast
+import time
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzers.code_facts import collect_facts
+
+
+def legacy_facts(tree):
+    """The previous ComplexityAnalyzer passes: walk, re-walk under every loop, walk again for allocations"""
+    def loop_depth(node, current=1):
+        deepest = current
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.For, ast.While)):
+                deepest = max(deepest, loop_depth(child, current + 1))
+        return deepest
+
+    nesting = 0
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.For, ast.While)):
+            nesting = max(nesting, loop_depth(node))
+    allocates = any(
+        isinstance(node, ast.ListComp)
+        or (isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult)
+            and (isinstance(node.left, ast.List) or isinstance(node.right, ast.List)))
+        for node in ast.walk(tree)
+    )
+    return nesting, allocates
+
+
+def nested_loops(depth, copies):
+    """`copies` functions, each a chain of `depth` directly nested loops"""
+    functions = []
+    for c in range(copies):
+        lines = [f"def f{c}(n):", "    total = 0"]
+        for d in range(depth):
+            lines.append("    " * (d + 1) + f"for i{d} in range(n):")
+        lines.append("    " * (depth + 1) + "total += [0] * 2 and 1")
+        lines.append("    return total")
+        functions.append("\n".join(lines))
+    return "\n\n".join(functions)
+
+
+def flat_statements(count):
+    """One long function of sibling loops and statements, like pasted generated code"""
+    lines = ["def g(nums):", "    seen = {}"]
+    for i in range(count):
+        lines.append(f"    for x{i} in nums:")
+        lines.append(f"        seen[x{i}] = sorted([x{i}, {i}])")
+    lines.append("    return seen")
+    return "\n".join(lines)
+
+
+def long_expression(terms):
+    """A single expression chain: deep tree, no loops (a recursive visitor overflows on it)"""
+    return "x = " + " + ".join(["1"] * terms)
+
+
+def best_ms(fn, tree, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(tree)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(repeat):
+    cases = [
+        ("nested loops depth 20 x 50", nested_loops(20, 50)),
+        ("nested loops depth 90 x 20", nested_loops(90, 20)),
+        ("flat 5000 loops", flat_statements(5000)),
+        ("expression chain 900 terms", long_expression(900)),
+    ]
+    print(f"{'input':<30}{'nodes':>10}{'legacy ms':>12}{'single-pass ms':>16}")
+    for name, code in cases:
+        tree = ast.parse(code)
+        facts = collect_facts(tree)
+        try:
+            legacy = f"{best_ms(legacy_facts, tree, repeat):.1f}"
+        except RecursionError:
+            legacy = "overflow"
+        single = best_ms(collect_facts, tree, repeat)
+        print(f"{name:<30}{facts.node_count:>10}{legacy:>12}{single:>16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time ComplexityAnalyzer's AST passes on synthetic inputs.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per input, the best one is reported")
+    args = parser.parse_args()
+    main(args.repeat)
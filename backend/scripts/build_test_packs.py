@@ -0,0 +1,46 @@
+import sys
+import os
+import argparse
+import copy
+import random
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from judge.test_packs import write_pack
+from test_cases.generators import get_input_generator
+from test_cases.references import REFERENCE_SOLUTIONS
+from test_cases.registry import slugify
+
+
+def build(problem_ids, size, count, seed):
+    for problem_id in problem_ids:
+        reference = REFERENCE_SOLUTIONS.get(problem_id)
+        generate = get_input_generator(problem_id)
+        if reference is None or generate is None or not reference.stress or size > reference.max_size:
+            print(f"Skipping {problem_id}: no reference that handles n={size} on worst-case inputs")
+            continue
+        rng = random.Random(f"{seed}:{problem_id}:{size}")
+        cases = []
+        for i in range(count):
+            data = generate(size, rng)
+            cases.append({
+                "input": data,
+                "output": reference.solve(**copy.deepcopy(data)),
+                "description": f"Stress n={size} #{i + 1}",
+                "order_independent": reference.order_independent,
+                "size": size,
+            })
+        pack = write_pack(f"{slugify(problem_id)}-stress", problem_id, cases)
+        print(f"  -> {pack.name}: {len(cases)} cases, version {pack.version}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build memory-mapped stress test packs under data/packs.")
+    parser.add_argument("problems", nargs="*", help="Problem titles (default: every problem with a reference solution)")
+    parser.add_argument("--size", type=int, default=10 ** 6, help="Input size of every stress case")
+    parser.add_argument("--count", type=int, default=1, help="Cases per problem")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    build(args.problems or sorted(REFERENCE_SOLUTIONS), args.size, args.count, args.seed)
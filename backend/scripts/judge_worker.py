@@ -0,0 +1,45 @@
+import sys
+import os
+import argparse
+import signal
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from judge.job_queue import SQLiteJobQueue
+from judge.pool import JudgePool
+from judge.remote import QueueWorker
+from test_cases.registry import test_suites
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued judge jobs (start the API with JUDGE_MODE=queue).")
+    parser.add_argument("--queue", default=settings.JUDGE_QUEUE_PATH, help="Path of the SQLite job queue")
+    parser.add_argument("--size", type=int, default=settings.JUDGE_POOL_SIZE, help="Judge processes on this node")
+    parser.add_argument("--worker-id", default=None, help="Name reported in heartbeats (default: host-pid-random)")
+    args = parser.parse_args()
+
+    queue = SQLiteJobQueue(args.queue, max_attempts=settings.JUDGE_JOB_MAX_ATTEMPTS)
+    # Suites first, so forked judge processes inherit them (profile jobs use the generators)
+    test_suites.load()
+    pool = JudgePool(size=args.size)
+    worker = QueueWorker(queue, pool, worker_id=args.worker_id)
+
+    def stop(signum, frame):
+        print("Stopping after the jobs in progress...", flush=True)
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"Judge worker {worker.worker_id}: {pool.size} processes on {args.queue}", flush=True)
+    try:
+        worker.run()
+    finally:
+        pool.shutdown()
+    print(f"Judge worker {worker.worker_id} stopped after {worker.jobs_done} jobs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import sys
+import os
+import argparse
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import SessionLocal
+from judge.pool import shutdown_judge_pool
+from judge.rejudge import RejudgeJob, checkpoint_path_for
+from models.submission import Submission
+
+
+def print_progress(progress):
+    print(
+        f"  {progress.problem_id}: {progress.processed} rows (last id {progress.last_id}), "
+        f"{progress.changed} changed, {progress.accepted} accepted / {progress.failed} failed, "
+        f"{progress.rows_per_second:.1f} rows/s",
+        flush=True
+    )
+
+
+def rejudge(problem_ids, chunk_size, restart):
+    for problem_id in problem_ids:
+        print(f"Re-judging {problem_id}...")
+        job = RejudgeJob(problem_id, chunk_size=chunk_size, checkpoint_path=checkpoint_path_for(problem_id))
+        progress = job.run(SessionLocal, on_progress=print_progress, restart=restart)
+        print(f"  -> Done: {progress.processed} rows, {progress.changed} changed in {progress.elapsed_s:.1f}s")
+    print("Note: restart the API (or use POST /api/admin/rejudge) to refresh its cached rankings.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-judge stored submissions against the current test suites.")
+    parser.add_argument("problems", nargs="*", help="Problem titles to re-judge (default: every problem with submissions)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per batch and transaction")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoints and start from the first row")
+    args = parser.parse_args()
+
+    problem_ids = args.problems
+    if not problem_ids:
+        db = SessionLocal()
+        try:
+            problem_ids = [p for (p,) in db.query(Submission.problem_id).distinct().order_by(Submission.problem_id)]
+        finally:
+            db.close()
+
+    try:
+        rejudge(problem_ids, args.chunk_size, args.restart)
+    except KeyboardInterrupt:
+        print("\nInterrupted; run again to resume from the last committed chunk.")
+    finally:
+        shutdown_judge_pool()
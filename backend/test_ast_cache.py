@@ -0,0 +1,55 @@
+from analyzers.ast_cache import ASTCache, ast_cache
+from analyzers.code_analyzer import CodeAnalyzer
+from analyzers.complexity_analyzer import ComplexityAnalyzer
+
+CODE = """
+def twoSum(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if target - num in seen:
+            return [seen[target - num], i]
+        seen[num] = i
+"""
+
+
+def test_lru_shares_one_parse_and_caches_syntax_errors():
+    cache = ASTCache(max_entries=2)
+    assert cache.tree("x = 1") is cache.tree("x = 1")
+    calls = []
+    assert cache.fact("x = 1", "n", lambda tree: calls.append(1) or len(tree.body)) == 1
+    assert cache.fact("x = 1", "n", lambda tree: calls.append(1)) == 1
+    assert calls == [1]
+
+    for _ in range(2):
+        try:
+            cache.tree("def broken(:")
+            assert False, "expected a SyntaxError"
+        except SyntaxError:
+            pass
+    assert (cache.hits, cache.misses) == (4, 2)
+
+    cache.tree("y = 2")
+    assert len(cache) == 2
+    cache.tree("x = 1")
+    assert cache.misses == 4
+
+
+def test_analyzers_consume_one_parse_per_source():
+    ast_cache.clear()
+    misses = ast_cache.misses
+    full = CodeAnalyzer().analyze(CODE)
+    complexity = ComplexityAnalyzer().analyze(CODE)
+    assert ast_cache.misses == misses + 1
+
+    assert full["success"] and full["complexity"] == 3
+    assert CodeAnalyzer().generate_mermaid_diagram(CODE) == full["mermaid_diagram"]
+    assert complexity.time_complexity == "O(n)"
+
+    # Results are copies: callers may modify them without touching the cached facts
+    full["variables"].clear()
+    complexity.empirical = {"time": "O(n)"}
+    complexity.patterns.append("measured")
+    assert CodeAnalyzer().extract_variables(CODE)
+    assert ComplexityAnalyzer().analyze(CODE).empirical is None
+    assert "measured" not in ComplexityAnalyzer().analyze(CODE).patterns
+    assert ComplexityAnalyzer().analyze("def broken(:").details == "Syntax Error"
@@ -0,0 +1,46 @@
+"""
+Checkers of coding problems
+The checker each problem is judged with (see judge.checkers), keyed by
+title like HIDDEN_TEST_CASES, and the verifiers of problems that accept more
+than one answer. Problems not listed use exact comparison; a case can still
+name its own checker.
+"""
+from collections import Counter
+from typing import Any, Dict
+
+from judge.checkers import Checker, UnorderedChecker, VerifyChecker
+
+
+def _verify_two_sum(data: Dict, actual: Any) -> bool:
+    # Any pair of distinct indices whose values add up to the target, in either order
+    nums, target = data["nums"], data["target"]
+    if not isinstance(actual, (list, tuple)) or len(actual) != 2:
+        return False
+    i, j = actual
+    if type(i) is not int or type(j) is not int or i == j:
+        return False
+    return 0 <= i < len(nums) and 0 <= j < len(nums) and nums[i] + nums[j] == target
+
+
+def _verify_top_k_frequent(data: Dict, actual: Any) -> bool:
+    # k distinct values whose counts add up to the k largest counts (ties may be broken either way)
+    counts, k = Counter(data["nums"]), data["k"]
+    if not isinstance(actual, list) or len(actual) != k or len(set(actual)) != k:
+        return False
+    if any(value not in counts for value in actual):
+        return False
+    return sum(counts[value] for value in actual) == sum(sorted(counts.values(), reverse=True)[:k])
+
+
+# Problem-specific checkers, by name
+CUSTOM_CHECKERS: Dict[str, Checker] = {
+    "two_sum": VerifyChecker(_verify_two_sum),
+    "top_k_frequent": VerifyChecker(_verify_top_k_frequent, base=UnorderedChecker()),
+}
+
+PROBLEM_CHECKERS: Dict[str, str] = {
+    "3Sum": "unordered_nested",
+    "Group Anagrams": "unordered_nested",
+    "Top K Frequent Elements": "top_k_frequent",
+    "Two Sum": "two_sum",
+}
@@ -0,0 +1,103 @@
+"""
+Generated test cases
+Seeded random cases at chosen sizes with expected outputs computed by the
+problem's reference solution (test_cases.references), plus one worst-case
+stress input from test_cases.generators at the largest size. Suites are
+cached on disk under data/generated, keyed by seed and by a version hash of
+the generator and reference sources, so they are built once per change.
+"""
+import copy
+import glob
+import hashlib
+import os
+import pickle
+import random
+from typing import Dict, List, Optional, Sequence
+
+from config.settings import settings
+from test_cases import generators, references
+
+GENERATED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "generated")
+
+
+def generator_version(sizes: Sequence[int], per_size: int) -> str:
+    """Changes whenever a generator, a reference or the generation parameters change"""
+    digest = hashlib.sha256(f"{list(sizes)}:{per_size}".encode("utf-8"))
+    for module in (generators, references):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def _case(reference: references.Reference, data: dict, description: str, size: int) -> Dict:
+    case = {
+        "input": data,
+        # The reference gets its own copy, so nothing it does can alter the stored input
+        "output": reference.solve(**copy.deepcopy(data)),
+        "description": description,
+        "generated_size": size,
+    }
+    if reference.order_independent:
+        case["order_independent"] = True
+    return case
+
+
+def generate_cases(problem_id: str, seed: int, sizes: Sequence[int], per_size: int = 1) -> List[Dict]:
+    """Raw test cases for a problem (by title); [] when it has no reference solution"""
+    reference = references.get_reference(problem_id)
+    if reference is None:
+        return []
+    # String seeds hash deterministically, so every process generates the same suite
+    rng = random.Random(f"{seed}:{problem_id}")
+    usable = [n for n in sorted(set(sizes)) if reference.min_size <= n <= reference.max_size]
+
+    cases = []
+    for n in usable:
+        for i in range(per_size):
+            cases.append(_case(reference, reference.generate(n, rng), f"Generated n={n} #{i + 1}", n))
+
+    stress = generators.get_input_generator(problem_id)
+    if reference.stress and stress is not None and usable:
+        n = usable[-1]
+        cases.append(_case(reference, stress(n, rng), f"Stress n={n}", n))
+    return cases
+
+
+def cache_path_for(problem_id: str, seed: int, version: str) -> str:
+    slug = "".join(ch if ch.isalnum() else "-" for ch in problem_id.lower()).strip("-")
+    return os.path.join(GENERATED_DIR, f"{slug}-{seed}-{version}.pkl")
+
+
+def generated_cases(problem_id: str, seed: Optional[int] = None, sizes: Optional[Sequence[int]] = None,
+                    per_size: Optional[int] = None) -> List[Dict]:
+    """
+    Generated cases of a problem, from the disk cache when present.
+    Defaults come from settings; returns [] when generation is disabled.
+    """
+    if not settings.TEST_GENERATED_CASES or references.get_reference(problem_id) is None:
+        return []
+    seed = settings.TEST_GENERATED_SEED if seed is None else seed
+    sizes = settings.TEST_GENERATED_SIZES if sizes is None else sizes
+    per_size = settings.TEST_GENERATED_PER_SIZE if per_size is None else per_size
+
+    path = cache_path_for(problem_id, seed, generator_version(sizes, per_size))
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+
+    cases = generate_cases(problem_id, seed, sizes, per_size)
+    os.makedirs(GENERATED_DIR, exist_ok=True)
+    # Older versions of this suite are dead weight now
+    for stale in glob.glob(path.rsplit("-", 1)[0] + "-*.pkl"):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(cases, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return cases
@@ -0,0 +1,118 @@
+"""
+Input generators for coding problems
+Each generator builds a valid, worst-case-leaning input of a given size, so a
+solution can be timed on inputs of increasing size. Keyed by problem title,
+like HIDDEN_TEST_CASES.
+"""
+import random
+import string
+from typing import Callable, Dict, Optional
+
+
+def _two_sum(n: int, rng: random.Random) -> dict:
+    # Multiples of 4 never sum to 3, so the only answer is the final pair: a full scan
+    nums = [4 * x for x in rng.sample(range(-4 * n, 4 * n), max(0, n - 2))] + [1, 2]
+    return {"nums": nums, "target": 3}
+
+
+def _contains_duplicate(n: int, rng: random.Random) -> dict:
+    # No duplicates: the whole array has to be checked
+    return {"nums": rng.sample(range(-4 * n, 4 * n), n)}
+
+
+def _valid_anagram(n: int, rng: random.Random) -> dict:
+    s = "".join(rng.choice(string.ascii_lowercase) for _ in range(n))
+    t = list(s)
+    rng.shuffle(t)
+    return {"s": s, "t": "".join(t)}
+
+
+def _best_time_to_buy_and_sell_stock(n: int, rng: random.Random) -> dict:
+    return {"prices": [rng.randint(0, 10 ** 4) for _ in range(n)]}
+
+
+def _binary_search(n: int, rng: random.Random) -> dict:
+    # Even numbers only and an odd target: never found
+    return {"nums": list(range(0, 2 * n, 2)), "target": 2 * rng.randrange(n) + 1}
+
+
+def _container_with_most_water(n: int, rng: random.Random) -> dict:
+    return {"height": [rng.randint(0, 10 ** 4) for _ in range(n)]}
+
+
+def _group_anagrams(n: int, rng: random.Random) -> dict:
+    words = ["".join(rng.choice("abcde") for _ in range(5)) for _ in range(n)]
+    return {"strs": words}
+
+
+def _house_robber(n: int, rng: random.Random) -> dict:
+    return {"nums": [rng.randint(0, 400) for _ in range(n)]}
+
+
+def _longest_consecutive_sequence(n: int, rng: random.Random) -> dict:
+    return {"nums": [rng.randint(-n, n) for _ in range(n)]}
+
+
+def _longest_substring(n: int, rng: random.Random) -> dict:
+    return {"s": "".join(rng.choice(string.ascii_letters) for _ in range(n))}
+
+
+def _product_of_array_except_self(n: int, rng: random.Random) -> dict:
+    return {"nums": [rng.choice([-2, -1, 1, 2]) for _ in range(n)]}
+
+
+def _search_a_2d_matrix(n: int, rng: random.Random) -> dict:
+    # n is the number of cells of a square, row-major sorted matrix
+    side = max(1, int(n ** 0.5))
+    matrix = [[(r * side + c) * 2 for c in range(side)] for r in range(side)]
+    return {"matrix": matrix, "target": 2 * rng.randrange(side * side) + 1}
+
+
+def _three_sum(n: int, rng: random.Random) -> dict:
+    return {"nums": [rng.randint(-n, n) for _ in range(n)]}
+
+
+def _top_k_frequent_elements(n: int, rng: random.Random) -> dict:
+    return {"nums": [rng.randint(0, max(1, n // 4)) for _ in range(n)], "k": 1}
+
+
+def _valid_palindrome(n: int, rng: random.Random) -> dict:
+    half = "".join(rng.choice(string.ascii_lowercase) for _ in range(n // 2))
+    return {"s": half + half[::-1]}
+
+
+def _valid_parentheses(n: int, rng: random.Random) -> dict:
+    return {"s": "([{" * (n // 6) + "}])" * (n // 6)}
+
+
+INPUT_GENERATORS: Dict[str, Callable[[int, random.Random], dict]] = {
+    "3Sum": _three_sum,
+    "Best Time to Buy and Sell Stock": _best_time_to_buy_and_sell_stock,
+    "Binary Search": _binary_search,
+    "Container With Most Water": _container_with_most_water,
+    "Contains Duplicate": _contains_duplicate,
+    "Group Anagrams": _group_anagrams,
+    "House Robber": _house_robber,
+    "Longest Consecutive Sequence": _longest_consecutive_sequence,
+    "Longest Substring Without Repeating Characters": _longest_substring,
+    "Product of Array Except Self": _product_of_array_except_self,
+    "Search a 2D Matrix": _search_a_2d_matrix,
+    "Top K Frequent Elements": _top_k_frequent_elements,
+    "Two Sum": _two_sum,
+    "Valid Anagram": _valid_anagram,
+    "Valid Palindrome": _valid_palindrome,
+    "Valid Parentheses": _valid_parentheses,
+}
+
+
+def get_input_generator(problem_id: str) -> Optional[Callable[[int, random.Random], dict]]:
+    """
+    Get the input generator for a specific problem
+    
+    Args:
+        problem_id: The problem identifier (e.g., "Two Sum")
+        
+    Returns:
+        generator(n, rng) -> input dict, or None if the problem has none
+    """
+    return INPUT_GENERATORS.get(problem_id)
@@ -0,0 +1,354 @@
+"""
+Reference solutions for coding problems
+Each entry pairs a trusted solution with a random input generator, so hidden
+suites can be extended with seeded, generated cases whose expected outputs
+come from the reference. Generators produce varied inputs (both true and
+false answers, duplicates, edge values) rather than the worst-case inputs of
+generators.py; those are added on top at the largest sizes. Keyed by problem
+title, like HIDDEN_TEST_CASES. Problems whose inputs are linked structures
+(trees, lists) are not covered.
+"""
+import random
+import string
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass(frozen=True)
+class Reference:
+    solve: Callable[..., Any]  # called with the input as keyword arguments
+    generate: Callable[[int, random.Random], dict]  # random valid input of size n
+    order_independent: bool = False  # any ordering of the output is accepted
+    min_size: int = 0
+    max_size: int = 10 ** 6  # the reference (or the expected complexity) does not scale past this
+    stress: bool = True  # worst-case generators.py inputs have a unique answer too
+
+
+# 3Sum
+
+def _three_sum(nums):
+    nums = sorted(nums)
+    triplets = []
+    for i in range(len(nums) - 2):
+        if i and nums[i] == nums[i - 1]:
+            continue
+        lo, hi = i + 1, len(nums) - 1
+        while lo < hi:
+            total = nums[i] + nums[lo] + nums[hi]
+            if total < 0:
+                lo += 1
+            elif total > 0:
+                hi -= 1
+            else:
+                triplets.append([nums[i], nums[lo], nums[hi]])
+                lo += 1
+                while lo < hi and nums[lo] == nums[lo - 1]:
+                    lo += 1
+                hi -= 1
+    return triplets
+
+
+def _gen_three_sum(n, rng):
+    spread = max(2, n // 3)
+    return {"nums": [rng.randint(-spread, spread) for _ in range(n)]}
+
+
+# Best Time to Buy and Sell Stock
+
+def _max_profit(prices):
+    best, low = 0, float("inf")
+    for price in prices:
+        low = min(low, price)
+        best = max(best, price - low)
+    return best
+
+
+def _gen_prices(n, rng):
+    return {"prices": [rng.randint(0, 10 ** 4) for _ in range(n)]}
+
+
+# Binary Search
+
+def _binary_search(nums, target):
+    lo, hi = 0, len(nums) - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if nums[mid] == target:
+            return mid
+        if nums[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return -1
+
+
+def _gen_binary_search(n, rng):
+    nums = sorted(rng.sample(range(-10 * n, 10 * n), n))
+    target = rng.choice(nums) if rng.random() < 0.5 else rng.randint(-10 * n - 1, 10 * n)
+    return {"nums": nums, "target": target}
+
+
+# Climbing Stairs
+
+def _climb_stairs(n):
+    a, b = 1, 1
+    for _ in range(n - 1):
+        a, b = b, a + b
+    return b
+
+
+def _gen_climb_stairs(n, rng):
+    # The input is the count itself, within the problem's 1..45 constraint
+    return {"n": rng.randint(1, 45)}
+
+
+# Container With Most Water
+
+def _max_area(height):
+    lo, hi, best = 0, len(height) - 1, 0
+    while lo < hi:
+        best = max(best, (hi - lo) * min(height[lo], height[hi]))
+        if height[lo] < height[hi]:
+            lo += 1
+        else:
+            hi -= 1
+    return best
+
+
+def _gen_heights(n, rng):
+    return {"height": [rng.randint(0, 10 ** 4) for _ in range(n)]}
+
+
+# Contains Duplicate
+
+def _contains_duplicate(nums):
+    return len(set(nums)) != len(nums)
+
+
+def _gen_contains_duplicate(n, rng):
+    nums = rng.sample(range(-10 * n - 10, 10 * n + 10), n)
+    if n > 1 and rng.random() < 0.5:
+        nums[rng.randrange(n)] = nums[rng.randrange(n)]
+    return {"nums": nums}
+
+
+# Group Anagrams
+
+def _group_anagrams(strs):
+    groups = defaultdict(list)
+    for word in strs:
+        groups["".join(sorted(word))].append(word)
+    return list(groups.values())
+
+
+def _gen_group_anagrams(n, rng):
+    return {"strs": ["".join(rng.choice("abc") for _ in range(rng.randint(0, 4))) for _ in range(n)]}
+
+
+# House Robber
+
+def _rob(nums):
+    take, skip = 0, 0
+    for num in nums:
+        take, skip = skip + num, max(take, skip)
+    return max(take, skip)
+
+
+def _gen_house_robber(n, rng):
+    return {"nums": [rng.randint(0, 400) for _ in range(n)]}
+
+
+# Longest Consecutive Sequence
+
+def _longest_consecutive(nums):
+    values, best = set(nums), 0
+    for value in values:
+        if value - 1 not in values:
+            length = 1
+            while value + length in values:
+                length += 1
+            best = max(best, length)
+    return best
+
+
+def _gen_longest_consecutive(n, rng):
+    return {"nums": [rng.randint(-n, n) for _ in range(n)]}
+
+
+# Longest Substring Without Repeating Characters
+
+def _length_of_longest_substring(s):
+    last, start, best = {}, 0, 0
+    for i, ch in enumerate(s):
+        if last.get(ch, -1) >= start:
+            start = last[ch] + 1
+        last[ch] = i
+        best = max(best, i - start + 1)
+    return best
+
+
+def _gen_longest_substring(n, rng):
+    alphabet = rng.choice([string.ascii_lowercase[:3], string.ascii_lowercase, string.printable[:95]])
+    return {"s": "".join(rng.choice(alphabet) for _ in range(n))}
+
+
+# Product of Array Except Self
+
+def _product_except_self(nums):
+    n = len(nums)
+    result = [1] * n
+    prefix = 1
+    for i in range(n):
+        result[i] = prefix
+        prefix *= nums[i]
+    suffix = 1
+    for i in range(n - 1, -1, -1):
+        result[i] *= suffix
+        suffix *= nums[i]
+    return result
+
+
+def _gen_product(n, rng):
+    # Mostly +-1 keeps products small; a few zeros and larger factors exercise the edge cases
+    nums = [rng.choice([-1, 1]) for _ in range(n)]
+    for _ in range(min(n, rng.randint(0, 3))):
+        nums[rng.randrange(n)] = rng.choice([0, -3, 2, 3])
+    return {"nums": nums}
+
+
+# Search a 2D Matrix
+
+def _search_matrix(matrix, target):
+    return any(target in row for row in matrix)
+
+
+def _gen_search_matrix(n, rng):
+    rows = max(1, int(n ** 0.5))
+    cols = max(1, n // rows)
+    values = sorted(rng.sample(range(-10 * n - 10, 10 * n + 10), rows * cols))
+    matrix = [values[r * cols:(r + 1) * cols] for r in range(rows)]
+    target = rng.choice(values) if rng.random() < 0.5 else rng.randint(-10 * n - 11, 10 * n + 11)
+    return {"matrix": matrix, "target": target}
+
+
+# Top K Frequent Elements
+
+def _top_k_frequent(nums, k):
+    return [value for value, _ in Counter(nums).most_common(k)]
+
+
+def _gen_top_k(n, rng):
+    # Distinct counts 1, 2, ..., d make every top-k unique
+    distinct = 1
+    while (distinct + 1) * (distinct + 2) // 2 <= n:
+        distinct += 1
+    values = rng.sample(range(-10 * n - 10, 10 * n + 10), distinct)
+    nums = [value for count, value in enumerate(values, start=1) for _ in range(count)]
+    rng.shuffle(nums)
+    return {"nums": nums, "k": rng.randint(1, distinct)}
+
+
+# Two Sum
+
+def _two_sum(nums, target):
+    seen = {}
+    for i, num in enumerate(nums):
+        if target - num in seen:
+            return [seen[target - num], i]
+        seen[num] = i
+    return []
+
+
+def _gen_two_sum(n, rng):
+    # Multiples of 4 plus one value = 1 and one = 2 (mod 4): only that pair sums to the target
+    nums = [4 * x for x in rng.sample(range(-4 * n, 4 * n), n - 2)]
+    a, b = 4 * rng.randint(-n, n) + 1, 4 * rng.randint(-n, n) + 2
+    nums.insert(rng.randint(0, len(nums)), a)
+    nums.insert(rng.randint(0, len(nums)), b)
+    return {"nums": nums, "target": a + b}
+
+
+# Valid Anagram
+
+def _is_anagram(s, t):
+    return Counter(s) == Counter(t)
+
+
+def _gen_anagram(n, rng):
+    s = "".join(rng.choice("abcde") for _ in range(n))
+    t = list(s)
+    rng.shuffle(t)
+    if n and rng.random() < 0.5:
+        t[rng.randrange(n)] = rng.choice("abcdef")
+    return {"s": s, "t": "".join(t)}
+
+
+# Valid Palindrome
+
+def _is_palindrome(s):
+    cleaned = [ch.lower() for ch in s if ch.isalnum()]
+    return cleaned == cleaned[::-1]
+
+
+def _gen_palindrome(n, rng):
+    half = [rng.choice("aAbB01 ,.:") for _ in range(n // 2)]
+    mirrored = [ch.swapcase() if rng.random() < 0.3 else ch for ch in reversed(half)]
+    s = half + ([rng.choice("xyz!")] if n % 2 else []) + mirrored
+    if n and rng.random() < 0.5:
+        s[rng.randrange(n)] = rng.choice("abc9")
+    return {"s": "".join(s)}
+
+
+# Valid Parentheses
+
+def _is_valid_parentheses(s):
+    pairs, stack = {")": "(", "]": "[", "}": "{"}, []
+    for ch in s:
+        if ch in pairs:
+            if not stack or stack.pop() != pairs[ch]:
+                return False
+        else:
+            stack.append(ch)
+    return not stack
+
+
+def _gen_parentheses(n, rng):
+    chars, stack = [], []
+    for i in range(n):
+        if stack and (rng.random() < 0.5 or len(stack) >= n - i):
+            chars.append({"(": ")", "[": "]", "{": "}"}[stack.pop()])
+        else:
+            opener = rng.choice("([{")
+            stack.append(opener)
+            chars.append(opener)
+    if n and rng.random() < 0.5:
+        chars[rng.randrange(n)] = rng.choice("()[]{}")
+    return {"s": "".join(chars)}
+
+
+REFERENCE_SOLUTIONS: Dict[str, Reference] = {
+    "3Sum": Reference(_three_sum, _gen_three_sum, order_independent=True, max_size=2000),
+    "Best Time to Buy and Sell Stock": Reference(_max_profit, _gen_prices, min_size=1),
+    "Binary Search": Reference(_binary_search, _gen_binary_search, min_size=1),
+    "Climbing Stairs": Reference(_climb_stairs, _gen_climb_stairs, stress=False),
+    "Container With Most Water": Reference(_max_area, _gen_heights, min_size=2),
+    "Contains Duplicate": Reference(_contains_duplicate, _gen_contains_duplicate, min_size=1),
+    "Group Anagrams": Reference(_group_anagrams, _gen_group_anagrams, order_independent=True, min_size=1),
+    "House Robber": Reference(_rob, _gen_house_robber, min_size=1),
+    "Longest Consecutive Sequence": Reference(_longest_consecutive, _gen_longest_consecutive),
+    "Longest Substring Without Repeating Characters": Reference(_length_of_longest_substring, _gen_longest_substring),
+    "Product of Array Except Self": Reference(_product_except_self, _gen_product, min_size=2, stress=False),
+    "Search a 2D Matrix": Reference(_search_matrix, _gen_search_matrix, min_size=1),
+    "Top K Frequent Elements": Reference(_top_k_frequent, _gen_top_k, order_independent=True, min_size=1,
+                                         stress=False),
+    "Two Sum": Reference(_two_sum, _gen_two_sum, min_size=2),
+    "Valid Anagram": Reference(_is_anagram, _gen_anagram, min_size=1),
+    "Valid Palindrome": Reference(_is_palindrome, _gen_palindrome, min_size=1),
+    "Valid Parentheses": Reference(_is_valid_parentheses, _gen_parentheses, min_size=1),
+}
+
+
+def get_reference(problem_id: str) -> Optional[Reference]:
+    """Reference solution and input generator of a problem (by title), or None"""
+    return REFERENCE_SOLUTIONS.get(problem_id)
@@ -0,0 +1,311 @@
+"""
+Test Suite Registry
+One in-memory view of every problem's test data, built at startup from the
+places it lives: PROBLEM_TEST_CASES (keyed by slug), HIDDEN_TEST_CASES
+(keyed by title), the JSON Problem.test_cases column, and generated cases
+checked against reference solutions (test_cases.generated) and the stress
+cases of test packs under data/packs (judge.test_packs), both appended to the
+hidden ones. Cases are validated
+and frozen once, expected outputs are canonicalized once by the problem's
+checker (test_cases.checkers), and
+each suite carries a version hash. The registry rebuilds itself on a
+background thread when one of its source modules or the problems table changes.
+"""
+import hashlib
+import importlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.settings import settings
+from judge.checkers import DEFAULT_CHECKER, case_checker, get_checker
+from judge.inputs import PackedCases
+from judge.result_cache import suite_version
+from judge import test_packs
+from test_cases import checkers, generators, hidden_tests, problems, references
+from test_cases.generated import generated_cases
+
+# Modules whose edits trigger a rebuild
+SOURCE_MODULES = (problems, hidden_tests, generators, references, checkers)
+
+
+def slugify(problem_id: str) -> str:
+    """'Two Sum' and 'two-sum' both become 'two-sum'"""
+    return re.sub(r"[^a-z0-9]+", "-", problem_id.lower()).strip("-")
+
+
+@dataclass(frozen=True)
+class FrozenCase:
+    input: Dict[str, Any]  # keyword arguments of the entry point; treat as read-only
+    output: Any
+    description: str = ""
+    order_independent: bool = False
+    canonical: Any = None  # the checker's prepared form of output, unless the checker is exact
+    generated_size: Optional[int] = None  # input size of a generated case
+    pack: Optional[Tuple[str, str, int]] = None  # (name, version, index) of a test pack case; input is a summary
+    checker: str = DEFAULT_CHECKER
+
+    def to_judge(self) -> Dict[str, Any]:
+        """Plain dict as the judge workers and CodeExecutor consume it"""
+        case = {"input": self.input, "output": self.output, "expected": self.output, "description": self.description}
+        if self.order_independent:
+            case["order_independent"] = True
+        if self.checker != DEFAULT_CHECKER:
+            case["checker"] = self.checker
+            case["canonical"] = self.canonical
+        if self.generated_size is not None:
+            case["generated_size"] = self.generated_size
+        if self.pack is not None:
+            case["pack"] = self.pack
+        return case
+
+
+@dataclass(frozen=True)
+class Suite:
+    problem_id: str  # title, as used by submissions and hidden tests
+    slug: str
+    function_name: Optional[str]
+    visible: Tuple[FrozenCase, ...]
+    hidden: Tuple[FrozenCase, ...]
+    visible_cases: Tuple[Dict[str, Any], ...]  # to_judge() of each case, built once
+    hidden_cases: Tuple[Dict[str, Any], ...]
+    version: str
+    checker: Optional[str] = None  # problem-wide checker, also applied to submitted visible cases
+
+    @property
+    def cases(self) -> List[Dict[str, Any]]:
+        return list(self.visible_cases + self.hidden_cases)
+
+    @cached_property
+    def packed(self) -> PackedCases:
+        """Every case, serialized once for the judge workers"""
+        return PackedCases(self.visible_cases + self.hidden_cases, version=self.version)
+
+    @cached_property
+    def packed_hidden(self) -> PackedCases:
+        """Hidden cases serialized once; submissions prefix them with their own visible cases"""
+        return PackedCases(self.hidden_cases, version=suite_version(list(self.hidden_cases)))
+
+
+def freeze_case(raw: Dict[str, Any], index: int, checker: Optional[str] = None) -> Optional[FrozenCase]:
+    """Validate one raw test case; None when it cannot be judged. The case's own checker wins over `checker`."""
+    if not isinstance(raw, dict) or not isinstance(raw.get("input"), dict):
+        return None
+    if "output" in raw:
+        output = raw["output"]
+    elif "expected" in raw:
+        output = raw["expected"]
+    else:
+        return None
+    order_independent = bool(raw.get("order_independent", False))
+    name = raw.get("checker") or checker or case_checker(raw)
+    try:
+        prepared = get_checker(name).prepare(output)
+    except KeyError:
+        return None
+    return FrozenCase(
+        input=raw["input"],
+        output=output,
+        description=raw.get("description", f"Test {index + 1}"),
+        order_independent=order_independent,
+        canonical=prepared if name != DEFAULT_CHECKER else None,
+        generated_size=raw.get("generated_size"),
+        pack=tuple(raw["pack"]) if raw.get("pack") else None,
+        checker=name,
+    )
+
+
+def _freeze_all(raw_cases, source: str, checker: Optional[str] = None) -> Tuple[FrozenCase, ...]:
+    frozen = []
+    for i, raw in enumerate(raw_cases or []):
+        case = freeze_case(raw, i, checker)
+        if case is None:
+            print(f"[TestSuites] Skipping invalid case {i} of {source}", flush=True)
+            continue
+        frozen.append(case)
+    return tuple(frozen)
+
+
+def build_suite(title: str, function_name: Optional[str], visible_raw, hidden_raw,
+                checker: Optional[str] = None) -> Suite:
+    visible = _freeze_all(visible_raw, f"{title} (visible)", checker)
+    hidden = _freeze_all(hidden_raw, f"{title} (hidden)", checker)
+    visible_cases = tuple(c.to_judge() for c in visible)
+    hidden_cases = tuple(c.to_judge() for c in hidden)
+    return Suite(
+        problem_id=title,
+        slug=slugify(title),
+        function_name=function_name,
+        visible=visible,
+        hidden=hidden,
+        visible_cases=visible_cases,
+        hidden_cases=hidden_cases,
+        version=suite_version(list(visible_cases + hidden_cases)),
+        checker=checker,
+    )
+
+
+class SuiteRegistry:
+    """
+    Suites by slug. Readers never block: change checks and rebuilds run on a
+    background thread, which swaps in a new dict when it is done.
+    """
+
+    def __init__(self, reload_interval: Optional[float] = None):
+        self.reload_interval = settings.TEST_SUITE_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        self._suites: Dict[str, Suite] = {}
+        self._signature = None
+        self._checked_at = 0.0
+        self._loaded = False
+        # Serializes rebuilds; readers never take it once the first build is in
+        self._lock = threading.Lock()
+        self._reloader: Optional[threading.Thread] = None
+
+    def load(self):
+        """Build every suite now (called at startup)"""
+        with self._lock:
+            self._rebuild(self._current_signature())
+            self._checked_at = time.monotonic()
+
+    def reload(self) -> bool:
+        """Rebuild now if any source changed; True if it did"""
+        with self._lock:
+            signature = self._current_signature()
+            if self._loaded and signature == self._signature:
+                return False
+            self._rebuild(signature)
+            return True
+
+    def get(self, problem_id: str) -> Optional[Suite]:
+        """Suite of a problem by title or slug"""
+        self._maybe_reload()
+        return self._suites.get(slugify(problem_id))
+
+    def hidden_cases(self, problem_id: str) -> List[Dict[str, Any]]:
+        suite = self.get(problem_id)
+        return list(suite.hidden_cases) if suite else []
+
+    def with_hidden(self, problem_id: str, visible_cases: List[Dict[str, Any]]):
+        """Visible cases followed by the problem's packed hidden cases, ready for the judge pool"""
+        suite = self.get(problem_id)
+        if suite is None:
+            return list(visible_cases)
+        if suite.checker:
+            visible_cases = [
+                case if "checker" in case else dict(case, checker=suite.checker) for case in visible_cases
+            ]
+        return suite.packed_hidden.with_prefix(visible_cases)
+
+    def __len__(self):
+        return len(self._suites)
+
+    def _maybe_reload(self):
+        if not self._loaded:
+            # Nothing to serve yet (startup normally calls load() first), so this one build is waited for
+            with self._lock:
+                if not self._loaded:
+                    self._rebuild(self._current_signature())
+                    self._checked_at = time.monotonic()
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        reloader = self._reloader
+        if reloader is not None and reloader.is_alive():
+            return
+        self._checked_at = now
+        # Two readers may both get here; the second check simply finds nothing changed
+        self._reloader = threading.Thread(target=self._reload_in_background, name="suite-reload", daemon=True)
+        self._reloader.start()
+
+    def _reload_in_background(self):
+        try:
+            self.reload()
+        except Exception as e:
+            print(f"[TestSuites] Reload failed, keeping the current suites: {e}", flush=True)
+
+    def _current_signature(self):
+        files = tuple(os.path.getmtime(m.__file__) for m in SOURCE_MODULES)
+        return files, _problem_table_signature(), test_packs.packs_signature()
+
+    def _rebuild(self, signature):
+        if self._loaded and signature[0] != self._signature[0]:
+            for module in SOURCE_MODULES:
+                importlib.reload(module)
+
+        by_slug: Dict[str, Dict[str, Any]] = {}
+
+        def entry(title: str) -> Dict[str, Any]:
+            # The first source to mention a problem names it; titles come before slugs
+            return by_slug.setdefault(slugify(title), {"title": title, "function_name": None,
+                                                       "visible": None, "hidden": None, "generated": [], "packs": []})
+
+        for title, cases in hidden_tests.HIDDEN_TEST_CASES.items():
+            entry(title)["hidden"] = cases
+        for title, raw_json in _problem_table_cases():
+            try:
+                entry(title)["visible"] = json.loads(raw_json)
+            except (TypeError, ValueError):
+                print(f"[TestSuites] Unreadable test_cases JSON for {title}", flush=True)
+        for title in references.REFERENCE_SOLUTIONS:
+            entry(title)["generated"] = generated_cases(title)
+        for pack in test_packs.list_packs():
+            entry(pack.problem_id)["packs"] += pack.raw_cases()
+        # Curated cases carry the entry point and comparison flags, so they win over the JSON column
+        for slug, data in problems.PROBLEM_TEST_CASES.items():
+            item = entry(slug)
+            item["function_name"] = data.get("function_name")
+            item["visible"] = data.get("test_cases")
+
+        problem_checkers = {slugify(title): name for title, name in checkers.PROBLEM_CHECKERS.items()}
+        self._suites = {
+            slug: build_suite(item["title"], item["function_name"], item["visible"],
+                              (item["hidden"] or []) + item["generated"] + item["packs"],
+                              problem_checkers.get(slug))
+            for slug, item in by_slug.items()
+        }
+        self._signature = signature
+        self._loaded = True
+
+
+def _problem_table_cases() -> List[Tuple[str, str]]:
+    """(title, test_cases JSON) of every problem that has stored cases; [] without a database"""
+    from config.database import SessionLocal
+    from models.problem import Problem
+
+    try:
+        db = SessionLocal()
+        try:
+            return db.query(Problem.title, Problem.test_cases).filter(Problem.test_cases.isnot(None)).all()
+        finally:
+            db.close()
+    except Exception:
+        return []
+
+
+def _problem_table_signature():
+    """Digest of every problem's stored test cases, so any edit to one is seen (None without a database)"""
+    from config.database import SessionLocal
+    from models.problem import Problem
+
+    try:
+        db = SessionLocal()
+        try:
+            digest = hashlib.sha1()
+            rows = db.query(Problem.id, Problem.title, Problem.test_cases).order_by(Problem.id).yield_per(500)
+            for problem_id, title, raw_json in rows:
+                digest.update(f"{problem_id}\0{title}\0{raw_json}\1".encode("utf-8", "surrogatepass"))
+            return digest.hexdigest()
+        finally:
+            db.close()
+    except Exception:
+        return None
+
+
+# Global Registry Instance
+test_suites = SuiteRegistry()
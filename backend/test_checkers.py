@@ -0,0 +1,53 @@
+from judge.checkers import case_passes, get_checker
+from judge.runner import run_tests
+from test_cases.registry import SuiteRegistry, freeze_case
+
+TWO_SUM_REVERSED = """
+def twoSum(nums, target):
+    seen = {}
+    for i in reversed(range(len(nums))):
+        if target - nums[i] in seen:
+            return [seen[target - nums[i]], i]
+        seen[nums[i]] = i
+"""
+
+
+def _no_input():
+    raise AssertionError("the input should not be needed")
+
+
+def test_builtin_checkers_compare_against_a_prepared_expectation():
+    unordered = get_checker("unordered")
+    assert unordered.check(unordered.prepare([3, 1, 2]), [2, 3, 1], _no_input)
+    assert not unordered.check(unordered.prepare([1, 1, 2]), [1, 2, 2], _no_input)
+
+    nested = get_checker("unordered_nested")
+    assert nested.check(nested.prepare([["a", "b"], ["c"]]), [["c"], ["b", "a"]], _no_input)
+
+    close = get_checker("float")
+    assert close.check([0.1 + 0.2, 2], [0.3, 2.0000000001], _no_input)
+    assert not close.check(0.3, 0.31, _no_input)
+    assert not close.check(1, True, _no_input)
+
+
+def test_two_sum_accepts_any_valid_pair():
+    case = freeze_case({"input": {"nums": [1, 5, 3, 7, 9], "target": 12}, "output": [1, 3]}, 0, "two_sum").to_judge()
+    assert case_passes(case, [1, 3], _no_input)
+    load = lambda: {"nums": [1, 5, 3, 7, 9], "target": 12}
+    assert case_passes(case, [3, 1], load)
+    assert case_passes(case, [2, 4], load)
+    assert not case_passes(case, [1, 1], load)
+    assert not case_passes(case, None, load)
+
+    suites = SuiteRegistry(reload_interval=3600)
+    suites.load()
+    cases = suites.with_hidden("Two Sum", [{"input": {"nums": [1, 5, 3, 7, 9], "target": 12}, "output": [1, 3]}])
+    assert all(passed for passed, _, _ in run_tests(TWO_SUM_REVERSED, list(cases)))
+
+
+def test_top_k_frequent_accepts_either_side_of_a_tie():
+    case = freeze_case({"input": {"nums": [1, 1, 2, 2, 3], "k": 1}, "output": [1]}, 0, "top_k_frequent").to_judge()
+    load = lambda: {"nums": [1, 1, 2, 2, 3], "k": 1}
+    assert case_passes(case, [2], load)
+    assert not case_passes(case, [3], load)
+    assert not case_passes(case, [1, 2], load)
@@ -0,0 +1,57 @@
+import ast
+
+from analyzers.code_facts import collect_facts
+from analyzers.complexity_analyzer import ComplexityAnalyzer
+from scripts.benchmark_complexity_analyzer import long_expression, nested_loops
+
+SOLUTION = """
+from collections import Counter
+
+class Solution:
+    def topKFrequent(self, nums, k):
+        counts = Counter(nums)
+        seen = set()
+        for num in nums:
+            if num not in seen:
+                seen.add(num)
+        return [n for n, _ in sorted(counts.items(), key=lambda kv: -kv[1])][:k]
+
+    def depth(self, node):
+        if not node:
+            return 0
+        return 1 + max(self.depth(node.left), self.depth(node.right))
+"""
+
+
+def test_one_pass_collects_every_fact():
+    facts = collect_facts(ast.parse(SOLUTION))
+    assert facts.max_loop_depth == 1
+    assert facts.recursive_functions == ["depth"]
+    assert facts.sort_calls == [11]
+    assert facts.allocation_sites == [11, 11]
+    assert facts.uses_dict and facts.dict_sites == [6]
+    assert facts.uses_set and facts.set_sites == [7]
+
+
+def test_loop_depth_follows_execution_not_just_direct_children():
+    code = """
+def f(nums):
+    for a in nums:
+        if a:
+            while a:
+                a = sum(x * y for x in nums for y in nums)
+    def helper():
+        for b in nums:
+            pass
+"""
+    assert collect_facts(ast.parse(code)).max_loop_depth == 4
+    analysis = ComplexityAnalyzer().analyze("def f(n):\n    return [i * j for i in range(n) for j in range(n)]")
+    assert (analysis.time_complexity, analysis.space_complexity) == ("O(n²)", "O(n²)")
+    assert analysis.nested_loop_depth == 2 and analysis.details == "Detected nesting level: 2"
+
+
+def test_deep_synthetic_inputs():
+    assert collect_facts(ast.parse(nested_loops(90, 2))).max_loop_depth == 90
+    # Deeper than a recursive ast.NodeVisitor can go
+    facts = collect_facts(ast.parse(long_expression(2000)))
+    assert facts.max_loop_depth == 0 and facts.node_count > 4000
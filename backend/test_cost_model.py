@@ -0,0 +1,105 @@
+import ast
+
+import pytest
+
+from analyzers.complexity_analyzer import ComplexityAnalyzer, score_time_complexity
+from analyzers.cost_model import (CONSTANT, EXPONENTIAL, LINEAR, LINEARITHMIC, LOGARITHMIC, QUADRATIC,
+                                  Complexity, infer_cost)
+from analyzers.feedback_generator import FeedbackGenerator
+
+
+def time_of(code):
+    return infer_cost(ast.parse(code)).time
+
+
+@pytest.mark.parametrize("code, expected", [
+    # A library call inside a loop multiplies
+    ("def f(nums):\n    for x in nums:\n        y = sorted(nums)\n    return y", Complexity(2, 1)),
+    ("def f(nums):\n    for x in nums:\n        nums.index(x)", QUADRATIC),
+    # `in` is linear on a list, constant on a set
+    ("def f(nums):\n    seen = []\n    for x in nums:\n        if x in seen:\n            return True\n"
+     "        seen.append(x)", QUADRATIC),
+    ("def f(nums):\n    seen = set()\n    for x in nums:\n        if x in seen:\n            return True\n"
+     "        seen.add(x)", LINEAR),
+    ("def f(nums):\n    for i in range(len(nums)):\n        rest = nums[i:]", QUADRATIC),
+    ("import heapq\ndef f(nums, k):\n    h = []\n    for x in nums:\n        heapq.heappush(h, x)\n"
+     "        if len(h) > k:\n            heapq.heappop(h)\n    return h[0]", LINEARITHMIC),
+    ("def f(a, b):\n    return max(a, b)", CONSTANT),
+])
+def test_library_and_container_costs(code, expected):
+    assert time_of(code) == expected
+
+
+def test_halving_doubling_and_amortized_loops():
+    binary_search = ("def f(nums, t):\n    lo, hi = 0, len(nums) - 1\n    while lo <= hi:\n"
+                     "        mid = (lo + hi) // 2\n        if nums[mid] < t:\n            lo = mid + 1\n"
+                     "        else:\n            hi = mid - 1\n    return lo")
+    assert time_of(binary_search) == LOGARITHMIC
+    assert time_of("def f(n):\n    i = 1\n    while i < n:\n        i *= 2") == LOGARITHMIC
+    assert time_of("def f(nums):\n    for x in nums:\n        n = x\n        while n > 1:\n            n >>= 1") == \
+        LINEARITHMIC
+    sliding_window = ("def f(s):\n    seen = set()\n    l = 0\n    for r in range(len(s)):\n"
+                      "        while s[r] in seen:\n            seen.remove(s[l])\n            l += 1\n"
+                      "        seen.add(s[r])")
+    assert time_of(sliding_window) == LINEAR
+    restarted = ("def f(nums):\n    for i in range(len(nums)):\n        j = i\n        while j < len(nums):\n"
+                 "            j += 1")
+    assert time_of(restarted) == QUADRATIC
+
+
+def test_recursion_with_and_without_memoization():
+    fib = "def fib(n):\n    if n < 2:\n        return n\n    return fib(n - 1) + fib(n - 2)"
+    assert time_of(fib) == EXPONENTIAL
+    assert time_of("from functools import lru_cache\n@lru_cache(None)\n" + fib) == LINEAR
+    memo_dict = ("def fib(n, memo={}):\n    if n in memo:\n        return memo[n]\n    if n < 2:\n        return n\n"
+                 "    memo[n] = fib(n - 1, memo) + fib(n - 2, memo)\n    return memo[n]")
+    assert time_of(memo_dict) == LINEAR
+    merge_sort = ("def ms(a):\n    if len(a) <= 1:\n        return a\n    mid = len(a) // 2\n"
+                  "    left, right = ms(a[:mid]), ms(a[mid:])\n    return sorted(left + right)")
+    assert time_of(merge_sort) == Complexity(1, 2)
+    assert time_of("def depth(node):\n    if not node:\n        return 0\n"
+                   "    return 1 + max(depth(node.left), depth(node.right))") == LINEAR
+    # Helpers cost what their bodies cost at the call site
+    assert time_of("def helper(nums):\n    return sorted(nums)\n\ndef main(nums):\n"
+                   "    for x in nums:\n        helper(nums)") == Complexity(2, 1)
+
+
+def test_complexity_labels_and_ordering():
+    for label in ("O(1)", "O(log n)", "O(n)", "O(n log n)", "O(n²)", "O(n³)", "O(n^4)", "O(2^n)"):
+        assert str(Complexity.parse(label)) == label
+    assert Complexity.parse("O(n^2)") == QUADRATIC
+    assert Complexity.parse("N/A") is None and Complexity.parse("Unknown") is None
+    assert LOGARITHMIC < LINEAR < LINEARITHMIC < Complexity(2, 1) < Complexity(3) < EXPONENTIAL
+    assert LINEAR * LOGARITHMIC == LINEARITHMIC and LINEAR + QUADRATIC == QUADRATIC
+    assert QUADRATIC.steps_above(LINEAR) == 2 and LINEAR.steps_above(LINEARITHMIC) == -1
+
+
+def test_scoring_and_feedback_use_the_structured_result():
+    assert score_time_complexity(Complexity(2, 1))[:2] == ("improvable", 60)
+    assert score_time_complexity(LINEARITHMIC)[0] == "optimal"
+    assert score_time_complexity(None)[:2] == ("improvable", 50)
+
+    pairs = "def f(nums):\n    for i in nums:\n        for j in nums:\n            pass"
+    analysis = ComplexityAnalyzer().analyze(pairs)
+    assert analysis.time == QUADRATIC and analysis.to_dict()["time"] == "O(n²)"
+    feedback = FeedbackGenerator().generate_feedback(analysis, "two-sum")
+    assert feedback.tier == "improvable" and "avoid checking every pair" in " ".join(feedback.hints)
+
+    hashed = ("def f(nums, target):\n    seen = {}\n    for i, x in enumerate(nums):\n"
+              "        if target - x in seen:\n            return [seen[target - x], i]\n        seen[x] = i")
+    assert FeedbackGenerator().generate_feedback(ComplexityAnalyzer().analyze(hashed), "two-sum").tier == "optimal"
+
+
+def test_match_bodies_are_priced_and_deep_chains_are_unknown():
+    match = "def f(x):\n    match x:\n        case 1:\n            for i in x:\n                pass\n        case _:\n            pass"
+    assert time_of(match) == LINEAR
+
+    chain = "".join(f"def f{i}(n):\n    return f{i + 1}(n)\n" for i in range(1500)) + "def f1500(n):\n    return n\n"
+    assert time_of(chain) is None
+    analysis = ComplexityAnalyzer().analyze(chain)
+    assert analysis.time is None and analysis.time_complexity == "Unknown"
+    assert score_time_complexity(analysis.time)[:2] == ("improvable", 50)
+    # A short chain is still followed
+    short = "def a(nums):\n    return b(nums)\ndef b(nums):\n    return sorted(nums)\n"
+    assert time_of(short) == LINEARITHMIC
+
@@ -0,0 +1,121 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config.database import Base
+from models.submission import Submission
+from utils.distribution_index import DistributionIndex
+
+
+def _session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine, tables=[Submission.__table__])
+    return sessionmaker(bind=engine)()
+
+
+def test_percentiles_rebuilt_from_history_and_updated():
+    db = _session()
+    for runtime in [10.0, 20.0, 30.0, 40.0]:
+        db.add(Submission(user_id="u", problem_id="Two Sum", language="python",
+                          status="accepted", runtime_ms=runtime, memory_mb=runtime / 10))
+    # Failed runs and other problems never count
+    db.add(Submission(user_id="u", problem_id="Two Sum", language="python",
+                      status="failed", runtime_ms=1.0, memory_mb=0.1))
+    db.add(Submission(user_id="u", problem_id="3Sum", language="python",
+                      status="accepted", runtime_ms=99.0, memory_mb=9.9))
+    db.commit()
+
+    index = DistributionIndex()
+    assert index.percentiles(db, "Two Sum", "python", 25.0, 1.5) == (50.0, 75.0)
+    assert index.size("Two Sum", "python") == 4
+
+    index.record(db, "Two Sum", "python", 5.0, 0.5)
+    assert index.percentiles(db, "Two Sum", "python", 25.0, 5.0) == (40.0, 0.0)
+
+
+def test_empty_partition_beats_everyone():
+    index = DistributionIndex()
+    assert index.percentiles(_session(), "Two Sum", "python", 12.0, None) == (100.0, None)
+
+
+def test_metered_cost_is_ranked_apart_from_cpu_time():
+    db = _session()
+    db.add(Submission(user_id="u", problem_id="Two Sum", language="python",
+                      status="accepted", runtime_ms=10.0, memory_mb=1.0))
+    db.add(Submission(user_id="u", problem_id="Two Sum", language="python",
+                      status="accepted", runtime_ms=30.0, cost_ms=500.0, memory_mb=3.0))
+    db.commit()
+
+    index = DistributionIndex()
+    assert index.percentiles(db, "Two Sum", "python", 20.0, 2.0) == (50.0, 50.0)
+    # Only runs that were metered are in the cost distribution
+    assert index.percentiles(db, "Two Sum", "python", 20.0, 2.0, metric="cost_ms") == (100.0, 50.0)
+    assert index.size("Two Sum", "python", "cost_ms") == 1
+
+    index.record(db, "Two Sum", "python", 40.0, 4.0, cost_ms=100.0)
+    assert index.size("Two Sum", "python") == 3 and index.size("Two Sum", "python", "cost_ms") == 2
+    assert index.percentiles(db, "Two Sum", "python", 200.0, None, metric="cost_ms") == (50.0, None)
+
+
+def test_slow_partition_load_does_not_block_other_partitions():
+    import threading
+
+    loading, release = threading.Event(), threading.Event()
+    loads = []
+
+    class _SlowIndex(DistributionIndex):
+        def _load(self, db, problem_id, language, metric):
+            loads.append((problem_id, metric))
+            if problem_id == "Two Sum":
+                loading.set()
+                release.wait(5)
+            return [10.0]
+
+    index = _SlowIndex()
+    lookups = [threading.Thread(target=index.percentiles, args=(None, "Two Sum", "python", 5.0, None))
+               for _ in range(3)]
+    for lookup in lookups:
+        lookup.start()
+
+    # Another problem is answered while Two Sum is still loading
+    assert loading.wait(5)
+    assert index.percentiles(None, "3Sum", "python", 5.0, None) == (100.0, None)
+    release.set()
+    for lookup in lookups:
+        lookup.join()
+    # Concurrent first lookups of one partition share a single load
+    assert loads.count(("Two Sum", "runtime_ms")) == 1
+
+    # A partition loaded by record() already holds the committed run
+    index.record(None, "Valid Anagram", "python", 10.0, None)
+    assert index.size("Valid Anagram", "python") == 1
+
+
+def test_record_during_reload_after_rebuild_is_kept():
+    import threading
+
+    loading, release = threading.Event(), threading.Event()
+
+    class _SlowIndex(DistributionIndex):
+        slow = False
+
+        def _load(self, db, problem_id, language, metric):
+            if self.slow:
+                loading.set()
+                release.wait(5)
+            return [10.0]
+
+    index = _SlowIndex()
+    assert index.percentiles(None, "Two Sum", "python", 5.0, None) == (100.0, None)
+    index.slow = True
+    index.rebuild(None, "Two Sum")
+
+    # A run accepted while the partition reloads from a snapshot that predates it
+    lookup = threading.Thread(target=index.percentiles, args=(None, "Two Sum", "python", 5.0, None))
+    lookup.start()
+    assert loading.wait(5)
+    recorder = threading.Thread(target=index.record, args=(None, "Two Sum", "python", 20.0, None))
+    recorder.start()
+    release.set()
+    lookup.join()
+    recorder.join()
+    assert index.size("Two Sum", "python") == 2
@@ -0,0 +1,42 @@
+from analyzers.empirical_complexity import fit_complexity
+
+
+def _samples(curve, sizes=(64, 128, 256, 512, 1024, 2048, 4096)):
+    return [(n, curve(n) * 1e-7 + 2e-5) for n in sizes]
+
+
+def test_fits_linear_and_quadratic_growth():
+    linear = fit_complexity(_samples(lambda n: n))
+    assert linear.time_complexity == "O(n)"
+    assert linear.confidence > 0.5
+
+    quadratic = fit_complexity(_samples(lambda n: n * n))
+    assert quadratic.time_complexity == "O(n²)"
+    assert quadratic.confidence > 0.5
+
+
+def test_too_few_or_too_fast_samples_are_not_trusted():
+    assert fit_complexity([(64, 1e-3), (128, 2e-3)]) is None
+    assert fit_complexity([(n, 1e-6) for n in (64, 128, 256, 512)]).confidence == 0.0
+
+
+def test_profile_on_generated_inputs_in_pool():
+    from judge.pool import JudgePool
+
+    quadratic = (
+        "class Solution:\n"
+        "    def twoSum(self, nums, target):\n"
+        "        for i in range(len(nums)):\n"
+        "            for j in range(i + 1, len(nums)):\n"
+        "                if nums[i] + nums[j] == target:\n"
+        "                    return [i, j]\n"
+    )
+    pool = JudgePool(size=1)
+    try:
+        samples = pool.profile(quadratic, "Two Sum", budget_s=0.5)
+        assert pool.profile(quadratic, "Unknown Problem", budget_s=0.5) == []
+    finally:
+        pool.shutdown()
+
+    assert len(samples) >= 4
+    assert fit_complexity(samples).time_complexity == "O(n²)"
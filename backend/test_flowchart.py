@@ -0,0 +1,67 @@
+import ast
+
+from analyzers.code_analyzer import CodeAnalyzer
+from analyzers.flowchart import FragmentCache, function_hash, render_statements
+from config.settings import settings
+from scripts.benchmark_complexity_analyzer import flat_statements, nested_loops
+
+SOLUTION = '''def solve(nums):
+    total = 0
+    best = None
+    label = "sum of " + str(len(nums)) + " numbers, each one added to the running total in order"
+    seen = set()
+    for x in nums:
+        total += x
+    return total
+'''
+
+
+def node_lines(diagram):
+    return [line for line in diagram.split("\n")[1:] if "-->" not in line]
+
+
+def test_assignment_runs_share_a_box_and_labels_are_safe():
+    diagram = CodeAnalyzer().generate_mermaid_diagram(SOLUTION)
+    boxes = [line for line in node_lines(diagram) if "total = 0" in line]
+    assert len(boxes) == 1 and "<br/>best = None<br/>" in boxes[0] and "… 1 more" in boxes[0]
+    assert "#quot;" not in diagram and "'sum of '" in diagram
+    assert all(len(line) < 4 * settings.FLOWCHART_MAX_LABEL for line in node_lines(diagram))
+
+
+def test_budget_bounds_large_and_deep_programs():
+    for code in (flat_statements(3000), nested_loops(90, 20)):
+        diagram = CodeAnalyzer().generate_mermaid_diagram(code)
+        # Start and End come on top of the budget
+        assert len(node_lines(diagram)) <= settings.FLOWCHART_MAX_NODES + 2
+        assert diagram.count("-->") <= settings.FLOWCHART_MAX_EDGES + 2
+        assert "not shown" in diagram
+
+    # An elif chain nests one If per branch: too deep for a recursive walk
+    elifs = "def f(x):\n    if x == 0:\n        return 0\n" + "".join(
+        f"    elif x == {i}:\n        return {i}\n" for i in range(1, 600))
+    diagram = CodeAnalyzer().generate_mermaid_diagram(elifs)
+    assert "Error" not in diagram and "{\"x == 1?\"}" in diagram
+
+
+def test_functions_are_rendered_once_per_hash():
+    cache = FragmentCache(max_entries=8)
+    tree = ast.parse(SOLUTION)
+    first_key, first = cache.function(tree.body[0], SOLUTION.splitlines(keepends=True))
+    moved = "\n\nimport os\n" + SOLUTION
+    key, fragment = cache.function(ast.parse(moved).body[1], moved.splitlines(keepends=True))
+    assert key == first_key and fragment is first and (cache.hits, cache.misses) == (1, 1)
+    assert function_hash(tree.body[0]) == function_hash(ast.parse(moved).body[1])
+
+    # The same function twice in one source gets distinct node ids
+    twice = render_statements(ast.parse(SOLUTION + SOLUTION).body)
+    ids = [line.split("[")[0].split("(")[0].strip() for line in twice.lines if "-->" not in line]
+    assert len(ids) == len(set(ids)) == 2 * first.nodes
+
+
+def test_streamed_diagram_matches_the_whole_one():
+    code = flat_statements(3000)
+    analyzer = CodeAnalyzer()
+    chunks = list(analyzer.stream_mermaid_diagram(code))
+    assert len(chunks) > 1
+    assert "".join(chunks) == analyzer.generate_mermaid_diagram(code)
+    assert list(analyzer.stream_mermaid_diagram("def broken(:"))[0].startswith("flowchart TD\n    Error")
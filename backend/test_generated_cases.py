@@ -0,0 +1,54 @@
+import pytest
+
+from judge.compare import outputs_match
+from judge.runner import run_tests
+from test_cases import generated
+from test_cases.hidden_tests import HIDDEN_TEST_CASES
+from test_cases.references import REFERENCE_SOLUTIONS
+
+SORTING_TWO_SUM = """
+def twoSum(nums, target):
+    order = sorted(range(len(nums)), key=lambda i: nums[i])
+    lo, hi = 0, len(nums) - 1
+    while lo < hi:
+        total = nums[order[lo]] + nums[order[hi]]
+        if total == target:
+            return sorted([order[lo], order[hi]])
+        if total < target:
+            lo += 1
+        else:
+            hi -= 1
+"""
+
+FIRST_PAIR_ONLY = """
+def twoSum(nums, target):
+    return [0, 1]
+"""
+
+
+@pytest.mark.parametrize("title", sorted(set(REFERENCE_SOLUTIONS) & set(HIDDEN_TEST_CASES)))
+def test_references_agree_with_hand_written_cases(title):
+    reference = REFERENCE_SOLUTIONS[title]
+    for case in HIDDEN_TEST_CASES[title]:
+        expected = case.get("output", case.get("expected"))
+        assert outputs_match(expected, reference.solve(**case["input"]), reference.order_independent)
+
+
+def test_generation_is_deterministic_and_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(generated, "GENERATED_DIR", str(tmp_path))
+    cases = generated.generated_cases("Two Sum", seed=7, sizes=[2, 50], per_size=2)
+    assert [c["generated_size"] for c in cases] == [2, 2, 50, 50, 50]
+    assert cases == generated.generate_cases("Two Sum", 7, [2, 50], 2)
+    assert cases != generated.generate_cases("Two Sum", 8, [2, 50], 2)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    monkeypatch.setattr(generated, "generate_cases", lambda *a, **k: pytest.fail("cache not used"))
+    assert generated.generated_cases("Two Sum", seed=7, sizes=[2, 50], per_size=2) == cases
+    assert generated.generated_cases("No Such Problem") == []
+
+
+def test_generated_cases_separate_correct_and_wrong_solutions(tmp_path, monkeypatch):
+    monkeypatch.setattr(generated, "GENERATED_DIR", str(tmp_path))
+    cases = generated.generated_cases("Two Sum", seed=1, sizes=[2, 3, 10, 100], per_size=3)
+    assert all(passed for passed, _, _ in run_tests(SORTING_TWO_SUM, cases))
+    assert not all(passed for passed, _, _ in run_tests(FIRST_PAIR_ONLY, cases))
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from judge.job_queue import JobFailed, SQLiteJobQueue
+from judge.pool import JudgePool
+from judge.remote import QueueWorker, RemoteJudgePool
+
+TWO_SUM = """
+class Solution:
+    def twoSum(self, nums, target):
+        seen = {}
+        for i, num in enumerate(nums):
+            if target - num in seen:
+                return [seen[target - num], i]
+            seen[num] = i
+"""
+
+CASES = [
+    {"input": {"nums": [2, 7, 11, 15], "target": 9}, "output": [0, 1]},
+    {"input": {"nums": [3, 2, 4], "target": 6}, "output": [0, 0]},
+]
+
+
+def test_lease_order_and_redelivery(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "queue.db"), max_attempts=2)
+    low = queue.enqueue({"n": "rejudge"}, priority=3)
+    high = queue.enqueue({"n": "battle"}, priority=0)
+
+    assert queue.lease("a", lease_seconds=60) == (high, {"n": "battle"})
+    assert queue.lease("a", lease_seconds=0.01)[0] == low
+    time.sleep(0.05)
+
+    # Worker "a" went silent: the expired lease is handed to "b"
+    assert queue.lease("b", lease_seconds=60)[0] == low
+    assert queue.complete(low, "b", "from b") is True
+    # The late duplicate from "a" does not overwrite it
+    assert queue.complete(low, "a", "from a") is False
+    assert queue.wait(low, timeout=1) == "from b"
+    assert queue.lease("c", lease_seconds=60) is None
+
+
+def test_job_fails_after_max_attempts(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "queue.db"), max_attempts=1)
+    job_id = queue.enqueue({"poison": True})
+    queue.lease("a", lease_seconds=0.01)
+    time.sleep(0.05)
+
+    assert queue.lease("b", lease_seconds=60) is None
+    with pytest.raises(JobFailed):
+        queue.wait(job_id, timeout=1)
+
+
+def test_remote_pool_round_trip(tmp_path):
+    queue = SQLiteJobQueue(str(tmp_path / "queue.db"))
+    pool = JudgePool(size=1)
+    worker = QueueWorker(queue, pool, heartbeat_seconds=0.1, worker_id="node-1")
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    try:
+        remote = RemoteJudgePool(queue, timeout=30)
+        seen = []
+        report = remote.judge(TWO_SUM, CASES, on_case=lambda i, result: seen.append(i))
+
+        assert [passed for passed, _, _ in report.results] == [True, False]
+        assert seen == [0, 1]
+        assert [w["worker_id"] for w in remote.metrics()["workers"]] == ["node-1"]
+    finally:
+        worker.stop()
+        thread.join()
+        pool.shutdown()
+
+    assert queue.workers(alive_within=60) == []
+    assert queue.depth() == {}
@@ -0,0 +1,399 @@
+import math
+
+from judge import namespace
+from judge.pool import JudgePool
+
+TWO_SUM = """
+class Solution:
+    def twoSum(self, nums, target):
+        seen = {}
+        for i, num in enumerate(nums):
+            if target - num in seen:
+                return [seen[target - num], i]
+            seen[num] = i
+"""
+
+CASES = [
+    {"input": {"nums": [2, 7, 11, 15], "target": 9}, "output": [0, 1]},
+    {"input": {"nums": [3, 2, 4], "target": 6}, "output": [1, 2]},
+    {"input": {"nums": [3, 3], "target": 6}, "output": [0, 0]},
+]
+
+
+def test_run_tests_reports_each_case():
+    pool = JudgePool(size=1)
+    try:
+        results = pool.run_tests(TWO_SUM, CASES)
+    finally:
+        pool.shutdown()
+
+    assert [passed for passed, _, _ in results] == [True, True, False]
+    assert results[2][1] == [0, 1]
+
+
+def allow_modules(monkeypatch, *names):
+    """Let test submissions import modules judged code may not (workers fork after this)"""
+    monkeypatch.setattr(namespace, "ALLOWED_MODULES", namespace.ALLOWED_MODULES | set(names))
+
+
+def test_worker_crash_is_reported_and_replaced(monkeypatch):
+    allow_modules(monkeypatch, "os")
+    pool = JudgePool(size=1, fork_per_job=False)
+    try:
+        results = pool.run_tests("import os\nos._exit(1)", CASES[:1])
+        assert results[0][0] is False
+        assert "terminated abnormally" in results[0][2]
+
+        # The pool keeps serving with a fresh worker
+        results = pool.run_tests(TWO_SUM, CASES[:1])
+        assert results[0][0] is True
+        assert pool.recycled == 1
+    finally:
+        pool.shutdown()
+
+
+def test_worker_recycled_after_max_jobs():
+    pool = JudgePool(size=1, max_jobs_per_worker=2)
+    try:
+        pids = set()
+        for _ in range(4):
+            reply = pool._dispatch({"kind": "tests", "code": TWO_SUM, "test_cases": CASES[:1]})
+            pids.add(reply["pid"])
+        assert len(pids) == 2
+    finally:
+        pool.shutdown()
+
+
+def test_code_loaded_once_per_submission():
+    from judge.runner import run_tests
+
+    code = """
+LOADS = []
+LOADS.append(1)
+
+class Solution:
+    def count(self, x):
+        return len(LOADS)
+"""
+    cases = [{"input": {"x": i}, "output": 1} for i in range(5)]
+    assert all(passed for passed, _, _ in run_tests(code, cases))
+
+
+def test_stateful_solution_gets_fresh_instance():
+    from judge.runner import run_tests
+
+    code = """
+class Solution:
+    def __init__(self):
+        self.calls = 0
+
+    def bump(self, x):
+        self.calls += 1
+        return self.calls
+"""
+    cases = [{"input": {"x": i}, "output": 1} for i in range(3)]
+    assert all(passed for passed, _, _ in run_tests(code, cases))
+
+
+class _SlowPool:
+    def __init__(self, delay):
+        self.delay = delay
+
+    def run_tests(self, code, test_cases, fresh_instance=False, priority="run", user=None):
+        import time
+        time.sleep(self.delay)
+        return [(True, None, None)] * len(test_cases)
+
+
+def test_async_judge_rejects_when_saturated():
+    import asyncio
+    from judge.async_judge import AsyncJudge, JudgeBusy
+
+    async def scenario():
+        judge = AsyncJudge(max_in_flight=1, max_queue=1, pool=_SlowPool(0.2), max_per_user=2)
+        running = asyncio.ensure_future(judge.run_tests("", CASES[:1], user="a"))
+        queued = asyncio.ensure_future(judge.run_tests("", CASES[:1], user="b"))
+        await asyncio.sleep(0.05)
+
+        # The event loop stays responsive while both jobs are pending
+        assert judge.pending["run"] == 2
+        try:
+            await judge.run_tests("", CASES[:1], user="c")
+            raise AssertionError("expected JudgeBusy")
+        except JudgeBusy:
+            pass
+
+        # The backlog is per class: a battle still gets in
+        battle = asyncio.ensure_future(judge.run_tests("", CASES[:1], priority="battle", user="a"))
+        await asyncio.sleep(0.05)
+        # ...but one user can only have so many jobs pending
+        try:
+            await judge.run_tests("", CASES[:1], priority="submit", user="a")
+            raise AssertionError("expected JudgeBusy")
+        except JudgeBusy:
+            pass
+
+        assert len(await running) == 1
+        assert len(await queued) == 1
+        assert len(await battle) == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_wait_keeps_the_slot_until_the_job_ends():
+    import asyncio
+    from judge.async_judge import AsyncJudge, JudgeBusy
+
+    async def scenario():
+        judge = AsyncJudge(max_in_flight=1, max_queue=0, pool=_SlowPool(0.2), max_per_user=1)
+        waiting = asyncio.ensure_future(judge.run_tests("", CASES[:1], user="a"))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.sleep(0.01)
+
+        # The job is still running on its thread, so its slot is still taken
+        assert judge.pending["run"] == 1
+        try:
+            await judge.run_tests("", CASES[:1], user="b")
+            raise AssertionError("expected JudgeBusy")
+        except JudgeBusy:
+            pass
+
+        await asyncio.sleep(0.3)
+        assert judge.pending["run"] == 0 and judge.metrics()["users_pending"] == 0
+        assert len(await judge.run_tests("", CASES[:1], user="a")) == 1
+
+    asyncio.run(scenario())
+
+
+def test_infinite_loop_gets_time_limit_exceeded():
+    pool = JudgePool(size=1, test_time_limit=0.2, total_time_limit=1)
+    try:
+        code = "def spin(x):\n    while True:\n        pass\n"
+        cases = [{"input": {"x": i}, "output": None} for i in range(3)]
+        results = pool.run_tests(code, cases)
+        assert [error for _, _, error in results][:2] == ["Time Limit Exceeded"] * 2
+    finally:
+        pool.shutdown()
+
+
+def test_swallowed_timeout_is_killed_by_pool():
+    pool = JudgePool(size=1, test_time_limit=0.2, total_time_limit=1)
+    try:
+        code = "def spin(x):\n    while True:\n        try:\n            pass\n        except:\n            pass\n"
+        results = pool.run_tests(code, [{"input": {"x": 1}, "output": None}])
+        assert results[0][2] == "Time Limit Exceeded"
+        assert pool.run_tests(TWO_SUM, CASES[:1])[0][0] is True
+    finally:
+        pool.shutdown()
+
+
+def test_huge_allocation_gets_memory_limit_exceeded():
+    pool = JudgePool(size=1, job_memory_mb=64, fork_per_job=False)
+    try:
+        code = "def grab(n):\n    return len([0] * n)\n"
+        results = pool.run_tests(code, [{"input": {"n": 10 ** 9}, "output": 10 ** 9}])
+        assert results[0][2] == "Memory Limit Exceeded"
+        assert pool.recycled == 1
+    finally:
+        pool.shutdown()
+
+
+def test_judge_measures_hidden_cases_only():
+    pool = JudgePool(size=1)
+    try:
+        report = pool.judge(TWO_SUM, CASES[:2], measure_from=1, warmup=1, repeat=3)
+        rejected = pool.judge(TWO_SUM, CASES, measure_from=1, warmup=1, repeat=3)
+    finally:
+        pool.shutdown()
+
+    # Visible case 0 is not measured, and nothing is measured for rejected code
+    assert report.metrics[0] is None
+    assert not rejected.measured
+    assert report.metrics[1].samples == 3
+    assert report.runtime_ms == report.metrics[1].cpu_ms
+    assert report.metrics[1].wall_ms > 0
+    assert report.memory_mb > 0
+
+
+def test_fail_fast_stops_at_first_hidden_failure():
+    from judge.runner import judge_suite
+
+    code = "def ident(x):\n    return x\n"
+    cases = [
+        {"input": {"x": 1}, "output": 2},  # visible, fails
+        {"input": {"x": 2}, "output": 2},  # visible, passes
+        {"input": {"x": 3}, "output": 3},  # hidden
+    ]
+    report = judge_suite(code, cases, fail_fast_from=2, measure_from=2)
+    # Every visible case is reported, hidden ones are skipped once the verdict is known
+    assert [r[0] for r in report.results] == [False, True]
+    assert not report.measured
+
+    report = judge_suite(code, cases, measure_from=2)
+    assert [r[0] for r in report.results] == [False, True, True]
+
+
+def test_metered_cost_is_deterministic():
+    pool = JudgePool(size=2)
+    try:
+        first = pool.judge(TWO_SUM, CASES[:2], measure_from=0, meter=True)
+        second = pool.judge(TWO_SUM, CASES[:2], measure_from=0, meter=True)
+        unmetered = pool.judge(TWO_SUM, CASES[:2], measure_from=0)
+    finally:
+        pool.shutdown()
+
+    assert first.operations > 0
+    assert first.operations == second.operations
+    assert [m.operations for m in first.metrics] == [m.operations for m in second.metrics]
+    assert first.cost_ms == second.cost_ms > 0
+    assert unmetered.operations is None and unmetered.cost_ms is None
+
+
+def test_streamed_verdicts_arrive_per_case_and_stop_on_cancel(monkeypatch):
+    import asyncio
+    import time
+    from judge.async_judge import AsyncJudge
+
+    allow_modules(monkeypatch, "time")
+    slow = "import time\ndef ident(x):\n    time.sleep(0.2)\n    return x\n"
+    cases = [{"input": {"x": i}, "output": i} for i in range(10)]
+    pool = JudgePool(size=1)
+
+    async def scenario():
+        judge = AsyncJudge(max_in_flight=1, pool=pool)
+        events = [event async for event in judge.judge_stream(TWO_SUM, CASES)]
+        assert [e[1] for e in events[:-1]] == [0, 1, 2]
+        assert events[-1][0] == "report" and len(events[-1][1].results) == 3
+
+        # The first verdict arrives long before the whole suite would finish
+        started = time.monotonic()
+        stream = judge.judge_stream(slow, cases)
+        first = await stream.__anext__()
+        assert first[:2] == ("case", 0) and time.monotonic() - started < 1.0
+        await stream.aclose()
+
+        # The worker drops the remaining cases and is free again well before 2s
+        results = await judge.run_tests(TWO_SUM, CASES[:2])
+        assert time.monotonic() - started < 1.5
+        assert all(passed for passed, _, _ in results)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+
+def test_packed_suite_gives_every_run_a_pristine_input():
+    from judge.inputs import PackedCases
+
+    # Both cases share one list object, and the solution mutates its argument
+    shared = [3, 1, 2]
+    mutating = "def grow(nums):\n    nums.append(0)\n    return len(nums)\n"
+    hidden = PackedCases([{"input": {"nums": shared}, "output": 4}] * 2)
+    cases = hidden.with_prefix([{"input": {"nums": shared}, "output": 4}])
+    pool = JudgePool(size=1)
+    try:
+        first = pool.judge(mutating, cases, measure_from=1, repeat=3)
+        worker = pool.scheduler.drain_idle()[0]
+        assert list(worker.suites) == [hidden.version]
+        pool.scheduler.add(worker)
+        # The second job refers to the suite the worker already holds
+        second = pool.judge(mutating, hidden.with_prefix([]))
+    finally:
+        pool.shutdown()
+
+    assert [passed for passed, _, _ in first.results] == [True, True, True]
+    assert first.measured
+    assert [passed for passed, _, _ in second.results] == [True, True]
+    assert shared == [3, 1, 2]
+
+
+def test_forked_jobs_share_a_pristine_template(monkeypatch):
+    allow_modules(monkeypatch, "os")
+    pool = JudgePool(size=1, job_memory_mb=64, fork_per_job=True)
+    try:
+        # Starter-code annotations resolve without imports
+        typed = "class Solution:\n    def twoSum(self, nums: List[int], target: int) -> List[int]:\n" \
+                "        return [i for i, n in enumerate(nums) for m in nums[i + 1:] if n + m == target][:1] + [1]\n"
+        assert pool.run_tests(typed, CASES[:1])[0][0] is True
+
+        # A job that vandalizes shared modules only damages its own child
+        vandal = "def f(x):\n    math.pi = 3\n    return math.pi\n"
+        assert pool.run_tests(vandal, [{"input": {"x": 0}, "output": 3}])[0][0] is True
+        check = "def f(x):\n    return math.pi\n"
+        assert pool.run_tests(check, [{"input": {"x": 0}, "output": math.pi}])[0][0] is True
+
+        # Crashing or exhausting memory kills the child, not the worker
+        crashed = pool.run_tests("import os\nos._exit(1)", CASES[:1])
+        assert "terminated abnormally" in crashed[0][2]
+        grab = "def grab(n):\n    return len([0] * n)\n"
+        assert pool.run_tests(grab, [{"input": {"n": 10 ** 9}, "output": 0}])[0][2] == "Memory Limit Exceeded"
+        assert pool.run_tests(TWO_SUM, CASES[:1])[0][0] is True
+        assert pool.recycled == 0
+    finally:
+        pool.shutdown()
+
+
+def test_submissions_only_import_allowed_modules():
+    escapes = [
+        "import os\ndef f(x):\n    return x\n",
+        "def f(x):\n    return __import__('subprocess')\n",
+        "def f(x):\n    return open('/etc/passwd').read()\n",
+        "def f(x):\n    return eval('x')\n",
+    ]
+    allowed = "from typing import List\nimport collections.abc, re\ndef f(x):\n    return x\n"
+    pool = JudgePool(size=1)
+    try:
+        results = [pool.run_tests(code, [{"input": {"x": 1}, "output": 1}])[0] for code in escapes]
+        assert pool.run_tests(allowed, [{"input": {"x": 1}, "output": 1}])[0][0] is True
+    finally:
+        pool.shutdown()
+
+    assert [error.split(":")[0] for _, _, error in results] == ["ImportError", "ImportError", "NameError", "NameError"]
+
+
+def test_sub_millisecond_cases_get_a_nonzero_cpu_time():
+    code = "def work(n):\n    total = 0\n    for i in range(n):\n        total += i * i\n    return total\n"
+    cases = [{"input": {"n": 5000}, "output": sum(i * i for i in range(5000))}]
+    pool = JudgePool(size=1)
+    try:
+        # The pool arms its per-case and whole-submission limits around every run
+        report = pool.judge(code, cases, measure_from=0, repeat=3)
+    finally:
+        pool.shutdown()
+
+    assert report.results[0][0]
+    assert 0 < report.metrics[0].cpu_ms < 50
+    assert report.runtime_ms > 0
+
+
+def test_job_child_cannot_lift_its_limits(tmp_path):
+    import os
+    import resource
+    from judge.limits import lock_down
+
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            lock_down(1)
+            soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            assert soft == hard != resource.RLIM_INFINITY
+            try:
+                resource.setrlimit(resource.RLIMIT_CPU, (hard + 10, hard + 10))
+                raise AssertionError("raised the hard CPU limit")
+            except ValueError:
+                pass
+            assert resource.getrlimit(resource.RLIMIT_NPROC) == (0, 0)
+            try:
+                with open(tmp_path / "fill", "w") as f:
+                    f.write("x" * 4096)
+                raise AssertionError("wrote a file")
+            except OSError:
+                pass
+            code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
@@ -0,0 +1,64 @@
+import threading
+import time
+
+from judge.scheduler import FairScheduler
+
+
+def _queue_jobs(scheduler, jobs):
+    """Start one thread per (priority, user) job, each parked in the scheduler in this order"""
+    order, threads = [], []
+
+    def job(priority, user):
+        worker = scheduler.acquire(priority, user)
+        order.append((priority, user))
+        scheduler.done(priority)
+        scheduler.add(worker)
+
+    for priority, user in jobs:
+        thread = threading.Thread(target=job, args=(priority, user))
+        thread.start()
+        threads.append(thread)
+        while scheduler.depth() < len(threads):
+            time.sleep(0.001)
+    return order, threads
+
+
+def test_battles_first_and_users_take_turns():
+    scheduler = FairScheduler()
+    scheduler.add("worker")
+    busy = scheduler.acquire("run", "spammer")
+
+    order, threads = _queue_jobs(scheduler, [
+        ("run", "spammer"), ("run", "spammer"), ("run", "spammer"),
+        ("run", "other"), ("battle", "player"),
+    ])
+    assert scheduler.metrics()["run"]["queued"] == 4
+
+    scheduler.done("run")
+    scheduler.add(busy)
+    for thread in threads:
+        thread.join(timeout=2)
+
+    assert order[0] == ("battle", "player")
+    # One spammer cannot push the other user to the back of the class
+    assert [user for _, user in order[1:]] == ["spammer", "other", "spammer", "spammer"]
+
+    metrics = scheduler.metrics()
+    assert metrics["run"]["dispatched"] == 5 and metrics["run"]["queued"] == 0
+    assert metrics["run"]["in_flight"] == 0 and metrics["battle"]["wait_ms_max"] > 0
+
+
+def test_weighted_share_under_contention():
+    scheduler = FairScheduler({"battle": 8, "submit": 4, "run": 2, "rejudge": 1})
+    scheduler.add("worker")
+    busy = scheduler.acquire("submit")
+
+    order, threads = _queue_jobs(scheduler, [("rejudge", i) for i in range(6)] + [("run", i) for i in range(6)])
+    scheduler.done("submit")
+    scheduler.add(busy)
+    for thread in threads:
+        thread.join(timeout=2)
+
+    # Run has twice the weight: it gets about two workers for each background re-judge
+    first_six = [priority for priority, _ in order[:6]]
+    assert first_six.count("run") == 4 and first_six.count("rejudge") == 2
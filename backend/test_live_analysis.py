@@ -0,0 +1,82 @@
+import asyncio
+
+from analyzers.live_analysis import EditCoalescer, LiveSession, split_blocks
+
+CODE = """import heapq
+
+@staticmethod
+def total(nums):
+    result = 0
+    for x in nums:
+        if x > 0:
+            result += x
+# kept with total()
+    return result
+
+GRID = [
+[1, 2],
+]
+
+print(total(GRID[0]))
+"""
+
+
+def test_split_blocks_keeps_decorators_and_continuations():
+    blocks = split_blocks(CODE)
+    # "[1, 2]," starts a block of its own, the closing "]" continues it
+    assert [start for start, _ in blocks] == [1, 3, 12, 13, 16]
+    assert blocks[1][1].startswith("@staticmethod\ndef total") and blocks[1][1].endswith("return result")
+
+
+def test_edit_reanalyzes_only_the_changed_block():
+    session = LiveSession()
+    first = session.update(CODE)
+    # The literal split over column-0 lines is joined back into one block
+    assert len(first.order) == 4 and session.analyzed == 4
+    assert first.complexity == 3 and not first.errors
+    assert {v["name"] for v in first.variables_added} == {"nums", "result", "GRID"}
+    assert session.diagram().count("-->") > 5
+
+    edited = session.update(CODE.replace("result = 0", "acc = result = 0"))
+    assert session.analyzed == 5 and len(edited.added) == 1
+    assert edited.removed == [first.order[1]] and edited.order[0] == first.order[0]
+    assert [v["name"] for v in edited.variables_added] == ["acc"] and not edited.variables_removed
+
+    # Same text again: nothing to analyze, nothing to send
+    again = session.update(CODE.replace("result = 0", "acc = result = 0"))
+    assert session.analyzed == 5 and not again.added and not again.removed
+
+
+def test_syntax_error_stays_in_its_block():
+    session = LiveSession()
+    session.update(CODE)
+    broken = session.update(CODE.replace("result = 0", "result = (0"))
+    assert len(broken.order) == 4 and len(broken.added) == 1
+    assert broken.errors == ["Syntax error: '(' was never closed (line 5)"]
+    assert not broken.to_dict()["success"]
+    assert "print()" in session.diagram()
+
+
+def test_coalescer_analyzes_the_newest_buffer_of_a_burst():
+    async def scenario():
+        edits = EditCoalescer(quiet_s=0.05, max_delay_s=1.0)
+        for version in range(1, 301):
+            edits.push(CODE[:version], version)
+            if version % 50 == 0:
+                await asyncio.sleep(0.01)
+        assert await edits.next() == (CODE[:300], 300)
+
+        # Continuous typing still gets an update once max_delay_s has passed
+        edits = EditCoalescer(quiet_s=0.05, max_delay_s=0.1)
+
+        async def typing():
+            for version in range(20):
+                edits.push("x", version)
+                await asyncio.sleep(0.02)
+
+        typist = asyncio.ensure_future(typing())
+        code, version = await edits.next()
+        assert version < 19
+        await typist
+
+    asyncio.run(scenario())
@@ -0,0 +1,138 @@
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from config.database import Base
+from judge.pool import JudgePool
+from judge.rejudge import RejudgeJob
+from models.submission import Submission
+
+HASH_MAP = """
+class Solution:
+    def twoSum(self, nums, target):
+        seen = {}
+        for i, num in enumerate(nums):
+            if target - num in seen:
+                return [seen[target - num], i]
+            seen[num] = i
+"""
+
+# Passes the first visible and hidden cases only
+FIRST_TWO = """
+class Solution:
+    def twoSum(self, nums, target):
+        return [0, 1]
+"""
+
+
+def _session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine, tables=[Submission.__table__])
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    for i in range(7):
+        code = HASH_MAP if i % 2 else FIRST_TWO
+        db.add(Submission(user_id=f"u{i}", problem_id="Two Sum", code=code, language="python",
+                          status="accepted", points=100))
+    db.add(Submission(user_id="u", problem_id="3Sum", code=FIRST_TWO, language="python",
+                      status="accepted", points=100))
+    db.commit()
+    db.close()
+    return factory
+
+
+def test_rejudge_updates_verdicts_in_chunks_and_resumes(tmp_path):
+    factory = _session_factory()
+    checkpoint = str(tmp_path / "two-sum.json")
+    pool = JudgePool(size=2)
+    seen = []
+    try:
+        job = RejudgeJob("Two Sum", chunk_size=3, checkpoint_path=checkpoint, pool=pool)
+        progress = job.run(factory, on_progress=lambda p: seen.append(p.last_id))
+
+        # A finished run is not resumed: it starts over and finds nothing left to change
+        again = RejudgeJob("Two Sum", chunk_size=3, checkpoint_path=checkpoint, pool=pool).run(factory)
+    finally:
+        pool.shutdown()
+
+    assert seen == [3, 6, 7]
+    assert (progress.processed, progress.accepted, progress.failed, progress.changed) == (7, 3, 4, 4)
+    assert (again.processed, again.changed) == (7, 0)
+
+    db = factory()
+    rows = db.query(Submission).order_by(Submission.id).all()
+    assert [r.status for r in rows[:7]] == ["failed", "accepted"] * 3 + ["failed"]
+    assert [r.points for r in rows[:7]] == [0, 100] * 3 + [0]
+    # Other problems are untouched
+    assert rows[7].status == "accepted"
+
+
+def test_rejudge_resumes_from_checkpoint(tmp_path):
+    factory = _session_factory()
+    checkpoint = str(tmp_path / "two-sum.json")
+    pool = JudgePool(size=1)
+    try:
+        job = RejudgeJob("Two Sum", chunk_size=3, checkpoint_path=checkpoint, pool=pool)
+        job.run(factory)
+        with open(checkpoint) as f:
+            data = json.load(f)
+        # Pretend the run died after its first chunk
+        data.update(last_id=3, processed=3, done=False)
+        with open(checkpoint, "w") as f:
+            json.dump(data, f)
+
+        progress = RejudgeJob("Two Sum", chunk_size=3, checkpoint_path=checkpoint, pool=pool).run(factory)
+    finally:
+        pool.shutdown()
+
+    assert progress.processed == 7
+    assert progress.done
+
+
+def test_unanalyzable_code_is_scored_instead_of_stopping_the_run():
+    from types import SimpleNamespace
+
+    class _BrokenAnalyzer:
+        def analyze(self, code):
+            raise RecursionError("maximum recursion depth exceeded")
+
+    job = RejudgeJob("Two Sum", pool=SimpleNamespace(size=1))
+    job._analyzer = _BrokenAnalyzer()
+    assert job._points(HASH_MAP, SimpleNamespace(status="failed", points=0)) == 50
+
+
+def test_timeouts_are_retried_and_never_demote_accepted_rows():
+    from judge.limits import TIME_LIMIT_EXCEEDED
+    from judge.measure import JudgeReport
+
+    class _OverloadedPool:
+        size = 1
+
+        def __init__(self):
+            self.priorities = []
+
+        def judge(self, code, suite, fail_fast_from=None, priority="submit"):
+            self.priorities.append(priority)
+            if code == HASH_MAP:
+                return JudgeReport(results=[(False, None, TIME_LIMIT_EXCEEDED)], metrics=[None])
+            return JudgeReport(results=[(True, None, None), (False, [0, 1], None)], metrics=[None, None])
+
+    factory = _session_factory()
+    pool = _OverloadedPool()
+    job = RejudgeJob("Two Sum", pool=pool)
+    progress = job.run(factory)
+
+    # The wrong answer is judged once; the timeout once more at submit priority
+    assert sorted(pool.priorities) == ["rejudge", "rejudge", "submit"]
+    assert (progress.processed, progress.failed, progress.inconclusive, progress.changed) == (7, 4, 3, 4)
+    db = factory()
+    rows = db.query(Submission).order_by(Submission.id).all()
+    assert [r.status for r in rows[:7]] == ["failed", "accepted"] * 3 + ["failed"]
+    assert [r.points for r in rows[:7]] == [0, 100] * 3 + [0]
+
+    # Inconclusive verdicts are not cached
+    pool.priorities.clear()
+    job.run(factory, restart=True)
+    assert sorted(pool.priorities) == ["rejudge", "submit"]
@@ -0,0 +1,38 @@
+from judge.result_cache import ResultCache, code_fingerprint, is_cacheable
+
+CASES = [{"input": {"nums": [1, 2]}, "output": 3}]
+
+
+def test_fingerprint_ignores_whitespace_comments_and_docstrings():
+    original = "class Solution:\n    def f(self, nums):\n        return sum(nums)\n"
+    edited = (
+        '"""My solution"""\n'
+        "class Solution:\n"
+        "    def f(self, nums):  # sums it\n"
+        '        """Add them up."""\n\n'
+        "        return sum( nums )\n"
+    )
+    assert code_fingerprint(original) == code_fingerprint(edited)
+    assert code_fingerprint(original) != code_fingerprint(original.replace("sum", "max"))
+
+
+def test_suite_change_misses_and_lru_evicts():
+    cache = ResultCache(max_size=2)
+    key = cache.key("Two Sum", CASES, "x = 1")
+    cache.set(key, "verdict")
+    assert cache.get(cache.key("Two Sum", CASES, "x  =  1  # same")) == "verdict"
+    assert cache.get(cache.key("Two Sum", [{"input": {"nums": [1]}, "output": 1}], "x = 1")) is None
+
+    cache.set(cache.key("Two Sum", CASES, "x = 2"), "b")
+    cache.get(key)  # refresh
+    cache.set(cache.key("Two Sum", CASES, "x = 3"), "c")
+    assert cache.get(key) == "verdict"
+    assert cache.get(cache.key("Two Sum", CASES, "x = 2")) is None
+
+    cache.invalidate_problem("Two Sum")
+    assert len(cache) == 0
+
+
+def test_timeouts_are_not_cached():
+    assert is_cacheable([(True, 3, None), (False, None, "IndexError: list index out of range")])
+    assert not is_cacheable([(False, None, "Time Limit Exceeded")])
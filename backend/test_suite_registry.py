@@ -0,0 +1,108 @@
+import threading
+import time
+
+from analyzers.code_executor import CodeExecutor
+from judge.compare import outputs_match
+from judge.runner import run_tests
+from test_cases import registry
+from test_cases.registry import SuiteRegistry, freeze_case, slugify
+
+GROUP_ANAGRAMS = """
+def groupAnagrams(strs):
+    groups = {}
+    for s in strs:
+        groups.setdefault("".join(sorted(s)), []).append(s)
+    return list(groups.values())
+"""
+
+
+def _registry():
+    suites = SuiteRegistry(reload_interval=3600)
+    suites.load()
+    return suites
+
+
+def test_suites_merge_sources_by_title_or_slug():
+    suites = _registry()
+    two_sum = suites.get("Two Sum")
+    assert two_sum is suites.get("two-sum")
+    assert two_sum.problem_id == "Two Sum"
+    assert two_sum.function_name == "twoSum"
+    assert two_sum.visible and two_sum.hidden
+    assert len(two_sum.cases) == len(two_sum.visible) + len(two_sum.hidden)
+    assert suites.get("No Such Problem") is None
+    assert suites.hidden_cases("No Such Problem") == []
+
+
+def test_invalid_cases_are_rejected_and_order_independent_ones_canonicalized():
+    assert freeze_case({"input": [1, 2], "output": 3}, 0) is None
+    assert freeze_case({"input": {"x": 1}}, 0) is None
+
+    case = freeze_case({"input": {"x": 1}, "expected": [["b", "a"], ["c"]], "order_independent": True}, 0)
+    assert case.canonical == [["a", "b"], ["c"]]
+    assert outputs_match(case.output, [["c"], ["a", "b"]], True, case.canonical)
+    assert not outputs_match(case.output, [["c"], ["a", "b"]])
+    assert slugify("Best Time to Buy and Sell Stock") == "best-time-to-buy-and-sell-stock"
+
+
+def test_executor_and_judge_honour_order_independence():
+    suite = _registry().get("group-anagrams")
+    result = CodeExecutor().execute_tests(GROUP_ANAGRAMS, suite.function_name, suite.visible_cases)
+    assert result.all_passed
+
+    judged = run_tests(GROUP_ANAGRAMS, list(suite.visible_cases))
+    assert all(passed for passed, _, _ in judged)
+    # The shared suite was not touched by the runs
+    assert suite.visible_cases == _registry().get("group-anagrams").visible_cases
+
+
+def test_registry_rebuilds_when_a_source_changes(monkeypatch):
+    suites = SuiteRegistry(reload_interval=0)
+    suites.load()
+    before = suites.get("Two Sum")
+
+    # Hold the background rebuild until the reader below has been served
+    release = threading.Event()
+    rebuild = suites._rebuild
+    monkeypatch.setattr(suites, "_rebuild", lambda signature: release.wait(10) and rebuild(signature))
+    monkeypatch.setitem(registry.hidden_tests.HIDDEN_TEST_CASES, "Two Sum",
+                        [{"input": {"nums": [5, 5], "target": 10}, "output": [0, 1]}])
+    monkeypatch.setattr(registry, "_problem_table_signature", lambda: "changed")
+
+    started = time.monotonic()
+    assert suites.get("Two Sum") is before
+    assert time.monotonic() - started < 0.5
+    release.set()
+
+    deadline = time.monotonic() + 30
+    while suites.get("Two Sum") is before and time.monotonic() < deadline:
+        time.sleep(0.05)
+    after = suites.get("Two Sum")
+    assert after is not before
+    assert after.version != before.version
+    assert len([case for case in after.hidden if case.generated_size is None]) == 1
+    # Don't leave a rebuild running into the next (timing-sensitive) tests
+    if suites._reloader is not None:
+        suites._reloader.join(30)
+
+
+def test_problem_table_signature_sees_same_length_edits(monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from config import database
+    from config.database import Base
+    from models.problem import Problem
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine, tables=[Problem.__table__])
+    session = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", session)
+    db = session()
+    db.add(Problem(title="Two Sum", test_cases='[{"input": {"x": 1}, "output": 2}]'))
+    db.commit()
+
+    first = registry._problem_table_signature()
+    # One expected value changed, same row count, ids and JSON length
+    db.query(Problem).update({Problem.test_cases: '[{"input": {"x": 1}, "output": 3}]'})
+    db.commit()
+    assert registry._problem_table_signature() not in (first, None)
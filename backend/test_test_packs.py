@@ -0,0 +1,56 @@
+import random
+
+from judge import test_packs
+from judge.inputs import PackedCases
+from judge.runner import run_tests
+from test_cases.generators import get_input_generator
+from test_cases.registry import SuiteRegistry
+
+TWO_SUM = """
+class Solution:
+    def twoSum(self, nums, target):
+        seen = {}
+        for i, num in enumerate(nums):
+            if target - num in seen:
+                return [seen[target - num], i]
+            seen[num] = i
+"""
+
+
+def test_columns_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(test_packs, "PACKS_DIR", str(tmp_path))
+    data = {"nums": [3, -1, 2 ** 40], "strs": ["ab", "", "héllo"], "grid": [[1, 2], [3, 4]], "s": "xyz",
+            "weights": [0.5, 2.0], "huge": [2 ** 70], "empty": [], "k": 2}
+    pack = test_packs.write_pack("mixed", "Mixed", [{"input": data, "output": 1}])
+    assert len(pack.columns) == 5
+
+    loaded = test_packs.load_input(["mixed", pack.version, 0])
+    assert loaded == data
+    loaded["nums"].append(0)
+    assert test_packs.load_input(["mixed", pack.version, 0]) == data
+    assert pack.raw_cases()[0]["input"]["grid"] == "<list of 2 items>"
+
+
+def test_pack_cases_join_the_hidden_suite_and_run_from_the_mapping(tmp_path, monkeypatch):
+    monkeypatch.setattr(test_packs, "PACKS_DIR", str(tmp_path))
+    data = get_input_generator("Two Sum")(10 ** 5, random.Random(1))
+    pack = test_packs.write_pack("two-sum-stress", "Two Sum",
+                                 [{"input": data, "output": [10 ** 5 - 2, 10 ** 5 - 1], "size": 10 ** 5}])
+
+    suites = SuiteRegistry(reload_interval=3600)
+    suites.load()
+    stress = suites.get("Two Sum").hidden_cases[-1]
+    assert stress["pack"] == ("two-sum-stress", pack.version, 0)
+    assert stress["input"] == {"nums": "<list of 100000 items>", "target": 3}
+
+    # Serialized suites carry the reference, never the array
+    packed = PackedCases([stress])
+    assert len(packed.blob) < 1000
+    assert all(passed for passed, _, _ in run_tests(TWO_SUM, list(packed.cases)))
+
+    # A worker that mapped the old version keeps serving it; a fresh one reports the suite as stale
+    test_packs.write_pack("two-sum-stress", "Two Sum", [{"input": data, "output": [0, 1]}])
+    assert run_tests(TWO_SUM, [stress])[0][0]
+    monkeypatch.setattr(test_packs, "_open_packs", {})
+    passed, _, error = run_tests(TWO_SUM, [stress])[0]
+    assert not passed and "changed since" in error
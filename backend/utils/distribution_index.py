@@ -0,0 +1,132 @@
+"""
+Per-problem distribution of accepted runtimes and memory usage.
+Backs the "beats X%" percentiles on submit without scanning the submissions
+table: each (problem, language, metric) partition is a sorted array, built
+from history on first use and kept current as new accepted runs come in.
+Measured CPU time (runtime_ms) and metered cost (cost_ms) are different units
+and are never ranked against each other.
+The index itself is not persisted: the submissions table is the durable copy, and
+each partition is rebuilt from it lazily after a restart or an explicit rebuild.
+That costs one indexed scan per partition on first use in exchange for never
+having a second on-disk copy to keep in step with rejudges.
+"""
+from bisect import bisect_right, insort
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from models.submission import Submission
+
+# Submission column behind each metric a partition can hold
+METRIC_COLUMNS = {
+    "runtime_ms": Submission.runtime_ms,
+    "cost_ms": Submission.cost_ms,
+    "memory_mb": Submission.memory_mb,
+}
+
+
+def _beats(values: List[float], value: Optional[float]) -> Optional[float]:
+    """Share of recorded values strictly worse (larger) than value, in percent"""
+    if value is None:
+        return None
+    if not values:
+        return 100.0
+    worse = len(values) - bisect_right(values, value)
+    return round(worse * 100.0 / len(values), 2)
+
+
+class _Partition:
+    """One sorted distribution; loaded from history under its own lock so other partitions never wait on it"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.values: Optional[List[float]] = None
+
+
+class DistributionIndex:
+    def __init__(self, batch_size: int = 5000):
+        self.batch_size = batch_size
+        self._partitions: Dict[Tuple[str, str, str], _Partition] = {}
+        # Guards the partition map only; loads and lookups hold the partition's lock
+        self.lock = Lock()
+
+    def _entry(self, key: Tuple[str, str, str]) -> _Partition:
+        with self.lock:
+            partition = self._partitions.get(key)
+            if partition is None:
+                partition = self._partitions[key] = _Partition()
+            return partition
+
+    def _ensure_loaded(self, db, key: Tuple[str, str, str], partition: _Partition) -> bool:
+        """Load the partition if nobody has yet (caller holds partition.lock); True if this call loaded it"""
+        if partition.values is not None:
+            return False
+        partition.values = self._load(db, *key)
+        return True
+
+    def _load(self, db, problem_id: str, language: str, metric: str) -> List[float]:
+        """Rebuild one partition from accepted submissions, streamed in batches"""
+        column = METRIC_COLUMNS[metric]
+        rows = (
+            db.query(column)
+            .filter(
+                Submission.problem_id == problem_id,
+                Submission.language == language,
+                Submission.status == "accepted",
+                column.isnot(None),
+            )
+            .yield_per(self.batch_size)
+        )
+        return sorted(value for value, in rows)
+
+    def _percentile(self, db, key: Tuple[str, str, str], value: Optional[float]) -> Optional[float]:
+        if value is None:
+            return None
+        partition = self._entry(key)
+        with partition.lock:
+            self._ensure_loaded(db, key, partition)
+            return _beats(partition.values, value)
+
+    def percentiles(self, db, problem_id: str, language: str, runtime: Optional[float],
+                    memory_mb: Optional[float], metric: str = "runtime_ms") -> Tuple[Optional[float], Optional[float]]:
+        """
+        (runtime_beats, memory_beats) for a run against every accepted run so far, O(log n).
+        runtime is in the unit of metric: measured CPU time (runtime_ms) or metered cost (cost_ms).
+        The first lookup of a partition scans its history: call it off the event loop.
+        """
+        return (self._percentile(db, (problem_id, language, metric), runtime),
+                self._percentile(db, (problem_id, language, "memory_mb"), memory_mb))
+
+    def record(self, db, problem_id: str, language: str, runtime_ms: Optional[float],
+               memory_mb: Optional[float], cost_ms: Optional[float] = None):
+        """Add a newly accepted (already committed) run to the partitions of each metric it has a value for"""
+        values = {"runtime_ms": runtime_ms, "cost_ms": cost_ms, "memory_mb": memory_mb}
+        for metric, value in values.items():
+            if value is None:
+                continue
+            key = (problem_id, language, metric)
+            partition = self._entry(key)
+            with partition.lock:
+                # A partition loaded just now already read the committed run from history
+                if not self._ensure_loaded(db, key, partition):
+                    insort(partition.values, value)
+
+    def rebuild(self, db, problem_id: Optional[str] = None):
+        """Drop cached partitions (all, or one problem's) so they reload from history"""
+        with self.lock:
+            if problem_id is None:
+                self._partitions.clear()
+                return
+            partitions = [p for k, p in self._partitions.items() if k[0] == problem_id]
+        for partition in partitions:
+            # The reload happens under this lock on next use, so a concurrent record()
+            # either lands before the drop (and is reread) or waits for the reload
+            with partition.lock:
+                partition.values = None
+
+    def size(self, problem_id: str, language: str, metric: str = "runtime_ms") -> int:
+        partition = self._partitions.get((problem_id, language, metric))
+        return len(partition.values or ()) if partition else 0
+
+
+# Global Index Instance
+submission_distribution = DistributionIndex()
@@ -1,12 +1,24 @@
 /**
  * VisualDebugger - Generates visual diagrams from code
  * Uses Mermaid.js to render flowcharts and variable analysis
+ * Once started, follows the editor over the live analysis WebSocket, which sends
+ * only the top-level blocks that changed since the last update.
  */
 
+const LIVE_ANALYSIS_URL = 'ws://localhost:8001/api/visualization/live';
+
 class VisualDebugger {
   constructor() {
     this.isInitialized = false;
     this.currentDiagram = null;
+
+    // Live analysis state: blocks by id, in buffer order, as last sent by the server
+    this.liveSocket = null;
+    this.liveBlocks = {};
+    this.liveOrder = [];
+    this.liveVariables = [];
+    this.liveVersion = 0;
+    this.editorListener = null;
   }
 
   /**
@@ -185,6 +197,7 @@ class VisualDebugger {
     if (section) {
       section.style.display = 'none';
     }
+    this.stopLive();
   }
 
   /**
@@ -248,12 +261,121 @@ class VisualDebugger {
       // Show complexity
       this.displayComplexity(result.complexity);
 
+      // Keep the diagram in step with further edits
+      this.startLive();
+
     } catch (error) {
       console.error('[VisualDebugger] Error:', error);
       this.showError('Failed to generate diagram. Make sure the backend server is running.');
     }
   }
 
+  /**
+   * Follow editor changes over the live analysis channel
+   */
+  startLive() {
+    const editor = window.editorInstance;
+    if (!editor || this.liveSocket) return;
+
+    const socket = new WebSocket(LIVE_ANALYSIS_URL);
+    this.liveSocket = socket;
+    // A new connection starts from an empty session: every block comes back as added
+    this.liveBlocks = {};
+    this.liveOrder = [];
+    this.liveVariables = [];
+
+    socket.onopen = () => {
+      console.log('[VisualDebugger] Live analysis connected');
+      this.sendEdit();
+    };
+    socket.onmessage = (event) => this.applyDelta(JSON.parse(event.data));
+    socket.onclose = () => {
+      console.log('[VisualDebugger] Live analysis disconnected');
+      if (this.liveSocket === socket) this.liveSocket = null;
+      if (this.editorListener) {
+        this.editorListener.dispose();
+        this.editorListener = null;
+      }
+    };
+
+    // Every keystroke is sent; the server coalesces bursts into one analysis
+    if (!this.editorListener) {
+      this.editorListener = editor.onDidChangeModelContent(() => this.sendEdit());
+    }
+  }
+
+  /**
+   * Stop following the editor
+   */
+  stopLive() {
+    if (this.liveSocket) this.liveSocket.close();
+  }
+
+  /**
+   * Send the current buffer to the live analysis channel
+   */
+  sendEdit() {
+    const socket = this.liveSocket;
+    if (!socket || socket.readyState !== WebSocket.OPEN || !window.editorInstance) return;
+    this.liveVersion += 1;
+    socket.send(JSON.stringify({
+      type: 'edit',
+      code: window.editorInstance.getValue(),
+      version: this.liveVersion
+    }));
+  }
+
+  /**
+   * Apply a live analysis delta and redraw what changed
+   */
+  async applyDelta(delta) {
+    if (delta.type !== 'delta') {
+      console.error('[VisualDebugger] Live analysis error:', delta.error);
+      return;
+    }
+
+    for (const blockId of delta.removed) {
+      delete this.liveBlocks[blockId];
+    }
+    Object.assign(this.liveBlocks, delta.added);
+    this.liveOrder = delta.order;
+
+    const removed = new Set(delta.variables.removed.map(v => `${v.name}@${v.scope}`));
+    this.liveVariables = this.liveVariables
+      .filter(v => !removed.has(`${v.name}@${v.scope}`))
+      .concat(delta.variables.added);
+
+    // Mermaid redraws the whole chart, so skip it when no block changed
+    const diagram = this.assembleDiagram();
+    if (diagram !== this.currentDiagram) {
+      await this.renderDiagram(diagram);
+    }
+    if (delta.variables.added.length || delta.variables.removed.length) {
+      this.displayVariables(this.liveVariables);
+    }
+    this.displayComplexity(delta.complexity);
+  }
+
+  /**
+   * Chain the live blocks between Start and End, like CodeAnalyzer's assemble_diagram
+   */
+  assembleDiagram() {
+    const lines = ['flowchart TD', '    Start([Start])'];
+    let lastId = 'Start';
+    for (const blockId of this.liveOrder) {
+      const block = this.liveBlocks[blockId];
+      if (!block) continue;
+      lines.push(...block.lines);
+      if (block.entry) {
+        lines.push(`    ${lastId} --> ${block.entry}`);
+        lastId = block.exit;
+      }
+    }
+    lines.push('    Finish([End])');
+    lines.push(`    ${lastId} --> Finish`);
+    return lines.join('\n');
+  }
+
   /**
    * Render Mermaid diagram
    */